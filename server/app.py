@@ -0,0 +1,85 @@
+# server/app.py - Orion app factory (eager / lazy / background model loading)
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from dotenv import load_dotenv
+load_dotenv(override=True)
+
+from server.log import get_logger
+from server.startup import StartupTimer, resolve_profile
+
+log = get_logger("startup")
+
+
+def create_app(profile: Optional[str] = None):
+    """
+    Build the Orion FastAPI app.
+
+    Args:
+        profile: "eager", "lazy" or "background" (defaults to ORION_STARTUP_PROFILE)
+
+    Every startup phase is timed and reported under "startup" at /api/status.
+    """
+    timer = StartupTimer(resolve_profile(profile))
+
+    with timer.phase("imports"):
+        from fastapi import FastAPI
+        from fastapi.middleware.cors import CORSMiddleware
+        from fastapi.staticfiles import StaticFiles
+        from server.routers import chat, llm, sessions, settings, speech, status, voice
+        from server.routers.zephyr_ops import router as zephyr_router
+        from server import metrics, tracing, warmup
+
+    warmup.init(timer.profile)
+    if timer.profile == "eager":
+        with timer.phase("model_load"):
+            warmup.warmup_all()
+    elif timer.profile == "lazy":
+        timer.skip("model_load", "lazy profile loads models on first use")
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # background profile: serve /livez right away, flip /readyz once warm
+        task = None
+        if timer.profile == "background":
+            task = asyncio.create_task(warmup.warmup_in_background(timer))
+        yield
+        if task is not None and not task.done():
+            task.cancel()
+
+    with timer.phase("router_init"):
+        app = FastAPI(title="Orion AI Assistant", lifespan=lifespan)
+        app.state.startup = timer
+
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=["*"],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+        app.middleware("http")(tracing.http_middleware)
+        app.middleware("http")(metrics.http_middleware)
+        app.add_middleware(speech.UploadLimitMiddleware)
+
+        for module in (status, chat, speech, voice, sessions, settings, llm):
+            app.include_router(module.router)
+        app.include_router(zephyr_router)
+
+        # Check if assets directory exists
+        assets_dir = "ui/web/assets"
+        os.makedirs(assets_dir, exist_ok=True)
+        app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
+
+    if status.ORION_MODE == "strict":
+        with timer.phase("ollama_probe"):
+            log.info("strict mode: ensuring Ollama server is running")
+            llm._start_ollama_server()
+    else:
+        timer.skip("ollama_probe", f"{status.ORION_MODE} mode does not use Ollama")
+
+    timer.mark_ready()
+    log.info("orion ready", ms=round(timer.ready_ms), profile=timer.profile)
+    return app
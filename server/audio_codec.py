@@ -0,0 +1,249 @@
+# server/audio_codec.py - In-process audio encoding (WAV, Opus-in-OGG, MP3) and decoding for STT
+import io
+import os
+import wave
+import struct
+import threading
+from importlib.util import find_spec
+from typing import BinaryIO, Optional, Tuple, Union
+
+# PyAV bundles ffmpeg's libopus/libmp3lame; imported on first compressed encode
+AV_AVAILABLE = find_spec("av") is not None
+
+# format name -> (container, codec, media type)
+FORMATS = {
+    "wav": ("wav", None, "audio/wav"),
+    "opus": ("ogg", "libopus", "audio/ogg"),
+    "mp3": ("mp3", "libmp3lame", "audio/mpeg"),
+}
+FORMAT_ALIASES = {"ogg": "opus", "mpeg": "mp3", "x-wav": "wav", "wave": "wav"}
+
+DEFAULT_FORMAT = os.getenv("ORION_TTS_FORMAT", "wav").lower()
+DEFAULT_BITRATES = {
+    "opus": int(os.getenv("ORION_TTS_OPUS_BITRATE", "32000")),
+    "mp3": int(os.getenv("ORION_TTS_MP3_BITRATE", "64000")),
+}
+MIN_BITRATE, MAX_BITRATE = 6000, 320000
+
+# faster-whisper expects 16 kHz mono float32
+STT_SAMPLE_RATE = 16000
+
+# libopus only accepts these input rates; anything else is resampled to 48 kHz
+OPUS_SAMPLE_RATES = (48000, 24000, 16000, 12000, 8000)
+
+
+def normalize_format(name: Optional[str]) -> Optional[str]:
+    """'OGG' -> 'opus', 'audio/mpeg' -> 'mp3'; None if unknown"""
+    if not name:
+        return None
+    name = name.lower().strip()
+    if name.startswith("audio/"):
+        name = name[len("audio/"):].split(";")[0]
+    name = FORMAT_ALIASES.get(name, name)
+    return name if name in FORMATS else None
+
+
+def negotiate_format(requested: Optional[str], accept: Optional[str]) -> str:
+    """
+    Pick the output format: an explicit request field wins, then the
+    highest-q audio type in the Accept header, then ORION_TTS_FORMAT.
+    """
+    fmt = normalize_format(requested)
+    if fmt:
+        return fmt
+    if accept:
+        candidates = []
+        for i, part in enumerate(accept.split(",")):
+            media, _, params = part.strip().partition(";")
+            q = 1.0
+            for param in params.split(";"):
+                key, _, value = param.strip().partition("=")
+                if key == "q":
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            fmt = normalize_format(media) if media.strip() != "audio/*" else DEFAULT_FORMAT
+            if fmt and q > 0:
+                candidates.append((-q, i, fmt))
+        if candidates:
+            return min(candidates)[2]
+    return normalize_format(DEFAULT_FORMAT) or "wav"
+
+
+def effective_bitrate(fmt: str, bitrate: Optional[int] = None) -> Optional[int]:
+    """Bitrate actually used for `fmt` (None for uncompressed WAV)"""
+    if fmt not in DEFAULT_BITRATES:
+        return None
+    return max(MIN_BITRATE, min(MAX_BITRATE, bitrate or DEFAULT_BITRATES[fmt]))
+
+
+def media_type(fmt: str) -> str:
+    return FORMATS.get(fmt, (None, None, "application/octet-stream"))[2]
+
+
+def wav_to_pcm(wav_bytes: bytes) -> Tuple["np.ndarray", int]:
+    """Decode PCM WAV bytes into (int16 samples [channels, n], sample_rate)"""
+    import numpy as np
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wav:
+        channels = wav.getnchannels()
+        sample_rate = wav.getframerate()
+        width = wav.getsampwidth()
+        frames = wav.readframes(wav.getnframes())
+    if width != 2:
+        raise ValueError(f"Unsupported WAV sample width: {width * 8} bit")
+    samples = np.frombuffer(frames, dtype="<i2").reshape(-1, channels).T
+    return samples, sample_rate
+
+
+# Per-thread scratch space reused across utterances (TTS runs on a small worker pool)
+_scratch = threading.local()
+
+
+def to_int16(samples, peak_normalize: bool = False) -> "np.ndarray":
+    """
+    Float waveform in [-1, 1] (list or array) -> int16 [channels, n].
+
+    peak_normalize scales the loudest sample to full range, which is what
+    Coqui's tts_to_file does, so in-memory output matches the old WAV files.
+    """
+    import numpy as np
+    if isinstance(samples, np.ndarray) and samples.dtype == np.int16:
+        return samples.reshape(1, -1) if samples.ndim == 1 else samples
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim == 1:
+        samples = samples.reshape(1, -1)
+    scale = 32767.0
+    if peak_normalize and samples.size:
+        scale /= max(0.01, float(np.max(np.abs(samples))))
+    buf = getattr(_scratch, "float_buf", None)
+    if buf is None or buf.size < samples.size:
+        buf = _scratch.float_buf = np.empty(max(samples.size, 1 << 16), dtype=np.float32)
+    work = buf[:samples.size].reshape(samples.shape)
+    np.multiply(samples, scale, out=work)
+    np.clip(work, -32768, 32767, out=work)
+    return work.astype(np.int16)
+
+
+def pcm_to_wav(samples, sample_rate: int, peak_normalize: bool = False) -> bytes:
+    """Wrap a waveform in a 16-bit PCM WAV container (written into a reused buffer)"""
+    samples = to_int16(samples, peak_normalize)
+    channels = samples.shape[0]
+    data = samples.T.tobytes() if channels > 1 else samples.tobytes()
+    out = getattr(_scratch, "wav_buf", None)
+    if out is None:
+        out = _scratch.wav_buf = io.BytesIO()
+    out.seek(0)
+    out.truncate()
+    out.write(struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(data), b"WAVE", b"fmt ", 16, 1, channels,
+        sample_rate, sample_rate * channels * 2, channels * 2, 16, b"data", len(data),
+    ))
+    out.write(data)
+    return out.getvalue()
+
+
+def encode_pcm(samples, sample_rate: int, fmt: str, bitrate: Optional[int] = None,
+               peak_normalize: bool = False) -> Tuple[bytes, str]:
+    """
+    Encode a waveform (float in [-1, 1] or int16) straight into `fmt`.
+
+    Returns:
+        (audio_bytes, actual_format) - WAV when the format is unknown or
+        PyAV is not installed.
+    """
+    samples = to_int16(samples, peak_normalize)
+    if fmt == "wav" or fmt not in FORMATS or not AV_AVAILABLE:
+        return pcm_to_wav(samples, sample_rate), "wav"
+
+    import av
+    import numpy as np
+
+    container, codec, _ = FORMATS[fmt]
+    bitrate = effective_bitrate(fmt, bitrate)
+    layout = "mono" if samples.shape[0] == 1 else "stereo"
+    out_rate = sample_rate
+    if codec == "libopus" and sample_rate not in OPUS_SAMPLE_RATES:
+        out_rate = 48000
+
+    buf = io.BytesIO()
+    with av.open(buf, mode="w", format=container) as out:
+        stream = out.add_stream(codec, rate=out_rate, layout=layout)
+        stream.bit_rate = bitrate
+        frame = av.AudioFrame.from_ndarray(np.ascontiguousarray(samples.T.reshape(1, -1)), format="s16", layout=layout)
+        frame.sample_rate = sample_rate
+        for packet in stream.encode(frame):
+            out.mux(packet)
+        for packet in stream.encode(None):
+            out.mux(packet)
+    return buf.getvalue(), fmt
+
+
+def encode(wav_bytes: bytes, fmt: str, bitrate: Optional[int] = None) -> Tuple[bytes, str]:
+    """encode_pcm for an existing WAV file's bytes (WAV input is passed through untouched)"""
+    if fmt == "wav" or fmt not in FORMATS or not AV_AVAILABLE:
+        return wav_bytes, "wav"
+    samples, sample_rate = wav_to_pcm(wav_bytes)
+    return encode_pcm(samples, sample_rate, fmt, bitrate)
+
+
+class AudioTooLong(ValueError):
+    """Decoded audio ran past the caller's max_seconds"""
+
+
+def sniff_container(header: bytes) -> Optional[str]:
+    """Container from the first bytes of an upload ("wav", "ogg", "webm", "mp4", "mp3", "flac"), None if unknown"""
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "wav"
+    if header[:4] == b"OggS":
+        return "ogg"
+    if header[:4] == b"\x1aE\xdf\xa3":  # EBML: webm/matroska
+        return "webm"
+    if header[4:8] == b"ftyp":
+        return "mp4"
+    if header[:3] == b"ID3" or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        return "mp3"
+    if header[:4] == b"fLaC":
+        return "flac"
+    return None
+
+
+def decode_to_pcm(data: Union[bytes, BinaryIO], sample_rate: int = STT_SAMPLE_RATE,
+                  max_seconds: Optional[float] = None) -> "np.ndarray":
+    """
+    Decode any container/codec ffmpeg knows (browser webm/opus, mp4/aac, ogg,
+    wav) into mono float32 samples at `sample_rate`. `data` is bytes or a
+    seekable binary file, which is read incrementally rather than buffered.
+    Raises AudioTooLong as soon as more than `max_seconds` has been decoded.
+    """
+    import av
+    import numpy as np
+
+    source = io.BytesIO(data) if isinstance(data, (bytes, bytearray, memoryview)) else data
+    limit = int(max_seconds * sample_rate) if max_seconds else None
+    chunks = []
+    total = 0
+    try:
+        with av.open(source, mode="r") as container:
+            stream = next((s for s in container.streams if s.type == "audio"), None)
+            if stream is None:
+                raise ValueError("No audio stream in upload")
+            resampler = av.AudioResampler(format="flt", layout="mono", rate=sample_rate)
+            for frame in container.decode(stream):
+                frame.pts = None  # browser recordings often have broken timestamps
+                for out in resampler.resample(frame):
+                    chunks.append(out.to_ndarray().reshape(-1))
+                    total += chunks[-1].size
+                if limit is not None and total > limit:
+                    raise AudioTooLong(f"Audio longer than {max_seconds:g}s")
+            for out in resampler.resample(None):
+                chunks.append(out.to_ndarray().reshape(-1))
+    except av.FFmpegError as e:
+        raise ValueError(f"Could not decode audio: {e}") from e
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    samples = np.concatenate(chunks).astype(np.float32, copy=False)
+    if limit is not None and samples.size > limit:
+        raise AudioTooLong(f"Audio longer than {max_seconds:g}s")
+    return samples
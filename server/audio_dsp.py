@@ -0,0 +1,173 @@
+# server/audio_dsp.py - In-process audio preprocessing for STT (resample, downmix, loudness)
+#
+# Everything works on contiguous float32 arrays. Polyphase resampling only
+# computes the output samples that are kept: each output is one dot product
+# of a strided input window with one phase of a Kaiser-windowed sinc filter.
+# Filters are designed once per rate pair, and working buffers are reused.
+import os
+import threading
+from functools import lru_cache
+from math import gcd
+from typing import Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+TARGET_DBFS = float(os.getenv("ORION_STT_TARGET_DBFS", "-20"))   # RMS level uploads are normalized to
+MAX_GAIN_DB = float(os.getenv("ORION_STT_MAX_GAIN_DB", "24"))     # quiet mics get at most this much boost
+PEAK_CEILING = 0.98
+SILENCE_RMS = 1e-4      # don't amplify digital silence
+CHUNK_OUTPUTS = 1 << 15  # outputs per phase computed at once (bounds temporaries)
+RETAINED_SAMPLES = 1 << 20  # larger working buffers are released after a flush
+
+_scratch = threading.local()
+
+
+@lru_cache(maxsize=16)
+def _design(up: int, down: int) -> Tuple[np.ndarray, int]:
+    """Polyphase filter bank [up, taps] (each phase reversed for dot products) and its delay"""
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    n = np.arange(-half_len, half_len + 1, dtype=np.float64)
+    cutoff = 1.0 / max_rate  # fraction of the upsampled Nyquist
+    h = cutoff * np.sinc(cutoff * n) * np.kaiser(n.size, 5.0) * up
+    taps = -(-h.size // up)
+    h = np.concatenate([h, np.zeros(taps * up - h.size)])
+    bank = h.reshape(taps, up).T[:, ::-1]
+    return np.ascontiguousarray(bank, dtype=np.float32), half_len
+
+
+class Resampler:
+    """
+    Streaming polyphase resampler: process() chunks as they arrive, flush()
+    at the end. Output is identical to resampling the whole signal at once,
+    with no clicks at chunk boundaries.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int = SAMPLE_RATE):
+        g = gcd(src_rate, dst_rate)
+        self.up, self.down = dst_rate // g, src_rate // g
+        self.bank, self.delay = _design(self.up, self.down)
+        self.taps = self.bank.shape[1]
+        self._buf = np.zeros(1 << 14, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        if self._buf.size > RETAINED_SAMPLES:
+            self._buf = np.zeros(RETAINED_SAMPLES, dtype=np.float32)
+        # input before the stream starts is zeros; _buf[:_len] holds x[_offset:]
+        self._offset = -(self.taps - 1)
+        self._len = self.taps - 1
+        self._buf[:self._len] = 0
+        self._consumed = 0   # real input samples seen
+        self._next = 0       # index of the next output sample
+
+    def _append(self, samples: np.ndarray):
+        need = self._len + samples.size
+        if need > self._buf.size:
+            grown = np.empty(1 << (need - 1).bit_length(), dtype=np.float32)
+            grown[:self._len] = self._buf[:self._len]
+            self._buf = grown
+        self._buf[self._len:need] = samples
+        self._len = need
+
+    def _run(self, end: int) -> np.ndarray:
+        """Outputs [self._next, end) from the buffered input, then drop input no longer needed"""
+        up, down, taps = self.up, self.down, self.taps
+        count = max(0, end - self._next)
+        out = np.empty(count, dtype=np.float32)
+        if count:
+            windows = np.lib.stride_tricks.sliding_window_view(self._buf[:self._len], taps)
+            for r in range(min(up, count)):
+                m = self._next + r
+                n = m * down + self.delay
+                first = n // up - self._offset - (taps - 1)  # window ending at input n // up
+                rows = windows[first::down]
+                target = out[r::up]
+                for start in range(0, target.size, CHUNK_OUTPUTS):
+                    block = rows[start:start + min(CHUNK_OUTPUTS, target.size - start)]
+                    np.matmul(block, self.bank[n % up], out=target[start:start + block.shape[0]])
+            self._next = end
+        # keep the taps - 1 inputs before the next output's window end
+        keep_from = (self._next * down + self.delay) // up - (taps - 1)
+        drop = min(max(0, keep_from - self._offset), self._len)
+        if drop:
+            self._buf[:self._len - drop] = self._buf[drop:self._len]
+            self._len -= drop
+            self._offset += drop
+        return out
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        samples = np.asarray(samples, dtype=np.float32)
+        self._append(samples)
+        self._consumed += samples.size
+        # output m is ready once input (m * down + delay) // up has arrived
+        ready = (self._consumed * self.up - 1 - self.delay) // self.down + 1
+        return self._run(max(self._next, ready))
+
+    def flush(self) -> np.ndarray:
+        """Remaining output (input past the end is zeros); the resampler is reset afterwards"""
+        total = -(-self._consumed * self.up // self.down)
+        last_input = ((total - 1) * self.down + self.delay) // self.up
+        pad = max(0, last_input - (self._offset + self._len) + 1)
+        if pad:
+            self._append(np.zeros(pad, dtype=np.float32))
+        out = self._run(total)
+        self.reset()
+        return out
+
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """One-shot polyphase resample (e.g. 44.1/48 kHz -> 16 kHz) as float32"""
+    samples = np.asarray(samples, dtype=np.float32)
+    if src_rate == dst_rate or samples.size == 0:
+        return samples
+    # one resampler per rate pair and thread: its filter and buffers are reused across calls
+    cache = getattr(_scratch, "resamplers", None)
+    if cache is None:
+        cache = _scratch.resamplers = {}
+    resampler = cache.get((src_rate, dst_rate))
+    if resampler is None:
+        resampler = cache[(src_rate, dst_rate)] = Resampler(src_rate, dst_rate)
+    head = resampler.process(samples)
+    tail = resampler.flush()
+    return np.concatenate([head, tail]) if tail.size else head
+
+
+def scratch(size: int) -> np.ndarray:
+    """Per-thread float32 work array of `size` (reused; contents are garbage, valid until the next call)"""
+    buf = getattr(_scratch, "work", None)
+    if buf is None or buf.size < size:
+        buf = _scratch.work = np.empty(max(size, 1 << 16), dtype=np.float32)
+    return buf[:size]
+
+
+def downmix(samples: np.ndarray, channels: int) -> np.ndarray:
+    """Interleaved [n * channels] -> mono [n] by averaging channels"""
+    if channels <= 1:
+        return samples
+    frames = samples[:samples.size - samples.size % channels].reshape(-1, channels)
+    return frames.mean(axis=1, dtype=np.float32)
+
+
+def normalize(samples: np.ndarray, target_dbfs: float = TARGET_DBFS, max_gain_db: float = MAX_GAIN_DB,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Boost quiet audio towards `target_dbfs` RMS (at most `max_gain_db`)
+    without pushing peaks past PEAK_CEILING; audio already at or above the
+    target is left alone. Writes into `out` (may be `samples`).
+    """
+    if out is None:
+        out = np.empty_like(samples, dtype=np.float32)
+    if samples.size == 0:
+        return out
+    rms = float(np.sqrt(np.dot(samples, samples) / samples.size))
+    peak = float(np.max(np.abs(samples)))
+    gain = min(10 ** (target_dbfs / 20) / rms, 10 ** (max_gain_db / 20), PEAK_CEILING / peak) \
+        if rms >= SILENCE_RMS else 1.0
+    if gain <= 1.0:
+        if out is not samples:
+            out[...] = samples
+        return out
+    np.multiply(samples, np.float32(gain), out=out)
+    return out
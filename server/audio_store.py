@@ -0,0 +1,60 @@
+# server/audio_store.py - Short-lived synthesized audio, fetched by id from /api/audio/{audio_id}
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+AUDIO_TTL_SECONDS = float(os.getenv("ORION_AUDIO_TTL", "300"))
+AUDIO_STORE_MAX_BYTES = int(os.getenv("ORION_AUDIO_STORE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+class AudioStore:
+    """Insertion-ordered clips with a TTL and a total byte cap (oldest evicted first)"""
+
+    def __init__(self, ttl: float = AUDIO_TTL_SECONDS, max_bytes: int = AUDIO_STORE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clips: "OrderedDict[str, Tuple[bytes, str, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, audio: bytes, audio_format: str) -> str:
+        """Store a clip and return its id"""
+        audio_id = uuid.uuid4().hex
+        with self._lock:
+            self._expire(time.monotonic())
+            self._clips[audio_id] = (audio, audio_format, time.monotonic() + self.ttl)
+            self._bytes += len(audio)
+            while self._bytes > self.max_bytes and len(self._clips) > 1:
+                self._pop_oldest()
+        return audio_id
+
+    def get(self, audio_id: str) -> Optional[Tuple[bytes, str]]:
+        """(audio, format) or None if unknown or expired"""
+        with self._lock:
+            entry = self._clips.get(audio_id)
+            if entry is None:
+                return None
+            if entry[2] < time.monotonic():
+                self._bytes -= len(entry[0])
+                del self._clips[audio_id]
+                return None
+            return entry[0], entry[1]
+
+    def _pop_oldest(self):
+        _, (audio, _, _) = self._clips.popitem(last=False)
+        self._bytes -= len(audio)
+
+    def _expire(self, now: float):
+        # clips share one TTL, so expired ones are always at the front
+        while self._clips and next(iter(self._clips.values()))[2] < now:
+            self._pop_oldest()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"clips": len(self._clips), "bytes": self._bytes}
+
+
+audio_store = AudioStore()
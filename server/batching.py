@@ -0,0 +1,107 @@
+# server/batching.py - Continuous micro-batching (used by the STT batcher)
+#
+# A request that finds its group idle runs immediately. Requests arriving
+# while the group is busy queue up; when the running batch finishes, the
+# first queued request leads the next one, waiting `window_ms` for
+# stragglers and taking up to `max_batch` items.
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class _Job:
+    __slots__ = ("item", "done", "promoted", "result", "error")
+
+    def __init__(self, item):
+        self.item = item
+        self.done = threading.Event()
+        self.promoted = False  # woken to lead the next batch rather than with a result
+        self.result = None
+        self.error = None
+
+
+class _Group:
+    """Queue of requests that can share a batch"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending: List[_Job] = []
+        self.running = False
+
+
+class MicroBatcher:
+    """
+    run_batch(items, context) -> results (same order) runs on the calling
+    thread of whichever request leads the batch.
+    """
+
+    def __init__(self, run_batch: Callable[[List[Any], Any], List[Any]], window_ms: float = 15,
+                 max_batch: int = 8, size_metric=None):
+        self.run_batch = run_batch
+        self.window = window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.size_metric = size_metric
+        self._groups: Dict[Any, _Group] = {}
+        self._groups_lock = threading.Lock()
+
+    def _group(self, key) -> _Group:
+        with self._groups_lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _Group()
+            return group
+
+    def submit(self, key, item, context: Optional[Any] = None):
+        """Blocking result for `item`, batched with concurrent items under the same key"""
+        group = self._group(key)
+        job = _Job(item)
+        with group.lock:
+            group.pending.append(job)
+            lead = not group.running
+            if lead:
+                group.running = True
+
+        if not lead:
+            job.done.wait()
+            if not job.promoted:
+                return self._result(job)
+            # previous batch finished and handed us the next one
+            if self.window > 0:
+                time.sleep(self.window)
+
+        self._lead(group, key, context)
+        return self._result(job)
+
+    def _lead(self, group: _Group, key, context):
+        with group.lock:
+            batch = group.pending[:self.max_batch]
+            del group.pending[:self.max_batch]
+        if self.size_metric is not None:
+            self.size_metric.observe(len(batch))
+        try:
+            results = self.run_batch([job.item for job in batch], context)
+            for job, result in zip(batch, results):
+                job.result = result
+        except Exception as e:
+            for job in batch:
+                job.error = e
+        with group.lock:
+            if group.pending:
+                successor = group.pending[0]
+                successor.promoted = True
+                successor.done.set()
+            else:
+                group.running = False
+        if not group.running:
+            # keys can be client-chosen (e.g. speakers); don't keep a group per key forever
+            with self._groups_lock:
+                if self._groups.get(key) is group and not group.running and not group.pending:
+                    del self._groups[key]
+        for job in batch:
+            job.done.set()
+
+    @staticmethod
+    def _result(job: _Job):
+        if job.error is not None:
+            raise job.error
+        return job.result
@@ -0,0 +1,196 @@
+# server/log.py - Queue-based structured logging for the request hot paths
+#
+# Request handlers only format a record and put it on a bounded queue; a
+# background QueueListener thread does the console/file I/O. Records are
+# sampled per category (ORION_LOG_SAMPLE) and dropped rather than blocking
+# when the queue is full.
+import os
+import sys
+import copy
+import json
+import queue
+import atexit
+import random
+import logging
+import threading
+import logging.handlers
+from typing import Dict, Optional
+
+from server import metrics
+from server.tracing import current_trace
+
+LOG_LEVEL = os.getenv("ORION_LOG_LEVEL", "INFO").upper()   # DEBUG turns on the request dumps
+LOG_FORMAT = os.getenv("ORION_LOG_FORMAT", "text").lower()  # text | json
+LOG_FILE = os.getenv("ORION_LOG_FILE", "")                  # e.g. data/logs/orion.log
+LOG_QUEUE_SIZE = int(os.getenv("ORION_LOG_QUEUE_SIZE", "10000"))
+
+
+def _parse_sample_rates(spec: str) -> Dict[str, float]:
+    """'stt=0.1,tts=0.5' -> {'stt': 0.1, 'tts': 0.5}"""
+    rates = {}
+    for part in spec.split(","):
+        if "=" in part:
+            name, rate = part.split("=", 1)
+            try:
+                rates[name.strip()] = max(0.0, min(1.0, float(rate)))
+            except ValueError:
+                pass
+    return rates
+
+
+SAMPLE_RATES = _parse_sample_rates(os.getenv("ORION_LOG_SAMPLE", ""))
+
+dropped_records = 0
+_exc_formatter = logging.Formatter()
+
+metrics.LOG_DROPPED_RECORDS.set_function(lambda: dropped_records)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of DEBUG/INFO records per category; warnings and errors always pass"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(record.name.rsplit(".", 1)[-1], 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the caller: full queue -> record dropped"""
+
+    def enqueue(self, record):
+        global dropped_records
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            dropped_records += 1
+
+    def prepare(self, record):
+        # Everything context-dependent (message args, trace id, traceback) is
+        # resolved here on the caller's thread; the writer only formats.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        fields = dict(getattr(record, "fields", None) or {})
+        trace = current_trace()
+        if trace is not None:
+            fields["trace_id"] = trace.trace_id
+        if record.exc_info:
+            fields["exc"] = _exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+            record.exc_text = None
+        record.fields = fields
+        return record
+
+
+class StructuredFormatter(logging.Formatter):
+    """`time level category message key=value ...` or one JSON object per line"""
+
+    def __init__(self, fmt: str = "text"):
+        super().__init__()
+        self.fmt = fmt
+
+    def format(self, record):
+        fields = getattr(record, "fields", None) or {}
+
+        if self.fmt == "json":
+            return json.dumps({
+                "ts": round(record.created, 3),
+                "level": record.levelname.lower(),
+                "category": record.name.rsplit(".", 1)[-1],
+                "msg": record.getMessage(),
+                **fields,
+            }, default=str)
+
+        ts = self.formatTime(record, "%H:%M:%S")
+        exc = fields.get("exc")
+        extra = " ".join(
+            f"{k}={v!r}" if isinstance(v, str) and " " in v else f"{k}={v}"
+            for k, v in fields.items() if k != "exc"
+        )
+        category = record.name.rsplit(".", 1)[-1]
+        line = f"{ts} {record.levelname:<7} [{category}] {record.getMessage()}" + (f" {extra}" if extra else "")
+        return f"{line}\n{exc}" if exc else line
+
+
+class StructLogger:
+    """Thin wrapper so call sites can pass fields as keyword arguments"""
+
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+
+    def _log(self, level, msg, exc_info=None, **fields):
+        if _listener is None:
+            setup()
+        if self._logger.isEnabledFor(level):
+            self._logger.log(level, msg, exc_info=exc_info, extra={"fields": fields})
+
+    def isEnabledFor(self, level) -> bool:
+        return self._logger.isEnabledFor(level)
+
+    def debug(self, msg, **fields):
+        self._log(logging.DEBUG, msg, **fields)
+
+    def info(self, msg, **fields):
+        self._log(logging.INFO, msg, **fields)
+
+    def warning(self, msg, **fields):
+        self._log(logging.WARNING, msg, **fields)
+
+    def error(self, msg, **fields):
+        self._log(logging.ERROR, msg, **fields)
+
+    def exception(self, msg, **fields):
+        self._log(logging.ERROR, msg, exc_info=True, **fields)
+
+
+_root = logging.getLogger("orion")
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def setup():
+    """Attach the queue handler and start the writer thread (idempotent)"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        handlers = [logging.StreamHandler(sys.stdout)]
+        if LOG_FILE:
+            os.makedirs(os.path.dirname(LOG_FILE) or ".", exist_ok=True)
+            handlers.append(logging.FileHandler(LOG_FILE, encoding="utf-8"))
+        formatter = StructuredFormatter(LOG_FORMAT)
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        queue_handler = _DroppingQueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter(SAMPLE_RATES))
+
+        _root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+        _root.handlers.clear()
+        _root.addHandler(queue_handler)
+        _root.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown)
+
+
+def shutdown():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def get_logger(category: str) -> StructLogger:
+    """Logger for a category such as 'chat', 'stt' or 'tts' (writer starts on first record)"""
+    return StructLogger(_root.getChild(category))
@@ -0,0 +1,228 @@
+# server/metrics.py - Prometheus metrics (text exposition format, no extra dependency)
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Latency buckets in seconds, from a cache hit up to a long LLM answer
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(labels.get(n, "") for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Gauge set directly or computed at scrape time via set_function"""
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._functions: Dict[Tuple, Callable] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, fn: Callable, **labels):
+        """Compute the value for these labels with fn() on every scrape"""
+        with self._lock:
+            self._functions[self._key(labels)] = fn
+
+    def get(self, **labels) -> Optional[float]:
+        key = self._key(labels)
+        if key in self._functions:
+            return self._functions[key]()
+        return self._values.get(key)
+
+    def _samples(self):
+        with self._lock:
+            items = dict(self._values)
+            functions = list(self._functions.items())
+        for key, fn in functions:
+            try:
+                items[key] = fn()
+            except Exception:
+                items.pop(key, None)
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values: Dict[Tuple, List] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            entry[-2] += value
+            entry[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of a block in seconds"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[-1] if entry else 0
+
+    def _samples(self):
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        for key, entry in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, entry):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(entry[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {entry[-1]}")
+        return lines
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text format"""
+    return "\n".join(line for metric in _registry for line in metric.render()) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# === Pipeline stages ===
+STT_DECODE_SECONDS = Histogram("orion_stt_decode_seconds", "Audio decode/conversion before transcription")
+STT_TRANSCRIBE_SECONDS = Histogram("orion_stt_transcribe_seconds", "Whisper transcription time", ("profile", "model"))
+STT_STREAM_FINALIZE_SECONDS = Histogram(
+    "orion_stt_stream_finalize_seconds", "End of speech detected -> final transcript sent (/ws/stt)"
+)
+STT_BATCH_SIZE = Histogram("orion_stt_batch_size", "Clips decoded per Whisper batch", buckets=(1, 2, 4, 8, 16, 32))
+STT_REQUESTS = Counter("orion_stt_requests_total", "STT requests by outcome", ("status",))
+STT_VAD_TRIMMED_SECONDS = Counter("orion_stt_vad_trimmed_seconds_total", "Silence cut from uploads before transcription")
+STT_CACHE_LOOKUPS = Counter("orion_stt_cache_lookups_total", "STT transcript cache lookups", ("result",))
+
+MEMORY_LOAD_SECONDS = Histogram("orion_memory_load_seconds", "Time to load the memory store")
+MEMORY_SAVE_SECONDS = Histogram("orion_memory_save_seconds", "Time to persist the memory store")
+
+VOICE_FIRST_AUDIO_SECONDS = Histogram(
+    "orion_voice_first_audio_seconds", "End of user speech -> first reply audio chunk sent (/ws/voice)"
+)
+VOICE_TURNS = Counter("orion_voice_turns_total", "Voice conversation turns by outcome", ("status",))
+
+LLM_TOTAL_SECONDS = Histogram("orion_llm_total_seconds", "Time to produce the full answer", ("mode",))
+
+TTS_SYNTHESIZE_SECONDS = Histogram("orion_tts_synthesize_seconds", "Coqui synthesis time", ("model",))
+TTS_ENCODE_SECONDS = Histogram("orion_tts_encode_seconds", "Audio encoding time after synthesis", ("format",))
+TTS_REQUESTS = Counter("orion_tts_requests_total", "TTS syntheses by outcome", ("status",))
+TTS_CACHE_LOOKUPS = Counter("orion_tts_cache_lookups_total", "TTS audio cache lookups", ("result",))
+
+HTTP_REQUESTS = Counter("orion_http_requests_total", "HTTP requests", ("method", "route", "status"))
+HTTP_REQUEST_SECONDS = Histogram("orion_http_request_seconds", "HTTP request latency", ("method", "route"))
+
+# === Process gauges (computed at scrape time) ===
+EXECUTOR_QUEUE_DEPTH = Gauge("orion_executor_queue_depth", "Jobs waiting for a worker thread", ("executor",))
+MODELS_LOADED = Gauge("orion_models_loaded", "Speech models resident in memory", ("kind",))
+LOG_DROPPED_RECORDS = Gauge("orion_log_dropped_records", "Log records dropped because the log queue was full")
+TTS_MODEL_BYTES = Gauge("orion_tts_model_bytes", "Measured footprint of the loaded TTS models")
+TTS_CACHE_HIT_RATIO = Gauge("orion_tts_cache_hit_ratio", "Fraction of TTS requests served from the audio cache")
+TTS_CACHE_BYTES = Gauge("orion_tts_cache_bytes", "Bytes held by the TTS audio cache", ("tier",))
+PROCESS_RSS_BYTES = Gauge("orion_process_resident_memory_bytes", "Resident set size of the server process")
+
+
+def _rss_bytes() -> float:
+    try:
+        import psutil  # pip install psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        # Linux fallback without psutil
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+PROCESS_RSS_BYTES.set_function(_rss_bytes)
+
+
+async def http_middleware(request, call_next):
+    """Count and time every HTTP request by route template (not raw path)"""
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        HTTP_REQUESTS.inc(method=request.method, route=path, status=status)
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - t0, method=request.method, route=path)
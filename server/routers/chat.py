@@ -0,0 +1,216 @@
+# server/routers/chat.py - Chat, memory, personality and agent endpoints
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Optional, Dict
+import time
+import base64
+import asyncio
+
+from orion.app.agents import get_agent_registry
+from orion.app.memory.store import OrionMemory
+from orion.app.orchestrator import process_query
+from orion.app.cli import (
+    list_memories,
+    add_memory,
+    delete_memory,
+    set_personality,
+    get_personality
+)
+
+from server import audio_codec, metrics, tracing, tts
+from server.audio_store import audio_store
+from server.log import get_logger
+
+router = APIRouter(tags=["chat"])
+
+log = get_logger("chat")
+
+
+class TimedMemory(OrionMemory):
+    """OrionMemory that reports load/save times to /metrics"""
+
+    def __init__(self, *args, **kwargs):
+        with tracing.span("memory.load"), metrics.MEMORY_LOAD_SECONDS.time():
+            super().__init__(*args, **kwargs)
+
+    def _save(self):
+        with tracing.span("memory.save"), metrics.MEMORY_SAVE_SECONDS.time():
+            super()._save()
+
+
+# Request/Response Models
+class ChatRequest(BaseModel):
+    message: str
+    mode: str = "hybrid"
+    personality: Optional[Dict] = None
+    enable_tts: bool = False
+    voice_model: Optional[str] = None
+    speaker_id: Optional[str] = None
+    # "inline" = base64 in `audio`; "url" = fetch bytes from `audio_url` (/api/audio/{audio_id})
+    audio_delivery: str = "inline"
+    audio_format: Optional[str] = None  # "wav", "opus" or "mp3" (default ORION_TTS_FORMAT)
+    bitrate: Optional[int] = None
+    speed: Optional[float] = None
+
+class ChatResponse(BaseModel):
+    response: str
+    agent: Optional[str] = "conversational"
+    model: Optional[str] = "qwen2.5:1.5b"
+    audio: Optional[str] = None
+    audio_format: Optional[str] = None  # read by ui/web/index.html (old server/main.py)
+    audioformat: Optional[str] = None   # same value, old server/main_optimized.py name
+    audio_id: Optional[str] = None
+    audio_url: Optional[str] = None
+    mode: str = "strict"
+
+class MemoryRequest(BaseModel):
+    memory: str
+
+class PersonalityRequest(BaseModel):
+    humor: float = 0.5
+    verbosity: float = 0.5
+    formality: float = 0.5
+    creativity: float = 0.6
+    speak: bool = False
+
+
+@router.post("/api/chat")
+async def chat_endpoint(request: ChatRequest):
+    """Main chat endpoint with multi-agent support"""
+    try:
+        memory = TimedMemory()
+        personality = request.personality or {}
+        log.debug("chat request", mode=request.mode, enable_tts=request.enable_tts, personality=personality)
+
+        # Process query with multi-agent orchestrator
+        llm_start = time.perf_counter()
+        with tracing.span("llm"):
+            response = process_query(
+                query=request.message,
+                memory=memory,
+                outputhint="voice" if request.enable_tts else "text",
+                username=None,
+                legalname=None,
+                traits=personality,
+                profile=None,
+                detectedemotion=None,
+                strict=(request.mode == "strict")
+            )
+        llm_seconds = time.perf_counter() - llm_start
+        metrics.LLM_TOTAL_SECONDS.observe(llm_seconds, mode=request.mode)
+
+        # Handle both dict (new multi-agent) and string (old) responses
+        if isinstance(response, dict):
+            response_text = response.get("answer", "")
+            agent_name = response.get("agent", "conversational")
+            model_name = response.get("model", "qwen2.5:1.5b")
+        else:
+            response_text = response
+            agent_name = "conversational"
+            model_name = "qwen2.5:7b"
+
+        # Handle TTS if enabled
+        audio_data = None
+        audio_format = None
+        audio_id = None
+
+        if request.enable_tts and tts.COQUI_AVAILABLE:
+            try:
+                voice_model, speaker_id = tts.split_voice(request.voice_model, request.speaker_id)
+
+                # Generate TTS audio
+                loop = asyncio.get_event_loop()
+                with tracing.span("tts"):
+                    audio_bytes, audio_format = await tracing.run_in_executor(
+                        loop,
+                        tts.executor,
+                        tts.synthesize_sync,
+                        response_text,
+                        voice_model,
+                        speaker_id,
+                        audio_codec.negotiate_format(request.audio_format, None),
+                        request.bitrate,
+                        request.speed
+                    )
+                if audio_bytes and request.audio_delivery == "url":
+                    audio_id = audio_store.put(audio_bytes, audio_format)
+                elif audio_bytes:
+                    audio_data = base64.b64encode(audio_bytes).decode('utf-8')
+            except Exception as tts_error:
+                log.exception("tts failed")
+
+        return ChatResponse(
+            response=response_text,
+            agent=agent_name,
+            model=model_name,
+            audio=audio_data,
+            audio_format=audio_format,
+            audioformat=audio_format,
+            audio_id=audio_id,
+            audio_url=f"/api/audio/{audio_id}" if audio_id else None,
+            mode=request.mode
+        )
+
+    except Exception as e:
+        log.exception("chat failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/memory")
+async def get_memories():
+    try:
+        memories = list_memories()
+        return {"memories": memories}
+    except Exception as e:
+        log.exception("get_memories failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/memory")
+async def add_memory_endpoint(request: MemoryRequest):
+    try:
+        add_memory(request.memory)
+        return {"status": "success", "memory": request.memory}
+    except Exception as e:
+        log.exception("add_memory failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/api/memory")
+async def delete_memory_endpoint(request: MemoryRequest):
+    try:
+        delete_memory(request.memory)
+        return {"status": "success", "deleted": request.memory}
+    except Exception as e:
+        log.exception("delete_memory failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/personality")
+async def get_personality_endpoint():
+    try:
+        personality = get_personality()
+        return personality
+    except Exception as e:
+        log.exception("get_personality failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/personality")
+async def set_personality_endpoint(request: PersonalityRequest):
+    try:
+        set_personality(
+            humor=float(request.humor),
+            verbosity=float(request.verbosity),
+            formality=float(request.formality),
+            creativity=float(request.creativity),
+            speak=request.speak
+        )
+        return {"status": "success", "personality": request.dict()}
+    except Exception as e:
+        log.exception("set_personality failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/agents/status")
+async def get_agent_status():
+    """Get status of all agents"""
+    try:
+        registry = get_agent_registry()
+        return registry.status()
+    except Exception as e:
+        return {"error": str(e)}
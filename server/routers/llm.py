@@ -0,0 +1,131 @@
+# server/routers/llm.py - Ollama server control (/llm/on, /llm/off, /llm/status)
+from fastapi import APIRouter
+import os
+import subprocess
+import requests
+import time
+
+router = APIRouter(tags=["llm"])
+
+OLLAMA_HOST = os.getenv("OLLAMA_BASE_URL", "http://127.0.0.1:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "qwen2.5-vl:7b-instruct")
+# Note: Ollama runs as independent service, not tracked as subprocess
+
+def _ollama_running() -> bool:
+    """Check if Ollama server is running"""
+    try:
+        r = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=3)
+        if r.status_code == 200:
+            return True
+    except:
+        pass
+    return False
+
+def _start_ollama_server(wait_secs: float = 30.0):
+    """Start Ollama server as independent background service"""
+    if _ollama_running():
+        print("✅ Ollama server is already running")
+        return True
+    
+    try:
+        print("🚀 Starting Ollama server as independent service...")
+        
+        if os.name == 'nt':  # Windows
+            subprocess.Popen(
+                ['cmd', '/c', 'start', '/B', 'ollama', 'serve'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                creationflags=subprocess.CREATE_NO_WINDOW | subprocess.DETACHED_PROCESS,
+                shell=False
+            )
+        else:  # Unix/Linux/Mac
+            subprocess.Popen(
+                ['nohup', 'ollama', 'serve', '&'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+                shell=True
+            )
+        
+        print("   Ollama started as independent background service")
+        
+        t0 = time.time()
+        while time.time() - t0 < wait_secs:
+            if _ollama_running():
+                print("✅ Ollama server is ready")
+                return True
+            time.sleep(0.5)
+        
+        print("⚠️ Ollama may still be starting...")
+        return False
+    except Exception as e:
+        print(f"❌ Failed to start Ollama: {e}")
+        print("   Please start manually: 'ollama serve'")
+        return False
+
+@router.get("/llm/on")
+async def start_ollama_model():
+    if not _ollama_running():
+        if not _start_ollama_server():
+            return {"status": "error", "error": "Failed to start Ollama server"}
+
+    time.sleep(2)
+
+    try:
+        response = requests.post(
+            f"{OLLAMA_HOST}/api/generate",
+            json={
+                "model": OLLAMA_MODEL,
+                "prompt": "hi",
+                "stream": False,
+                "keep_alive": "10m"
+            },
+            timeout=120
+        )
+        if response.status_code == 200:
+            return {"status": "started", "model": OLLAMA_MODEL}
+        else:
+            return {"status": "error", "error": f"Status {response.status_code}"}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+@router.get("/llm/off")
+async def stop_ollama_model():
+    """Unload model from memory but keep Ollama server running"""
+    try:
+        response = requests.post(
+            f"{OLLAMA_HOST}/api/generate",
+            json={"model": OLLAMA_MODEL, "prompt": "hi", "keep_alive": "0s"},
+            timeout=5
+        )
+        
+        if response.status_code == 200:
+            print(f"✅ Model {OLLAMA_MODEL} unloaded from memory")
+            return {
+                "status": "unloaded",
+                "note": "Model unloaded from memory. Ollama server still running."
+            }
+        else:
+            return {
+                "status": "error",
+                "error": f"Failed to unload model: {response.status_code}"
+            }
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+@router.get("/llm/status")
+async def status_ollama_model():
+    """Get detailed LLM/Ollama status"""
+    try:
+        server_running = _ollama_running()
+        return {
+            "enabled": server_running,
+            "server_running": server_running,
+            "model": OLLAMA_MODEL
+        }
+    except Exception as e:
+        return {
+            "enabled": False,
+            "server_running": False,
+            "model": OLLAMA_MODEL
+        }
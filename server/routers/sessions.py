@@ -0,0 +1,109 @@
+# server/routers/sessions.py - Chat session management endpoints
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+from orion.app.session import get_session_manager, Message
+
+router = APIRouter(tags=["sessions"])
+
+session_manager = get_session_manager()
+
+class SessionCreateRequest(BaseModel):
+    title: Optional[str] = "New Chat"
+
+class SessionUpdateRequest(BaseModel):
+    title: Optional[str] = None
+
+class MessageAddRequest(BaseModel):
+    role: str
+    content: str
+    agent: Optional[str] = None
+    model: Optional[str] = None
+
+@router.post("/api/sessions")
+async def create_session(request: SessionCreateRequest):
+    try:
+        session = session_manager.create_session(title=request.title)
+        return session
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/sessions")
+async def list_sessions(limit: int = 50):
+    try:
+        sessions = session_manager.list_sessions(limit=limit)
+        return {"sessions": sessions}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/sessions/{session_id}")
+async def get_session(session_id: str):
+    try:
+        session = session_manager.get_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return session
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.put("/api/sessions/{session_id}")
+async def update_session(session_id: str, request: SessionUpdateRequest):
+    try:
+        session = session_manager.update_session(
+            session_id=session_id,
+            title=request.title
+        )
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return session
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/api/sessions/{session_id}")
+async def delete_session(session_id: str):
+    try:
+        success = session_manager.delete_session(session_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return {"status": "deleted", "session_id": session_id}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/sessions/{session_id}/messages")
+async def add_message_to_session(session_id: str, message: MessageAddRequest):
+    try:
+        msg = Message(
+            role=message.role,
+            content=message.content,
+            timestamp=datetime.now().isoformat(),
+            agent=message.agent,
+            model=message.model
+        )
+        session = session_manager.add_message(session_id, msg)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return session
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/api/sessions/{session_id}/messages")
+async def clear_session_messages(session_id: str):
+    try:
+        session = session_manager.clear_messages(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return session
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
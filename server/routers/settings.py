@@ -0,0 +1,84 @@
+# server/routers/settings.py - User settings endpoints (persisted to data/settings.json)
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Optional
+import os
+import json
+
+router = APIRouter(tags=["settings"])
+
+SETTINGS_FILE = "data/settings.json"
+
+class SettingsRequest(BaseModel):
+    theme: Optional[str] = None
+    language: Optional[str] = None
+    enable_sounds: Optional[bool] = None
+    enable_notifications: Optional[bool] = None
+    auto_play_tts: Optional[bool] = None
+    default_model: Optional[str] = None
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    voiceInput: Optional[bool] = None
+    voiceOutput: Optional[bool] = None
+    voiceSpeed: Optional[float] = None
+    voiceType: Optional[str] = None
+
+def load_settings() -> dict:
+    """Load settings from file with defaults"""
+    defaults = {
+        "theme": "dark",
+        "language": "en",
+        "enable_sounds": True,
+        "enable_notifications": True,
+        "auto_play_tts": False,
+        "default_model": "qwen2.5:1.5b",
+        "temperature": 0.7,
+        "max_tokens": 2048,
+        "voiceInput": True,
+        "voiceOutput": False,
+        "voiceSpeed": 1.0,
+        "voiceType": "tts_models/en/jenny/jenny"
+    }
+    
+    if os.path.exists(SETTINGS_FILE):
+        try:
+            with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+                defaults.update(saved)
+        except Exception as e:
+            print(f"Error loading settings: {e}")
+    
+    return defaults
+
+def save_settings(settings: dict) -> None:
+    """Save settings to file"""
+    os.makedirs(os.path.dirname(SETTINGS_FILE), exist_ok=True)
+    with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(settings, f, indent=2, ensure_ascii=False)
+
+@router.get("/api/settings")
+async def get_settings():
+    try:
+        return load_settings()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.patch("/api/settings")
+async def update_settings(request: SettingsRequest):
+    try:
+        current = load_settings()
+        updates = request.dict(exclude_unset=True)
+        current.update(updates)
+        save_settings(current)
+        return current
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/api/settings/reset")
+async def reset_settings():
+    try:
+        defaults = load_settings()  # Gets defaults
+        save_settings(defaults)
+        return defaults
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,504 @@
+# server/routers/speech.py - Local speech endpoints (Faster Whisper STT, Coqui TTS)
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from typing import Optional
+import json
+import time
+import base64
+import asyncio
+import functools
+import threading
+
+from server import audio_codec, metrics, stt, stt_cache, tracing, tts
+from server.audio_store import audio_store
+from server.log import get_logger
+
+router = APIRouter(tags=["speech"])
+
+log = get_logger("stt")
+tts_log = get_logger("tts")
+
+
+STREAM_CHUNK_BYTES = 64 * 1024
+DISCONNECT_POLL_SECONDS = 0.25
+
+
+class TTSRequest(BaseModel):
+    text: str
+    voice_model: Optional[str] = None
+    speaker_id: Optional[str] = None
+    # "json" (base64 in JSON, default), "binary" (raw audio body) or "stream" (chunked audio body)
+    response_format: Optional[str] = None
+    # "wav", "opus" (Ogg Opus, alias "ogg") or "mp3"; falls back to the Accept header, then ORION_TTS_FORMAT
+    audio_format: Optional[str] = None
+    bitrate: Optional[int] = None  # bits/s for opus/mp3 (default ORION_TTS_OPUS_BITRATE / ORION_TTS_MP3_BITRATE)
+    speed: Optional[float] = None  # passed to models that support it (e.g. XTTS, VITS)
+
+
+def _tts_delivery(response_format: Optional[str], accept: Optional[str]) -> str:
+    """Explicit response_format wins; otherwise an Accept: audio/* client gets raw bytes"""
+    if response_format in ("json", "binary", "stream"):
+        return response_format
+    if accept and "audio/" in accept and "application/json" not in accept:
+        return "binary"
+    return "json"
+
+
+def _chunks(data: bytes):
+    view = memoryview(data)
+    for start in range(0, len(view), STREAM_CHUNK_BYTES):
+        yield bytes(view[start:start + STREAM_CHUNK_BYTES])
+
+
+async def _run_stt(http_request: Request, fn, *args):
+    """
+    Run fn(*args, cancel_event) on the STT executor. If the client
+    disconnects first, a queued job is dropped and a running one stops at its
+    next segment (TranscriptionCancelled).
+    """
+    loop = asyncio.get_event_loop()
+    cancel = threading.Event()
+    future = tracing.run_in_executor(loop, stt.executor, fn, *args, cancel)
+    while True:
+        done, _ = await asyncio.wait({future}, timeout=DISCONNECT_POLL_SECONDS)
+        if done:
+            return future.result()
+        if await http_request.is_disconnected():
+            cancel.set()
+            future.cancel()
+            raise stt.TranscriptionCancelled()
+
+
+def _preprocess(samples):
+    """
+    Bring quiet microphones up to a usable level, then drop leading/trailing
+    silence and shorten long pauses so Whisper only decodes speech (VAD on
+    the raw level would throw quiet speech away). `samples` is owned by the
+    caller's request and may be modified.
+    """
+    if samples.size == 0:
+        return samples
+    if stt.NORMALIZE:
+        from server import audio_dsp
+        samples = audio_dsp.normalize(samples, out=samples)
+    if stt.VAD_TRIM:
+        from server import vad
+        speech = vad.compact(samples)
+        metrics.STT_VAD_TRIMMED_SECONDS.inc((samples.size - speech.size) / vad.SAMPLE_RATE)
+        samples = speech
+    return samples
+
+
+def _decode(source, cancel: threading.Event):
+    if cancel.is_set():
+        raise stt.TranscriptionCancelled()
+    with metrics.STT_DECODE_SECONDS.time():
+        samples = audio_codec.decode_to_pcm(source, max_seconds=stt.MAX_AUDIO_SECONDS)
+        return _preprocess(samples)
+
+
+def _stt_rejected(status_code: int, error: str, status: str) -> JSONResponse:
+    metrics.STT_REQUESTS.inc(status=status)
+    return JSONResponse({"transcript": "", "status": "error", "error": error}, status_code=status_code)
+
+
+def _upload_too_large(size: Optional[int]) -> bool:
+    return size is not None and size > stt.MAX_UPLOAD_BYTES
+
+
+class UploadLimitMiddleware:
+    """
+    Refuse oversized STT uploads with 413: from Content-Length before the
+    body is read, and for chunked bodies as soon as the bytes received
+    cross the cap (multipart parsing would otherwise spool the whole upload
+    to disk first). The endpoint then sees a client disconnect.
+    """
+
+    PATHS = ("/api/stt", "/api/stt/pcm")
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.PATHS:
+            await self.app(scope, receive, send)
+            return
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and _upload_too_large(int(length)):
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        started = False
+        rejected = False
+
+        async def counting_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if _upload_too_large(received) and not started:
+                    rejected = True
+                    await self._reject(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if not rejected:
+                started = True
+                await send(message)
+
+        try:
+            await self.app(scope, counting_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+    @staticmethod
+    async def _reject(scope, receive, send):
+        response = _stt_rejected(413, f"Upload larger than {stt.MAX_UPLOAD_BYTES} bytes", "too_large")
+        await response(scope, receive, send)
+
+
+async def _check_upload(audio: UploadFile) -> Optional[JSONResponse]:
+    """Size, content-type and container header checks; the file is left at offset 0"""
+    # UploadLimitMiddleware already cut off bodies past the cap; this catches a
+    # file part that is itself too large when the app runs without it
+    size = audio.size
+    if size is None:
+        size = audio.file.seek(0, 2)
+    if _upload_too_large(size):
+        return _stt_rejected(413, f"Upload larger than {stt.MAX_UPLOAD_BYTES} bytes", "too_large")
+
+    content_type = (audio.content_type or "").split(";")[0].strip().lower()
+    if content_type and not content_type.startswith(("audio/", "video/")) \
+            and content_type != "application/octet-stream":
+        return _stt_rejected(415, f"Unsupported content type: {content_type}", "bad_upload")
+
+    await audio.seek(0)
+    header = await audio.read(16)
+    await audio.seek(0)
+    if audio_codec.sniff_container(header) is None:
+        return _stt_rejected(415, "Unrecognized audio container", "bad_upload")
+    return None
+
+
+async def _transcript(http_request: Request, samples, profile: Optional[str], accuracy: Optional[str],
+                      cache_key: Optional[str] = None) -> dict:
+    """Transcribe decoded 16 kHz mono samples into the /api/stt response body"""
+    if samples.size == 0:
+        metrics.STT_REQUESTS.inc(status="no_speech")
+        return {"transcript": "", "status": "error", "error": "No speech detected"}
+
+    # load (or check) the pool model this clip is routed to, not just the default one
+    model_name = stt.route_model(samples.size / 16000, accuracy)
+    with tracing.span("stt.model"):
+        model = await tracing.run_in_executor(asyncio.get_event_loop(), stt.executor,
+                                              stt.get_whisper_model, model_name)
+    if not model:
+        metrics.STT_REQUESTS.inc(status="unavailable")
+        return {"transcript": "", "status": "error", "error": "Faster Whisper not available"}
+
+    # STT executor: the event loop stays free and concurrent uploads can batch
+    with tracing.span("stt.transcribe"):
+        transcribe = functools.partial(stt.transcribe, accuracy=accuracy, model_name=model_name)
+        text, info, profile = await _run_stt(http_request, transcribe, samples, profile)
+
+    if len(text) >= 2:
+        log.debug("transcribed", chars=len(text), language=getattr(info, "language", "en"), profile=profile)
+        metrics.STT_REQUESTS.inc(status="success")
+        if cache_key is not None:
+            stt_cache.stt_cache.put(cache_key, text)
+        return {"transcript": text, "status": "success", "service": "faster-whisper"}
+    else:
+        metrics.STT_REQUESTS.inc(status="no_speech")
+        return {"transcript": "", "status": "error", "error": "No speech detected"}
+
+
+@router.post("/api/stt")
+async def speech_to_text(http_request: Request, audio: UploadFile = File(...), profile: Optional[str] = None,
+                         accuracy: Optional[str] = None):
+    """
+    Convert speech to text using Faster Whisper (lazy-loaded). `profile`
+    overrides the automatic decoding profile; `accuracy` ("fast" |
+    "balanced" | "accurate") overrides which pool model handles the clip.
+    """
+    loop = asyncio.get_event_loop()
+    try:
+        log.debug("received audio", filename=audio.filename, content_type=audio.content_type)
+
+        rejected = await _check_upload(audio)
+        if rejected is not None:
+            return rejected
+
+        # a resent recording (dashboard retry) gets the transcript from last time
+        cache_key = None
+        if stt_cache.STT_CACHE_ENABLED:
+            with tracing.span("stt.cache"):
+                cache_key = await loop.run_in_executor(None, stt_cache.upload_key, audio.file, profile, accuracy)
+            cached = stt_cache.stt_cache.get(cache_key)
+            if cached is not None:
+                metrics.STT_REQUESTS.inc(status="success")
+                return {"transcript": cached, "status": "success", "service": "faster-whisper"}
+
+        # PyAV (ships with faster-whisper) reads the spooled upload in chunks and
+        # decodes straight to 16 kHz mono float32; no copy of the whole file in memory
+        with tracing.span("stt.decode"):
+            try:
+                samples = await _run_stt(http_request, _decode, audio.file)
+            except audio_codec.AudioTooLong as e:
+                return _stt_rejected(413, str(e), "too_large")
+        return await _transcript(http_request, samples, profile, accuracy, cache_key)
+
+    except stt.TranscriptionCancelled:
+        log.debug("client disconnected, transcription cancelled")
+        metrics.STT_REQUESTS.inc(status="cancelled")
+        return {"transcript": "", "status": "error", "error": "cancelled"}
+
+    except Exception as e:
+        log.exception("stt failed")
+        metrics.STT_REQUESTS.inc(status="error")
+        return {"transcript": "", "status": "error", "error": str(e)}
+
+
+PCM_ENCODINGS = ("pcm16", "f32")
+
+
+async def _read_body(http_request: Request, limit: int) -> Optional[bytearray]:
+    """Request body into one buffer (preallocated from Content-Length), None past `limit` bytes"""
+    length = http_request.headers.get("content-length")
+    size = int(length) if length and length.isdigit() else 0
+    if size > limit:
+        return None
+    buf = bytearray(size)
+    filled = 0
+    async for chunk in http_request.stream():
+        end = filled + len(chunk)
+        if end > limit:
+            return None
+        if end <= len(buf):
+            buf[filled:end] = chunk
+        else:
+            del buf[filled:]
+            buf += chunk
+        filled = end
+    del buf[filled:]
+    return buf
+
+
+def _pcm_samples(body: bytearray, encoding: str, channels: int, rate: int, cancel: threading.Event):
+    from server import stt_stream
+    if cancel.is_set():
+        raise stt.TranscriptionCancelled()
+    with metrics.STT_DECODE_SECONDS.time():
+        samples = stt_stream.pcm_from_bytes(body, encoding, channels)
+        if rate != stt_stream.SAMPLE_RATE:
+            samples = stt_stream.resample(samples, rate)
+        return _preprocess(samples)
+
+
+@router.post("/api/stt/pcm")
+async def speech_to_text_pcm(http_request: Request, profile: Optional[str] = None, accuracy: Optional[str] = None):
+    """
+    STT for raw little-endian PCM bodies, no container to decode. Headers:
+    X-Sample-Rate (default 16000), X-Channels (default 1) and X-Sample-Format
+    ("pcm16" default, or "f32"). 16 kHz mono goes to Whisper as-is.
+    """
+    try:
+        rate = int(http_request.headers.get("x-sample-rate", "16000"))
+        channels = int(http_request.headers.get("x-channels", "1"))
+    except ValueError:
+        return _stt_rejected(400, "X-Sample-Rate and X-Channels must be integers", "bad_upload")
+    encoding = http_request.headers.get("x-sample-format", "pcm16").lower()
+    if encoding not in PCM_ENCODINGS or not 8000 <= rate <= 192000 or not 1 <= channels <= 8:
+        return _stt_rejected(400, "Unsupported PCM format", "bad_upload")
+
+    try:
+        with tracing.span("stt.read"):
+            body = await _read_body(http_request, stt.MAX_UPLOAD_BYTES)
+        if body is None:
+            return _stt_rejected(413, f"Upload larger than {stt.MAX_UPLOAD_BYTES} bytes", "too_large")
+
+        frame_bytes = (4 if encoding == "f32" else 2) * channels
+        if len(body) // frame_bytes > stt.MAX_AUDIO_SECONDS * rate:
+            return _stt_rejected(413, f"Audio longer than {stt.MAX_AUDIO_SECONDS:g}s", "too_large")
+        with tracing.span("stt.decode"):
+            samples = await _run_stt(http_request, _pcm_samples, body, encoding, channels, rate)
+        del body
+        return await _transcript(http_request, samples, profile, accuracy)
+
+    except stt.TranscriptionCancelled:
+        log.debug("client disconnected, transcription cancelled")
+        metrics.STT_REQUESTS.inc(status="cancelled")
+        return {"transcript": "", "status": "error", "error": "cancelled"}
+
+    except Exception as e:
+        log.exception("stt failed")
+        metrics.STT_REQUESTS.inc(status="error")
+        return {"transcript": "", "status": "error", "error": str(e)}
+
+
+@router.websocket("/ws/stt")
+async def speech_to_text_stream(websocket: WebSocket, sample_rate: int = 16000, encoding: str = "pcm16"):
+    """
+    Streaming STT. Send binary frames of mono audio (`encoding` pcm16 or f32
+    at `sample_rate`) as they are captured, and {"type": "end"} to finish.
+    Receive {"type": "partial"|"final", "segment": n, "text": ...} messages;
+    a final arrives ~END_SILENCE_MS after the speaker stops.
+    """
+    from server import audio_dsp, stt_stream
+
+    await websocket.accept()
+    loop = asyncio.get_event_loop()
+    model = await loop.run_in_executor(stt.executor, stt.get_whisper_model)
+    if not model:
+        metrics.STT_REQUESTS.inc(status="unavailable")
+        await websocket.send_json({"type": "error", "error": "Faster Whisper not available"})
+        await websocket.close()
+        return
+
+    segmenter = stt_stream.UtteranceSegmenter()
+    # stateful, so frame boundaries don't click
+    resampler = audio_dsp.Resampler(sample_rate) if sample_rate != stt_stream.SAMPLE_RATE else None
+    state = {"segment": 0}
+    partial_task = None
+
+    async def send_partial(segment: int, audio):
+        try:
+            text = await loop.run_in_executor(stt.executor, stt.transcribe_pcm, audio, False)
+        except Exception as e:
+            log.warning("partial transcription failed", error=str(e))
+            return
+        # a final for this utterance may have gone out while we were decoding
+        if text and state["segment"] == segment:
+            await websocket.send_json({"type": "partial", "segment": segment, "text": text})
+
+    async def send_final(audio):
+        segment = state["segment"]
+        state["segment"] += 1
+        ended = time.perf_counter()
+        text = await loop.run_in_executor(stt.executor, stt.transcribe_pcm, audio, True)
+        metrics.STT_REQUESTS.inc(status="success" if text else "no_speech")
+        await websocket.send_json({
+            "type": "final",
+            "segment": segment,
+            "text": text,
+            "duration": round(len(audio) / stt_stream.SAMPLE_RATE, 2),
+        })
+        metrics.STT_STREAM_FINALIZE_SECONDS.observe(time.perf_counter() - ended)
+
+    await websocket.send_json({"type": "ready", "sample_rate": stt_stream.SAMPLE_RATE})
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                samples = stt_stream.pcm_from_bytes(message["bytes"], encoding)
+                if resampler is not None:
+                    samples = resampler.process(samples)
+                events = segmenter.feed(samples)
+            elif message.get("text"):
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    continue
+                if control.get("type") != "end":
+                    continue
+                event = segmenter.flush()
+                if event is not None:
+                    await send_final(event[1])
+                await websocket.send_json({"type": "end"})
+                continue
+            else:
+                continue
+
+            for kind, audio in events:
+                if kind == "final":
+                    await send_final(audio)
+                elif partial_task is None or partial_task.done():
+                    # skip this snapshot if the previous partial is still decoding
+                    partial_task = asyncio.create_task(send_partial(state["segment"], audio))
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        log.exception("stt stream failed")
+        metrics.STT_REQUESTS.inc(status="error")
+        try:
+            await websocket.send_json({"type": "error", "error": str(e)})
+        except Exception:
+            pass
+    finally:
+        if partial_task is not None:
+            partial_task.cancel()
+
+
+@router.post("/api/tts")
+async def text_to_speech(request: TTSRequest, http_request: Request):
+    """Convert text to speech using Coqui TTS (lazy-loaded)"""
+    accept = http_request.headers.get("accept")
+    delivery = _tts_delivery(request.response_format, accept)
+    audio_format = audio_codec.negotiate_format(request.audio_format, accept)
+    try:
+        if not request.text:
+            return _tts_error("No text provided", delivery, 400)
+
+        voice_model, speaker_id = tts.split_voice(request.voice_model, request.speaker_id)
+
+        loop = asyncio.get_event_loop()
+        with tracing.span("tts"):
+            audio_bytes, audio_format = await tracing.run_in_executor(
+                loop,
+                tts.executor,
+                tts.synthesize_sync,
+                request.text,
+                voice_model,
+                speaker_id,
+                audio_format,
+                request.bitrate,
+                request.speed
+            )
+
+        if not audio_bytes:
+            return _tts_error("TTS generation failed", delivery, 500)
+
+        media_type = tts.MEDIA_TYPES.get(audio_format, "application/octet-stream")
+        if delivery == "binary":
+            return Response(content=audio_bytes, media_type=media_type)
+        if delivery == "stream":
+            return StreamingResponse(_chunks(audio_bytes), media_type=media_type)
+        return {
+            "status": "success",
+            "audio": base64.b64encode(audio_bytes).decode('utf-8'),
+            "format": audio_format,
+            "service": "coqui-tts"
+        }
+
+    except Exception as e:
+        tts_log.exception("tts failed")
+        return _tts_error(str(e), delivery, 500)
+
+
+def _tts_error(message: str, delivery: str, status_code: int):
+    # JSON clients always got 200 + status=error; binary clients need a real error status
+    if delivery == "json":
+        return {"status": "error", "error": message}
+    return JSONResponse(status_code=status_code, content={"status": "error", "error": message})
+
+
+@router.get("/api/audio/{audio_id}")
+async def get_audio(audio_id: str):
+    """Fetch synthesized audio referenced by a chat response's audio_id"""
+    clip = audio_store.get(audio_id)
+    if clip is None:
+        raise HTTPException(status_code=404, detail="Audio not found or expired")
+    audio_bytes, audio_format = clip
+    return Response(
+        content=audio_bytes,
+        media_type=tts.MEDIA_TYPES.get(audio_format, "application/octet-stream"),
+        headers={"Cache-Control": f"private, max-age={int(audio_store.ttl)}"}
+    )
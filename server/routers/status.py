@@ -0,0 +1,93 @@
+# server/routers/status.py - UI entry point, health and service status
+from fastapi import APIRouter, Request
+from fastapi.responses import FileResponse, JSONResponse, Response
+import os
+
+from server import metrics, stt, tts, warmup
+from server.routers.llm import _ollama_running
+
+router = APIRouter(tags=["status"])
+
+ORION_MODE = os.getenv("ORION_MODE", "hybrid").lower()
+
+
+@router.get("/")
+async def serve_ui():
+    ui_path = "ui/web/index.html"
+    if not os.path.exists(ui_path):
+        return JSONResponse(
+            status_code=404,
+            content={"error": f"UI file not found at {ui_path}."}
+        )
+    return FileResponse(ui_path)
+
+@router.get("/health")
+async def health_check():
+    """Health check with lazy model checking"""
+    llm_healthy = True
+
+    if ORION_MODE == "strict":
+        llm_healthy = _ollama_running()
+
+    return {
+        "status": "healthy" if llm_healthy else "degraded",
+        "service": "orion",
+        "mode": ORION_MODE,
+        "llm_available": llm_healthy,
+        "ai_services": {
+            "llm": f"Ollama" if ORION_MODE == "strict" else "OpenAI GPT-4",
+            "tts": ("Loaded" if tts.tts_model is not None else "Lazy-loaded") if tts.COQUI_AVAILABLE else "None",
+            "stt": ("Loaded" if stt.whisper_model is not None else "Lazy-loaded") if stt.FASTER_WHISPER_AVAILABLE else "None",
+        }
+    }
+
+@router.get("/livez")
+async def liveness():
+    """Liveness probe - the process is up and the event loop is responsive"""
+    return {"status": "alive"}
+
+@router.get("/readyz")
+async def readiness():
+    """Readiness probe - 503 until every warmed-up model has loaded"""
+    state = warmup.readiness()
+    return JSONResponse(status_code=200 if state["ready"] else 503, content=state)
+
+@router.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+@router.get("/api/status")
+async def ai_status(request: Request):
+    """Get status of AI services and how long startup took"""
+    startup = getattr(request.app.state, "startup", None)
+    return {
+        "current_mode": ORION_MODE,
+        "modes": {
+            "strict": {
+                "description": "Fully local (Ollama + Local Speech)",
+                "llm": "Ollama",
+                "privacy": "Maximum - No cloud calls"
+            },
+            "hybrid": {
+                "description": "Cloud LLM + Local Speech + PII Redaction",
+                "llm": "OpenAI GPT-4",
+                "privacy": "High - Speech local, API calls logged + PII redacted"
+            },
+            "cloud": {
+                "description": "Cloud LLM + Local Speech + Logging",
+                "llm": "OpenAI GPT-4",
+                "privacy": "Medium - Speech local, API calls logged"
+            }
+        },
+        "local_services": {
+            "coqui_tts": tts.status(),
+            "faster_whisper": stt.status()
+        },
+        "privacy_features": {
+            "api_logging": os.getenv("API_LOGGING_ENABLED", "true").lower() == "true" and ORION_MODE != "strict",
+            "pii_redaction": os.getenv("PII_REDACTION_ENABLED", "true").lower() == "true" and ORION_MODE == "hybrid",
+            "local_speech": True
+        },
+        "startup": startup.report() if startup else None
+    }
@@ -0,0 +1,270 @@
+# server/routers/voice.py - Full-duplex voice conversation (/ws/voice: STT -> orchestrator -> TTS)
+#
+# One WebSocket carries a whole conversation. Mic audio streams in all the
+# time; when the user stops talking the utterance is transcribed, answered by
+# the orchestrator, and the answer is spoken back sentence by sentence while
+# the next sentence is being synthesized. If the user starts talking again
+# while a reply is in flight (barge-in), the reply is cancelled.
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from typing import List, Optional
+import os
+import re
+import json
+import time
+import asyncio
+import threading
+
+from server import audio_codec, metrics, stt, tracing, tts
+from server.log import get_logger
+
+router = APIRouter(tags=["voice"])
+
+log = get_logger("voice")
+
+BARGE_IN_MS = int(os.getenv("ORION_VOICE_BARGE_IN_MS", "200"))  # speech needed to interrupt a reply
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Answer -> sentences, the unit replies are synthesized and streamed in"""
+    return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+
+def _answer(text: str, mode: str) -> dict:
+    """Blocking orchestrator call (same pipeline as /api/chat, voice output hint)"""
+    from orion.app.orchestrator import process_query
+    from server.routers.chat import TimedMemory
+
+    response = process_query(
+        query=text,
+        memory=TimedMemory(),
+        outputhint="voice",
+        username=None,
+        legalname=None,
+        traits={},
+        profile=None,
+        detectedemotion=None,
+        strict=(mode == "strict")
+    )
+    if isinstance(response, dict):
+        return response
+    return {"answer": response, "agent": "conversational"}
+
+
+class VoiceSession:
+    """State of one /ws/voice connection"""
+
+    def __init__(self, websocket: WebSocket, sample_rate: int, encoding: str, mode: str,
+                 voice_model: Optional[str], speaker_id: Optional[str], audio_format: str,
+                 bitrate: Optional[int], speed: Optional[float]):
+        from server import audio_dsp, stt_stream
+
+        self.websocket = websocket
+        self.encoding = encoding
+        self.mode = mode
+        self.voice_model, self.speaker_id = tts.split_voice(voice_model, speaker_id)
+        self.audio_format = audio_format
+        self.bitrate = bitrate
+        self.speed = speed
+        self.segmenter = stt_stream.UtteranceSegmenter()
+        self.resampler = audio_dsp.Resampler(sample_rate) if sample_rate != stt_stream.SAMPLE_RATE else None
+        self.turn = 0
+        self.reply: Optional[asyncio.Task] = None
+        self.cancel = threading.Event()  # seen by executor jobs of the current reply
+        self.partial: Optional[asyncio.Task] = None
+        self._send_lock = asyncio.Lock()
+
+    # === Sending ===
+    async def send(self, message: dict, audio: Optional[bytes] = None):
+        # a header and its binary frame go out back to back
+        async with self._send_lock:
+            await self.websocket.send_json(message)
+            if audio is not None:
+                await self.websocket.send_bytes(audio)
+
+    # === Input ===
+    async def feed(self, data: bytes):
+        from server import stt_stream
+
+        samples = stt_stream.pcm_from_bytes(data, self.encoding)
+        if self.resampler is not None:
+            samples = self.resampler.process(samples)
+        events = self.segmenter.feed(samples)
+        if self.replying() and self.segmenter.speech_ms >= BARGE_IN_MS:
+            await self.barge_in()
+        for kind, audio in events:
+            if kind == "final":
+                self.start_reply(audio)
+            elif self.partial is None or self.partial.done():
+                # partials belong to the turn this utterance will start
+                self.partial = asyncio.create_task(self.send_partial(self.turn + 1, audio))
+
+    async def end(self):
+        """Client finished: answer whatever is still open, then wait for the reply"""
+        event = self.segmenter.flush()
+        if event is not None:
+            self.start_reply(event[1])
+        if self.reply is not None:
+            await asyncio.gather(self.reply, return_exceptions=True)
+
+    async def send_partial(self, turn: int, audio):
+        loop = asyncio.get_event_loop()
+        try:
+            text = await loop.run_in_executor(stt.executor, stt.transcribe_pcm, audio, False)
+        except Exception as e:
+            log.warning("partial transcription failed", error=str(e))
+            return
+        if text and self.turn + 1 == turn:  # no final for it yet
+            await self.send({"type": "partial", "turn": turn, "text": text})
+
+    # === Replies ===
+    def replying(self) -> bool:
+        return self.reply is not None and not self.reply.done()
+
+    def start_reply(self, audio):
+        if self.replying():
+            self.cancel_reply()
+        self.turn += 1
+        self.cancel = threading.Event()
+        self.reply = asyncio.create_task(self.respond(self.turn, audio, self.cancel))
+
+    def cancel_reply(self):
+        self.cancel.set()
+        if self.reply is not None:
+            self.reply.cancel()
+            self.reply = None
+
+    def close(self):
+        """Connection gone: stop the reply and any partial transcription still running"""
+        self.cancel_reply()
+        if self.partial is not None:
+            self.partial.cancel()
+            self.partial = None
+
+    async def barge_in(self):
+        turn = self.turn
+        self.cancel_reply()
+        metrics.VOICE_TURNS.inc(status="barge_in")
+        log.debug("barge-in", turn=turn)
+        await self.send({"type": "barge_in", "turn": turn})
+
+    async def respond(self, turn: int, audio, cancel: threading.Event):
+        """Transcript -> answer -> spoken sentences, for one turn"""
+        loop = asyncio.get_event_loop()
+        ended = time.perf_counter()
+        try:
+            text = await loop.run_in_executor(stt.executor, stt.transcribe_pcm, audio, True)
+            await self.send({"type": "transcript", "turn": turn, "text": text})
+            if not text:
+                metrics.VOICE_TURNS.inc(status="no_speech")
+                return
+
+            llm_start = time.perf_counter()
+            with tracing.span("llm"):
+                # the orchestrator can't be interrupted; after a barge-in its answer is dropped
+                response = await loop.run_in_executor(None, _answer, text, self.mode)
+            llm_seconds = time.perf_counter() - llm_start
+            metrics.LLM_TOTAL_SECONDS.observe(llm_seconds, mode=self.mode)
+            answer = response.get("answer", "")
+            await self.send({"type": "answer", "turn": turn, "text": answer, "agent": response.get("agent")})
+
+            await self.speak(turn, answer, cancel, ended)
+            await self.send({"type": "done", "turn": turn})
+            metrics.VOICE_TURNS.inc(status="success")
+        except asyncio.CancelledError:
+            cancel.set()
+            raise
+        except Exception as e:
+            log.exception("voice turn failed")
+            metrics.VOICE_TURNS.inc(status="error")
+            try:
+                await self.send({"type": "error", "turn": turn, "error": str(e)})
+            except Exception:
+                pass  # the socket itself is what failed
+
+    def _synthesize(self, sentence: str, cancel: threading.Event):
+        if cancel.is_set():
+            return None, None
+        return tts.synthesize_sync(sentence, self.voice_model, self.speaker_id,
+                                   self.audio_format, self.bitrate, self.speed)
+
+    async def speak(self, turn: int, answer: str, cancel: threading.Event, ended: float):
+        """Stream each sentence as a token message plus its audio; the next one synthesizes meanwhile"""
+        sentences = split_sentences(answer)
+        if not tts.COQUI_AVAILABLE:
+            for index, sentence in enumerate(sentences):
+                await self.send({"type": "token", "turn": turn, "index": index, "text": sentence})
+            return
+
+        loop = asyncio.get_event_loop()
+
+        def start(i):
+            return tracing.run_in_executor(loop, tts.executor, self._synthesize, sentences[i], cancel)
+
+        pending = start(0) if sentences else None
+        try:
+            for index, sentence in enumerate(sentences):
+                audio, audio_format = await pending
+                pending = start(index + 1) if index + 1 < len(sentences) else None
+                await self.send({"type": "token", "turn": turn, "index": index, "text": sentence})
+                if audio:
+                    if index == 0:
+                        metrics.VOICE_FIRST_AUDIO_SECONDS.observe(time.perf_counter() - ended)
+                    await self.send({"type": "audio", "turn": turn, "index": index, "format": audio_format}, audio)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+
+@router.websocket("/ws/voice")
+async def voice_conversation(websocket: WebSocket, sample_rate: int = 16000, encoding: str = "pcm16",
+                             mode: str = "hybrid", voice_model: Optional[str] = None,
+                             speaker_id: Optional[str] = None, audio_format: Optional[str] = None,
+                             bitrate: Optional[int] = None, speed: Optional[float] = None):
+    """
+    Voice conversation. Send binary frames of mono mic audio (`encoding`
+    pcm16 or f32 at `sample_rate`) the whole time, and {"type": "end"} to
+    finish. Per turn you receive partial, transcript, answer, then pairs of
+    {"type": "token", "index": i, "text": sentence} and {"type": "audio",
+    "index": i, "format": ...} followed by a binary audio frame, then done.
+    Speaking over a reply sends {"type": "barge_in"} and stops it.
+    """
+    await websocket.accept()
+    loop = asyncio.get_event_loop()
+    model = await loop.run_in_executor(stt.executor, stt.get_whisper_model)
+    if not model:
+        await websocket.send_json({"type": "error", "error": "Faster Whisper not available"})
+        await websocket.close()
+        return
+
+    session = VoiceSession(websocket, sample_rate, encoding, mode, voice_model, speaker_id,
+                           audio_codec.negotiate_format(audio_format, None), bitrate, speed)
+    await session.send({"type": "ready", "sample_rate": session.segmenter.sample_rate})
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                await session.feed(message["bytes"])
+            elif message.get("text"):
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    continue
+                if control.get("type") == "end":
+                    await session.end()
+                    await session.send({"type": "end"})
+                    break
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        log.exception("voice conversation failed")
+        try:
+            await session.send({"type": "error", "error": str(e)})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        session.close()
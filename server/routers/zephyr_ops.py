@@ -10,8 +10,8 @@ from pydantic import BaseModel
 from typing import Optional, List, Dict
 import os, json, shutil, subprocess, threading, time
 from pathlib import Path
-import requests, psutil  # pip install psutil
-import threading, atexit
+import requests
+import atexit
 
 # ===== On-demand Ollama control =====
 OLLAMA_HOST = os.getenv("OLLAMA_BASE_URL", "http://127.0.0.1:11434")
@@ -35,6 +35,7 @@ def _ollama_running() -> bool:
     except Exception:
         pass
     # Fallback: check process table
+    import psutil  # pip install psutil
     for p in psutil.process_iter(attrs=["name"]):
         if p.info["name"] and "ollama" in p.info["name"].lower():
             return True
@@ -57,6 +58,7 @@ def _start_ollama_if_needed(wait_secs: float = 30.0):
     raise HTTPException(status_code=504, detail="Ollama did not become ready in time")
 
 def _stop_ollama():
+    import psutil  # pip install psutil
     killed = 0
     for p in psutil.process_iter(attrs=["name", "pid"]):
         if p.info["name"] and "ollama" in p.info["name"].lower():
@@ -68,11 +70,6 @@ def _stop_ollama():
     return killed
 
 def _idle_reaper():
-    global _reaper_started
-    with _reaper_lock:
-        if _reaper_started:
-            return
-        _reaper_started = True
     # simple background loop
     while True:
         try:
@@ -83,9 +80,15 @@ def _idle_reaper():
         except Exception:
             time.sleep(5)
 
-# Start the reaper thread when the module loads
-threading.Thread(target=_idle_reaper, daemon=True).start()
-atexit.register(_stop_ollama)  # ensure we shut it down on server exit
+def _ensure_reaper():
+    """Start the idle reaper the first time this router spins up Ollama"""
+    global _reaper_started
+    with _reaper_lock:
+        if _reaper_started:
+            return
+        _reaper_started = True
+    threading.Thread(target=_idle_reaper, daemon=True).start()
+    atexit.register(_stop_ollama)  # ensure we shut it down on server exit
 
 # =============== CONFIG ===============
 DATA_ROOT = Path("data")  # relative to project root
@@ -285,6 +288,7 @@ PARAMETER num_ctx 8192
 @router.post("/infer")
 async def infer(req: InferenceRequest):
     _start_ollama_if_needed()   # <-- spin up if not running
+    _ensure_reaper()
     _touch_activity()
     try:
         r = requests.post(f"{OLLAMA_HOST}/api/generate", json={
@@ -0,0 +1,67 @@
+# server/startup.py - Startup profiles and phase timing for the app factory
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from server.log import get_logger
+
+# eager      - load Whisper + Coqui before the app starts serving (old server/main.py)
+# lazy       - load each model on first use (old server/main_optimized.py)
+# background - start serving immediately and load models on a background thread
+STARTUP_PROFILES = ("eager", "lazy", "background")
+DEFAULT_STARTUP_PROFILE = "eager"  # what server/main.py always did
+
+log = get_logger("startup")
+
+
+def resolve_profile(profile: Optional[str] = None) -> str:
+    """Pick the startup profile from the argument or ORION_STARTUP_PROFILE"""
+    profile = (profile or os.getenv("ORION_STARTUP_PROFILE", DEFAULT_STARTUP_PROFILE)).lower()
+    if profile not in STARTUP_PROFILES:
+        log.warning("unknown startup profile", profile=profile, using=DEFAULT_STARTUP_PROFILE)
+        profile = DEFAULT_STARTUP_PROFILE
+    return profile
+
+
+class StartupTimer:
+    """Records how long each startup phase took so /api/status can report it"""
+
+    def __init__(self, profile: str):
+        self.profile = profile
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.phases: Dict[str, Dict] = {}
+        self.ready_ms: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block and store it under `name` (errors are recorded, then re-raised)"""
+        t0 = time.perf_counter()
+        entry = {"status": "ok"}
+        try:
+            yield entry
+        except Exception as e:
+            entry["status"] = "error"
+            entry["error"] = str(e)
+            raise
+        finally:
+            entry["ms"] = round((time.perf_counter() - t0) * 1000, 2)
+            self.phases[name] = entry
+
+    def skip(self, name: str, reason: str):
+        """Record a phase that did not run for this profile"""
+        self.phases[name] = {"status": "skipped", "reason": reason, "ms": 0.0}
+
+    def mark_ready(self):
+        """Mark the point where the app can serve requests"""
+        self.ready_ms = round((time.perf_counter() - self._t0) * 1000, 2)
+
+    def report(self) -> Dict:
+        return {
+            "profile": self.profile,
+            "started_at": self.started_at,
+            "phases": self.phases,
+            "time_to_ready_ms": self.ready_ms,
+            "total_ms": round(sum(p["ms"] for p in self.phases.values()), 2),
+        }
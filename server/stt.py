@@ -0,0 +1,219 @@
+# server/stt.py - Faster Whisper model loading and transcription
+import os
+import threading
+import concurrent.futures
+from importlib.util import find_spec
+from typing import Optional
+
+from server import metrics, stt_batcher, stt_cache
+from server.log import get_logger
+
+# faster_whisper (and ctranslate2 behind it) is only imported on first use;
+# find_spec checks it is installed without paying for the import.
+FASTER_WHISPER_AVAILABLE = find_spec("faster_whisper") is not None
+
+log = get_logger("stt")
+
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+# Model pool, fastest first (e.g. "tiny.en,base.en,small.en"); default is just WHISPER_MODEL
+WHISPER_MODELS = [m.strip() for m in os.getenv("WHISPER_MODELS", "").split(",") if m.strip()] or [WHISPER_MODEL]
+if WHISPER_MODEL not in WHISPER_MODELS:
+    WHISPER_MODEL = WHISPER_MODELS[0]
+
+whisper_model = None      # WHISPER_MODEL once loaded (warmup/readiness track this one)
+whisper_models = {}       # model name -> WhisperModel, loaded on first use
+_load_lock = threading.Lock()
+_load_locks = {name: threading.Lock() for name in WHISPER_MODELS}
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE")  # resolved on first load when unset
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE")
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))  # CTranslate2 threads per decode, 0 = its default
+WHISPER_NUM_WORKERS = int(os.getenv("WHISPER_NUM_WORKERS", "2"))  # decodes CTranslate2 runs in parallel
+
+# STT runs on its own threads so a long transcription never blocks the event
+# loop or queues behind TTS. Batched clips wait here for their batch, so keep
+# more threads than WHISPER_NUM_WORKERS.
+STT_WORKERS = int(os.getenv("ORION_STT_WORKERS", "4"))
+executor = concurrent.futures.ThreadPoolExecutor(max_workers=STT_WORKERS, thread_name_prefix="orion-stt")
+
+# Decoding profiles: options passed to WhisperModel.transcribe
+DECODING_PROFILES = {
+    # one-line voice commands: greedy, no timestamp tokens
+    "command": {"beam_size": 1, "without_timestamps": True, "condition_on_previous_text": False, "vad_filter": True},
+    # long dictation: beam search, context carried across 30s windows
+    "dictation": {"beam_size": 5, "vad_filter": True},
+    # long clips while the server is busy: greedy but keep timestamps/context
+    "fast": {"beam_size": 1, "vad_filter": True},
+    # streaming partials (/ws/stt), superseded by the final pass
+    "partial": {"beam_size": 1, "without_timestamps": True, "condition_on_previous_text": False},
+}
+STT_PROFILE = os.getenv("ORION_STT_PROFILE", "auto")                      # auto or a profile name
+SHORT_CLIP_SECONDS = float(os.getenv("ORION_STT_SHORT_CLIP_SECONDS", "8"))
+BUSY_TRANSCRIPTIONS = int(os.getenv("ORION_STT_BUSY_TRANSCRIPTIONS", "2"))  # in flight -> "busy"
+
+# /api/stt upload limits, enforced before any model work
+MAX_UPLOAD_BYTES = int(os.getenv("ORION_STT_MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+MAX_AUDIO_SECONDS = float(os.getenv("ORION_STT_MAX_AUDIO_SECONDS", "300"))
+# Cut silence out of uploads (server/vad.py) before they reach Whisper
+VAD_TRIM = os.getenv("ORION_STT_VAD", "true").lower() == "true"
+# Boost quiet recordings towards ORION_STT_TARGET_DBFS (server/audio_dsp.py)
+NORMALIZE = os.getenv("ORION_STT_NORMALIZE", "true").lower() == "true"
+
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+metrics.MODELS_LOADED.set_function(lambda: len(whisper_models), kind="whisper")
+metrics.EXECUTOR_QUEUE_DEPTH.set_function(lambda: executor._work_queue.qsize(), executor="stt")
+
+
+def _resolve_device():
+    """Pick cuda/cpu via ctranslate2 (already loaded by faster_whisper, unlike torch)"""
+    global WHISPER_DEVICE, WHISPER_COMPUTE_TYPE
+    if WHISPER_DEVICE is None:
+        try:
+            import ctranslate2
+            WHISPER_DEVICE = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        except Exception:
+            WHISPER_DEVICE = "cpu"
+    if WHISPER_COMPUTE_TYPE is None:
+        WHISPER_COMPUTE_TYPE = "float16" if WHISPER_DEVICE == "cuda" else "float32"
+
+
+def get_whisper_model(name: Optional[str] = None):
+    """Load a pool model on first use (shared by every request); WHISPER_MODEL by default"""
+    global whisper_model
+    name = name if name in _load_locks else WHISPER_MODEL
+    model = whisper_models.get(name)
+    if model is not None or not FASTER_WHISPER_AVAILABLE:
+        return model
+    # one lock per size: loading "small" doesn't hold up requests routed to "tiny"
+    with _load_locks[name]:
+        if name not in whisper_models:
+            try:
+                from faster_whisper import WhisperModel
+                with _load_lock:
+                    _resolve_device()
+                log.info("loading model", model=name, device=WHISPER_DEVICE)
+                whisper_models[name] = WhisperModel(
+                    name,
+                    device=WHISPER_DEVICE,
+                    compute_type=WHISPER_COMPUTE_TYPE,
+                    cpu_threads=WHISPER_CPU_THREADS,
+                    num_workers=WHISPER_NUM_WORKERS
+                )
+                if name == WHISPER_MODEL:
+                    whisper_model = whisper_models[name]
+                log.info("model loaded", model=name)
+            except Exception as e:
+                log.warning("model load failed", model=name, error=str(e))
+    return whisper_models.get(name)
+
+
+ACCURACY_HINTS = ("fast", "balanced", "accurate")
+
+
+def route_model(duration: float, accuracy: Optional[str] = None, in_flight: Optional[int] = None) -> str:
+    """
+    Fastest acceptable pool model for a clip:
+      - short commands -> smallest model, <=30s -> middle, longer dictation -> largest
+      - accuracy hint "fast"/"accurate" pins the smallest/largest model
+      - while busy (BUSY_TRANSCRIPTIONS in flight) step one size down
+    """
+    if len(WHISPER_MODELS) == 1:
+        return WHISPER_MODELS[0]
+    last = len(WHISPER_MODELS) - 1
+    if accuracy == "fast":
+        return WHISPER_MODELS[0]
+    if accuracy == "accurate":
+        return WHISPER_MODELS[last]
+    if duration <= SHORT_CLIP_SECONDS:
+        index = 0
+    elif duration <= 30:
+        index = max(1, last // 2)
+    else:
+        index = last
+    busy = (_in_flight if in_flight is None else in_flight) >= BUSY_TRANSCRIPTIONS
+    if busy and index > 0:
+        index -= 1
+    return WHISPER_MODELS[index]
+
+
+def choose_profile(duration: float, in_flight: Optional[int] = None) -> str:
+    """Pick a decoding profile from clip length and how many transcriptions are running"""
+    if STT_PROFILE in DECODING_PROFILES:
+        return STT_PROFILE
+    if duration <= SHORT_CLIP_SECONDS:
+        return "command"
+    busy = (_in_flight if in_flight is None else in_flight) >= BUSY_TRANSCRIPTIONS
+    return "fast" if busy else "dictation"
+
+
+class TranscriptionCancelled(Exception):
+    """The client went away; decoding stopped early"""
+
+
+def transcribe(samples, profile: Optional[str] = None, cancel: Optional[threading.Event] = None,
+               accuracy: Optional[str] = None, model_name: Optional[str] = None) -> tuple:
+    """
+    Transcribe 16 kHz mono float32 samples with a decoding profile and pool
+    model (both chosen automatically when not given). Returns (text, info,
+    profile); info is None for clips decoded in a batch.
+
+    Setting `cancel` stops decoding at the next segment boundary and raises
+    TranscriptionCancelled.
+    """
+    global _in_flight
+    duration = len(samples) / 16000
+    model_name = model_name if model_name in WHISPER_MODELS else route_model(duration, accuracy)
+    model = get_whisper_model(model_name)
+    if model is None:
+        raise RuntimeError("Faster Whisper not available")
+    if profile not in DECODING_PROFILES:
+        profile = choose_profile(duration)
+
+    with _in_flight_lock:
+        _in_flight += 1
+    try:
+        if cancel is not None and cancel.is_set():
+            raise TranscriptionCancelled()
+        with metrics.STT_TRANSCRIBE_SECONDS.time(profile=profile, model=model_name):
+            if stt_batcher.batchable(samples, profile):
+                # short clips: decoded together with concurrent uploads to the same model
+                text = stt_batcher.batcher.transcribe(model, samples, (model_name, profile),
+                                                      DECODING_PROFILES[profile], cancel)
+                if text is None:
+                    raise TranscriptionCancelled()
+                info = None
+            else:
+                segments, info = model.transcribe(samples, language="en", task="transcribe", **DECODING_PROFILES[profile])
+                # segments is a generator: decoding happens while it is consumed
+                parts = []
+                for segment in segments:
+                    parts.append(segment.text)
+                    if cancel is not None and cancel.is_set():
+                        raise TranscriptionCancelled()
+                text = " ".join(parts).strip()
+    finally:
+        with _in_flight_lock:
+            _in_flight -= 1
+    return text, info, profile
+
+
+def transcribe_pcm(samples, final: bool = True) -> str:
+    """transcribe() for streaming: "partial" profile for interim passes, automatic for finals"""
+    if NORMALIZE:
+        from server import audio_dsp
+        samples = audio_dsp.normalize(samples)
+    return transcribe(samples, None if final else "partial")[0]
+
+
+def status() -> dict:
+    return {
+        "available": FASTER_WHISPER_AVAILABLE,
+        "loaded": whisper_model is not None,
+        "model": WHISPER_MODEL,
+        "pool": {name: name in whisper_models for name in WHISPER_MODELS},
+        "device": WHISPER_DEVICE or "auto",
+        "workers": STT_WORKERS,
+        "queued": executor._work_queue.qsize(),
+        "transcript_cache": stt_cache.stt_cache.stats()
+    }
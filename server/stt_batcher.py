@@ -0,0 +1,132 @@
+# server/stt_batcher.py - Batched Whisper decoding for concurrent short STT clips
+#
+# Clips that arrive while the model is busy are grouped (see server/batching.py)
+# and decoded in one call to faster-whisper's BatchedInferencePipeline: the
+# clips are concatenated and clip_timestamps marks each one (or, for profiles
+# with vad_filter, each of its speech regions) as its own window, so the
+# encoder/decoder run them as a single batch. Segments are mapped back to
+# their clip by start time.
+import os
+import bisect
+import threading
+from typing import List, Optional
+
+from server import metrics
+from server.batching import MicroBatcher
+from server.log import get_logger
+
+STT_BATCHING = os.getenv("ORION_STT_BATCHING", "true").lower() == "true"
+STT_BATCH_WINDOW_MS = float(os.getenv("ORION_STT_BATCH_WINDOW_MS", "20"))
+STT_BATCH_MAX = int(os.getenv("ORION_STT_BATCH_MAX", "8"))
+MAX_CLIP_SECONDS = 30.0  # one Whisper window; longer clips take the regular path
+SAMPLE_RATE = 16000
+
+log = get_logger("stt")
+
+_pipelines = {}          # id(model) -> BatchedInferencePipeline (holds the model, so ids stay unique)
+_pipeline_failed = False
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline(model):
+    """BatchedInferencePipeline around this pool model (faster-whisper >= 1.1), else None"""
+    global _pipeline_failed
+    pipeline = _pipelines.get(id(model))
+    if pipeline is not None or _pipeline_failed:
+        return pipeline
+    with _pipeline_lock:
+        if id(model) not in _pipelines and not _pipeline_failed:
+            try:
+                from faster_whisper import BatchedInferencePipeline
+                _pipelines[id(model)] = BatchedInferencePipeline(model=model)
+            except ImportError:
+                log.info("BatchedInferencePipeline not available, batches decode sequentially")
+                _pipeline_failed = True
+    return _pipelines.get(id(model))
+
+
+def _sequential(model, clips: List, options: dict) -> List[str]:
+    texts = []
+    for clip in clips:
+        segments, _ = model.transcribe(clip, language="en", task="transcribe", **options)
+        texts.append(" ".join(segment.text for segment in segments).strip())
+    return texts
+
+
+def run_batch(model, clips: List, options: dict) -> List[str]:
+    """Transcribe several <=30s clips with the profile's `options`: one batched decode when possible"""
+    pipeline = get_pipeline(model) if len(clips) > 1 else None
+    if pipeline is None:
+        return _sequential(model, clips, options)
+
+    import numpy as np
+    # clip_timestamps are sample offsets into the concatenated audio; with vad_filter
+    # each clip contributes its speech regions, otherwise the whole clip
+    vad_filter = options.get("vad_filter", False)
+    if vad_filter:
+        from server import vad
+    starts, clip_timestamps, offset = [], [], 0
+    for clip in clips:
+        starts.append(offset / SAMPLE_RATE)
+        regions = vad.speech_regions(clip, SAMPLE_RATE) if vad_filter else [(0, len(clip))]
+        clip_timestamps.extend({"start": offset + start, "end": offset + end} for start, end in regions)
+        offset += len(clip)
+    if not clip_timestamps:
+        return [""] * len(clips)
+
+    try:
+        segments, _ = pipeline.transcribe(
+            np.concatenate(clips),
+            language="en",
+            task="transcribe",
+            beam_size=options.get("beam_size", 1),
+            without_timestamps=options.get("without_timestamps", False),
+            vad_filter=False,  # speech regions are already in clip_timestamps
+            clip_timestamps=clip_timestamps,
+            batch_size=len(clip_timestamps),
+        )
+        texts: List[List[str]] = [[] for _ in clips]
+        for segment in segments:
+            # segment times are seconds into the concatenated audio
+            index = max(0, bisect.bisect_right(starts, segment.start + 1e-3) - 1)
+            texts[index].append(segment.text)
+    except (TypeError, ValueError) as e:
+        # older faster-whisper without clip_timestamps support in the batched pipeline
+        log.warning("batched decode failed, decoding sequentially", error=str(e))
+        return _sequential(model, clips, options)
+    return [" ".join(t).strip() for t in texts]
+
+
+class STTBatcher:
+    def __init__(self, window_ms: float = STT_BATCH_WINDOW_MS, max_batch: int = STT_BATCH_MAX):
+        self._batcher = MicroBatcher(self._run, window_ms, max_batch, metrics.STT_BATCH_SIZE)
+
+    @staticmethod
+    def _run(items: List, context: tuple) -> List[Optional[str]]:
+        model, options = context
+        # clips whose client went away while queued are dropped, not decoded
+        live = [i for i, (_, cancel) in enumerate(items) if cancel is None or not cancel.is_set()]
+        results: List[Optional[str]] = [None] * len(items)
+        if live:
+            texts = run_batch(model, [items[i][0] for i in live], options)
+            for i, text in zip(live, texts):
+                results[i] = text
+        return results
+
+    def transcribe(self, model, samples, key, options: dict,
+                   cancel: Optional[threading.Event] = None) -> Optional[str]:
+        """
+        Blocking transcript for one clip, decoded together with concurrent
+        clips sharing `key` (model, profile); None when `cancel` was set
+        before its batch ran.
+        """
+        if cancel is not None and cancel.is_set():
+            return None
+        return self._batcher.submit(key, (samples, cancel), (model, options))
+
+
+def batchable(samples, profile: Optional[str]) -> bool:
+    return STT_BATCHING and profile != "partial" and len(samples) <= MAX_CLIP_SECONDS * SAMPLE_RATE
+
+
+batcher = STTBatcher()
@@ -0,0 +1,79 @@
+# server/stt_cache.py - Short-lived cache of transcripts keyed by upload content
+#
+# The dashboard retries a failed voice turn by resending the same recording;
+# a hash of the upload bytes lets the retry skip decoding and Whisper.
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Optional
+
+from server import metrics
+
+STT_CACHE_ENABLED = os.getenv("ORION_STT_CACHE", "true").lower() == "true"
+STT_CACHE_ENTRIES = int(os.getenv("ORION_STT_CACHE_ENTRIES", "256"))
+STT_CACHE_TTL_SECONDS = float(os.getenv("ORION_STT_CACHE_TTL_SECONDS", "300"))
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def upload_key(source: BinaryIO, *options: Optional[str]) -> str:
+    """sha256 of a seekable upload (read in chunks, left at offset 0) plus request options"""
+    digest = hashlib.sha256()
+    source.seek(0)
+    for chunk in iter(lambda: source.read(HASH_CHUNK_BYTES), b""):
+        digest.update(chunk)
+    source.seek(0)
+    for option in options:
+        digest.update(b"\x1f" + (option or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class STTCache:
+    """LRU of transcripts capped by entry count; entries expire `ttl` seconds after insertion"""
+
+    def __init__(self, max_entries: int = STT_CACHE_ENTRIES, ttl: float = STT_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, transcript)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[str]:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                metrics.STT_CACHE_LOOKUPS.inc(result="miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        metrics.STT_CACHE_LOOKUPS.inc(result="hit")
+        return entry[1]
+
+    def put(self, key: str, transcript: str, now: Optional[float] = None):
+        if self.max_entries <= 0:
+            return
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl, transcript)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+stt_cache = STTCache()
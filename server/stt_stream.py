@@ -0,0 +1,148 @@
+# server/stt_stream.py - VAD segmentation for streaming speech-to-text (/ws/stt)
+#
+# Audio arrives in small frames while the user is still talking. An energy
+# VAD cuts it into utterances; while an utterance is open the caller gets
+# periodic "partial" snapshots to decode, and once END_SILENCE_MS of silence
+# follows speech it gets the "final" utterance.
+import os
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from server import audio_dsp
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+END_SILENCE_MS = int(os.getenv("ORION_STT_STREAM_END_SILENCE_MS", "300"))
+PARTIAL_INTERVAL_MS = int(os.getenv("ORION_STT_STREAM_PARTIAL_MS", "600"))
+MAX_UTTERANCE_MS = int(os.getenv("ORION_STT_STREAM_MAX_UTTERANCE_MS", "30000"))
+PREROLL_MS = 300       # audio kept from before speech onset so first syllables aren't clipped
+MIN_SPEECH_MS = 90     # shorter blips (clicks, taps) are dropped instead of finalized
+
+
+class EnergyVAD:
+    """RMS-energy voice detector with an adaptive noise floor"""
+
+    def __init__(self, threshold_db: float = 9.0, min_rms: float = 0.006):
+        self.threshold = 10 ** (threshold_db / 20)  # speech must be this far above the floor
+        self.min_rms = min_rms
+        self.noise_floor = min_rms
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        rms = float(np.sqrt(np.mean(np.square(frame, dtype=np.float32)))) if frame.size else 0.0
+        speech = rms > max(self.min_rms, self.noise_floor * self.threshold)
+        if not speech:
+            # track the floor slowly so background noise doesn't count as speech
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * max(rms, self.min_rms / 2)
+        return speech
+
+
+class UtteranceSegmenter:
+    """Feed 16 kHz mono float32 audio; get ("partial" | "final", utterance audio) events back"""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, vad: Optional[EnergyVAD] = None,
+                 end_silence_ms: int = END_SILENCE_MS, partial_interval_ms: int = PARTIAL_INTERVAL_MS,
+                 max_utterance_ms: int = MAX_UTTERANCE_MS):
+        self.sample_rate = sample_rate
+        self.frame_len = sample_rate * FRAME_MS // 1000
+        self.vad = vad or EnergyVAD()
+        self.end_silence_ms = end_silence_ms
+        self.partial_interval_ms = partial_interval_ms
+        self.max_utterance_ms = max_utterance_ms
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._preroll: deque = deque(maxlen=max(1, PREROLL_MS // FRAME_MS))
+        self._frames: List[np.ndarray] = []
+        self._in_speech = False
+        self._speech_ms = 0
+        self._silence_ms = 0
+        self._since_partial_ms = 0
+
+    @property
+    def in_speech(self) -> bool:
+        return self._in_speech
+
+    @property
+    def speech_ms(self) -> int:
+        """Speech heard so far in the open utterance"""
+        return self._speech_ms if self._in_speech else 0
+
+    def feed(self, samples: np.ndarray) -> List[Tuple[str, np.ndarray]]:
+        events = []
+        audio = np.concatenate([self._remainder, samples.astype(np.float32, copy=False)])
+        usable = len(audio) - len(audio) % self.frame_len
+        for start in range(0, usable, self.frame_len):
+            event = self._frame(audio[start:start + self.frame_len])
+            if event is not None:
+                events.append(event)
+        self._remainder = audio[usable:]
+        return events
+
+    def flush(self) -> Optional[Tuple[str, np.ndarray]]:
+        """End of stream: finalize whatever utterance is open"""
+        if self._in_speech and self._remainder.size:
+            self._frames.append(self._remainder)
+        self._remainder = np.zeros(0, dtype=np.float32)
+        return self._finish() if self._in_speech else None
+
+    def _frame(self, frame: np.ndarray) -> Optional[Tuple[str, np.ndarray]]:
+        speech = self.vad.is_speech(frame)
+        if not self._in_speech:
+            if not speech:
+                self._preroll.append(frame)
+                return None
+            self._in_speech = True
+            self._frames = list(self._preroll)
+            self._preroll.clear()
+            self._speech_ms = self._silence_ms = self._since_partial_ms = 0
+
+        self._frames.append(frame)
+        self._since_partial_ms += FRAME_MS
+        if speech:
+            self._speech_ms += FRAME_MS
+            self._silence_ms = 0
+        else:
+            self._silence_ms += FRAME_MS
+
+        if self._silence_ms >= self.end_silence_ms:
+            return self._finish()
+        if len(self._frames) * FRAME_MS >= self.max_utterance_ms:
+            return self._finish()
+        if self._since_partial_ms >= self.partial_interval_ms and self._speech_ms >= MIN_SPEECH_MS:
+            self._since_partial_ms = 0
+            return "partial", np.concatenate(self._frames)
+        return None
+
+    def _finish(self) -> Optional[Tuple[str, np.ndarray]]:
+        frames, speech_ms = self._frames, self._speech_ms
+        self._frames = []
+        self._in_speech = False
+        self._speech_ms = self._silence_ms = self._since_partial_ms = 0
+        if speech_ms < MIN_SPEECH_MS or not frames:
+            return None
+        return "final", np.concatenate(frames)
+
+
+def pcm_from_bytes(data, encoding: str = "pcm16", channels: int = 1) -> np.ndarray:
+    """
+    Client audio -> mono float32 samples ("pcm16" little-endian int16, or
+    "f32"). The bytes are viewed in place with frombuffer; the only copy is
+    the float conversion (into a scratch buffer when a downmix follows).
+    """
+    view = memoryview(data)
+    dtype, width = ("<f4", 4) if encoding == "f32" else ("<i2", 2)
+    pcm = np.frombuffer(view[:len(view) - len(view) % (width * channels)], dtype=dtype)
+    if channels > 1:
+        # interleaved floats only live until the downmix: convert into a reused buffer
+        samples = audio_dsp.scratch(pcm.size)
+        samples[:] = pcm
+    else:
+        samples = pcm.astype(np.float32)
+    if encoding != "f32":
+        samples *= 1 / 32768.0
+    return audio_dsp.downmix(samples, channels)
+
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Client capture rate (e.g. 48 kHz) -> 16 kHz; see audio_dsp.Resampler for streams"""
+    return audio_dsp.resample(samples, src_rate, dst_rate)
@@ -0,0 +1,152 @@
+# server/tracing.py - Lightweight per-request tracing (Server-Timing header + optional JSONL log)
+import os
+import json
+import time
+import uuid
+import queue
+import itertools
+import threading
+import contextvars
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TRACING_ENABLED = os.getenv("ORION_TRACING", "true").lower() == "true"
+TRACE_LOG_ENABLED = os.getenv("ORION_TRACE_LOG", "false").lower() == "true"
+TRACE_LOG_PATH = Path(os.getenv("ORION_TRACE_LOG_PATH", "data/logs/traces.jsonl"))
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("orion_trace", default=None)
+_current_span: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("orion_span", default=None)
+
+# Returned by span() when no trace is active, so disabled tracing costs one ContextVar lookup
+_NOOP = nullcontext()
+_span_ids = itertools.count(1)
+
+
+class Trace:
+    """Spans recorded for one request"""
+
+    def __init__(self, trace_id: Optional[str] = None, name: str = ""):
+        self.trace_id = trace_id or uuid.uuid4().hex[:16]
+        self.name = name
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.spans: List[Dict] = []  # list.append is atomic, spans may close on worker threads
+
+    def finish(self):
+        self.duration_ms = round((time.perf_counter() - self._t0) * 1000, 2)
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. 'stt.transcribe;dur=812.4, total;dur=830.1'"""
+        parts = [f"{s['name']};dur={s['ms']}" for s in self.spans]
+        if self.duration_ms is not None:
+            parts.append(f"total;dur={self.duration_ms}")
+        return ", ".join(parts)
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "spans": self.spans,
+        }
+
+
+class _Span:
+    __slots__ = ("trace", "name", "span_id", "_t0", "_token")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.span_id = next(_span_ids)
+        self._token = _current_span.set(self.span_id)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        _current_span.reset(self._token)
+        self.trace.spans.append({
+            "name": self.name,
+            "id": self.span_id,
+            "parent": _current_span.get(),
+            "start_ms": round((self._t0 - self.trace._t0) * 1000, 2),
+            "ms": round((end - self._t0) * 1000, 2),
+            "error": exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+
+def span(name: str):
+    """Time a block as a child of the current span; no-op outside a traced request"""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, name)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def run_in_executor(loop, executor, fn, *args):
+    """loop.run_in_executor that keeps the current trace (it does not copy contextvars itself)"""
+    if _current_trace.get() is None:
+        return loop.run_in_executor(executor, fn, *args)
+    ctx = contextvars.copy_context()
+    return loop.run_in_executor(executor, ctx.run, fn, *args)
+
+
+# === JSONL span log (written off the event loop) ===
+_log_queue: "queue.SimpleQueue[Dict]" = queue.SimpleQueue()
+_writer_started = False
+_writer_lock = threading.Lock()
+
+
+def _writer():
+    while True:
+        record = _log_queue.get()
+        try:
+            TRACE_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with TRACE_LOG_PATH.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+                # drain whatever queued up while we were writing
+                while not _log_queue.empty():
+                    f.write(json.dumps(_log_queue.get_nowait()) + "\n")
+        except Exception as e:
+            from server.log import get_logger  # server.log imports this module
+            get_logger("tracing").warning("could not write trace log", path=str(TRACE_LOG_PATH), error=str(e))
+
+
+def _log(trace: Trace):
+    global _writer_started
+    if not _writer_started:
+        with _writer_lock:
+            if not _writer_started:
+                threading.Thread(target=_writer, daemon=True, name="orion-trace-log").start()
+                _writer_started = True
+    _log_queue.put(trace.to_dict())
+
+
+async def http_middleware(request, call_next):
+    """Open a trace per request and report its spans in Server-Timing"""
+    if not TRACING_ENABLED:
+        return await call_next(request)
+
+    trace = Trace((request.headers.get("x-trace-id") or "")[:64] or None, f"{request.method} {request.url.path}")
+    token = _current_trace.set(trace)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_trace.reset(token)
+        trace.finish()
+        if TRACE_LOG_ENABLED:
+            _log(trace)
+
+    response.headers["X-Trace-Id"] = trace.trace_id
+    response.headers["Server-Timing"] = trace.server_timing()
+    return response
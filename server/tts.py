@@ -0,0 +1,344 @@
+# server/tts.py - Coqui TTS model cache and synthesis
+import os
+import time
+import base64
+import tempfile
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from importlib.util import find_spec
+from typing import Optional
+
+from server import audio_codec, metrics, tracing, tts_workers
+from server.tts_cache import TTS_CACHE_ENABLED, cache_key, tts_cache
+from server.log import get_logger
+
+# Coqui pulls in torch and takes seconds to import, so TTS.api is imported on
+# the first model load; find_spec only checks the packages are installed.
+COQUI_AVAILABLE = find_spec("TTS") is not None
+AUDIO_LIBS_AVAILABLE = all(find_spec(m) is not None for m in ("torch", "soundfile", "numpy"))
+
+log = get_logger("tts")
+
+COQUI_TTS_MODEL = os.getenv("COQUI_TTS_MODEL", "tts_models/en/ljspeech/tacotron2-DDC")
+
+# Model cache bounds: a client cycling through voices must not be able to load
+# every Coqui model at once. Pinned voices are never evicted.
+TTS_MAX_MODELS = int(os.getenv("ORION_TTS_MAX_MODELS", "3"))
+TTS_MAX_MODEL_BYTES = int(os.getenv("ORION_TTS_MAX_MODEL_BYTES", str(3 * 1024 ** 3)))  # 0 = no byte cap
+TTS_MODEL_IDLE_SECONDS = float(os.getenv("ORION_TTS_MODEL_IDLE_SECONDS", "1800"))    # 0 = never unload
+PINNED_VOICES = {COQUI_TTS_MODEL} | {
+    v.strip() for v in os.getenv("ORION_TTS_PINNED_VOICES", "").split(",") if v.strip()
+}
+
+tts_model = None
+tts_model_cache = OrderedDict()  # model name -> TTS instance, least recently used first
+_model_bytes = {}                # model name -> measured footprint
+_last_used = {}                  # model name -> time.monotonic() of last use
+_cache_lock = threading.Lock()
+_load_locks = {}                 # model name -> lock held while that model loads
+_reaper_started = False
+
+# Thread pool for TTS generation (optimized worker count); with worker
+# processes these threads only wait on results, so keep two per process
+executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(2, 2 * tts_workers.TTS_WORKERS))
+
+metrics.EXECUTOR_QUEUE_DEPTH.set_function(lambda: executor._work_queue.qsize(), executor="tts")
+metrics.MODELS_LOADED.set_function(lambda: len(tts_model_cache), kind="tts")
+metrics.TTS_MODEL_BYTES.set_function(lambda: sum(_model_bytes.values()))
+
+
+def _load_model(model_name: str):
+    from TTS.api import TTS
+    return TTS(model_name=model_name, progress_bar=False)
+
+
+def measure_model_bytes(model) -> int:
+    """Parameter + buffer bytes of the torch modules behind a Coqui TTS instance"""
+    synthesizer = getattr(model, "synthesizer", None)
+    total = 0
+    seen = set()
+    for attr in ("tts_model", "vocoder_model", "vc_model"):
+        module = getattr(synthesizer, attr, None)
+        if module is None or not hasattr(module, "parameters"):
+            continue
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            if id(tensor) not in seen:
+                seen.add(id(tensor))
+                total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def get_tts_model(model_name: str = None):
+    """Lazy load TTS model with caching - reduces latency for different voices"""
+    model_name = model_name or COQUI_TTS_MODEL
+
+    # Return cached model if available (instant)
+    with _cache_lock:
+        model = tts_model_cache.get(model_name)
+        if model is not None:
+            tts_model_cache.move_to_end(model_name)
+            _last_used[model_name] = time.monotonic()
+            return model
+        if not COQUI_AVAILABLE:
+            return None
+        # one lock per voice: concurrent requests for it wait for a single load
+        load_lock = _load_locks.setdefault(model_name, threading.Lock())
+
+    with load_lock:
+        try:
+            return _load_and_cache(model_name)
+        finally:
+            with _cache_lock:
+                if _load_locks.get(model_name) is load_lock:
+                    del _load_locks[model_name]
+
+
+def _rss_bytes() -> float:
+    """Process RSS, or 0 where it can't be read (no psutil and no /proc)"""
+    try:
+        return metrics.PROCESS_RSS_BYTES.get()
+    except Exception:
+        return 0
+
+
+def _load_and_cache(model_name: str):
+    global tts_model
+    with _cache_lock:
+        if model_name in tts_model_cache:
+            _last_used[model_name] = time.monotonic()
+            return tts_model_cache[model_name]
+    log.info("loading model", model=model_name)
+    rss_before = _rss_bytes()
+    try:
+        model = _load_model(model_name)
+        size = measure_model_bytes(model)
+    except Exception as e:
+        log.warning("model load failed", model=model_name, error=str(e))
+        return None
+    if not size and rss_before:
+        # no torch modules to measure: estimate from how much the process grew
+        size = max(0, int(_rss_bytes() - rss_before))
+
+    with _cache_lock:
+        tts_model_cache[model_name] = model
+        _model_bytes[model_name] = size
+        _last_used[model_name] = time.monotonic()
+        if model_name == COQUI_TTS_MODEL:
+            tts_model = model
+        evicted = _evict_locked(keep=model_name)
+    log.info("model loaded", model=model_name, mb=round(size / 1024 ** 2, 1))
+    _after_unload(evicted, "evicted")
+    _ensure_reaper()
+    return model
+
+
+def _evict_locked(keep: str) -> list:
+    """Drop least recently used unpinned models until both caps hold (caller holds _cache_lock)"""
+    evicted = []
+    for name in list(tts_model_cache):
+        over_count = len(tts_model_cache) > TTS_MAX_MODELS
+        over_bytes = TTS_MAX_MODEL_BYTES > 0 and sum(_model_bytes.values()) > TTS_MAX_MODEL_BYTES
+        if not (over_count or over_bytes):
+            break
+        if name == keep or name in PINNED_VOICES:
+            continue
+        _drop_locked(name)
+        evicted.append(name)
+    return evicted
+
+
+def _drop_locked(name: str):
+    global tts_model
+    model = tts_model_cache.pop(name, None)
+    _model_bytes.pop(name, None)
+    _last_used.pop(name, None)
+    if model is not None and model is tts_model:
+        tts_model = None
+
+
+def _after_unload(names: list, reason: str):
+    if not names:
+        return
+    for name in names:
+        log.info("model unloaded", model=name, reason=reason)
+    # Requests still synthesizing keep their reference; memory returns once they finish
+    import gc
+    gc.collect()
+    if find_spec("torch") is not None:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+
+def unload_idle(now: Optional[float] = None) -> list:
+    """Unload unpinned models unused for ORION_TTS_MODEL_IDLE_SECONDS; returns their names"""
+    if TTS_MODEL_IDLE_SECONDS <= 0:
+        return []
+    now = time.monotonic() if now is None else now
+    with _cache_lock:
+        idle = [
+            name for name in tts_model_cache
+            if name not in PINNED_VOICES and now - _last_used.get(name, now) > TTS_MODEL_IDLE_SECONDS
+        ]
+        for name in idle:
+            _drop_locked(name)
+    _after_unload(idle, "idle")
+    return idle
+
+
+def _idle_reaper():
+    interval = max(5.0, min(60.0, TTS_MODEL_IDLE_SECONDS / 4))
+    while True:
+        time.sleep(interval)
+        try:
+            unload_idle()
+        except Exception as e:
+            log.warning("idle unload failed", error=str(e))
+
+
+def _ensure_reaper():
+    """Start the idle-unload thread after the first model load"""
+    global _reaper_started
+    if _reaper_started or TTS_MODEL_IDLE_SECONDS <= 0:
+        return
+    with _cache_lock:
+        if _reaper_started:
+            return
+        _reaper_started = True
+    threading.Thread(target=_idle_reaper, daemon=True, name="orion-tts-reaper").start()
+
+
+def split_voice(voice_model: Optional[str], speaker_id: Optional[str]) -> tuple:
+    """Handle VCTK format: "model|speaker" """
+    if voice_model and "|" in voice_model:
+        model_parts = voice_model.split("|")
+        voice_model = model_parts[0]
+        speaker_id = model_parts[1] if len(model_parts) > 1 else speaker_id
+    return voice_model, speaker_id
+
+
+MEDIA_TYPES = {name: media for name, (_, _, media) in audio_codec.FORMATS.items()}
+
+
+def output_sample_rate(tts_instance) -> int:
+    """Sample rate of the waveform returned by TTS.tts()"""
+    synthesizer = getattr(tts_instance, "synthesizer", None)
+    return int(getattr(synthesizer, "output_sample_rate", 0) or 22050)
+
+
+def synthesize_pcm(tts_instance, text: str, speaker: Optional[str] = None, speed: Optional[float] = None) -> tuple:
+    """Run the model and return (float waveform, sample_rate) without touching disk"""
+    kwargs = {"text": text}
+    if speaker:
+        kwargs["speaker"] = speaker
+    if speed and speed != 1.0:
+        kwargs["speed"] = speed
+    wav = tts_instance.tts(**kwargs)
+    return wav, output_sample_rate(tts_instance)
+
+
+def synthesize_file(tts_instance, text: str, speaker: Optional[str] = None) -> bytes:
+    """Previous temp-file path (tts_to_file + read back); kept for tests/test_tts_benchmark.py"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_wav:
+        wav_path = tmp_wav.name
+    try:
+        if speaker:
+            tts_instance.tts_to_file(text=text, speaker=speaker, file_path=wav_path)
+        else:
+            tts_instance.tts_to_file(text=text, file_path=wav_path)
+        with open(wav_path, "rb") as f:
+            return f.read()
+    finally:
+        try:
+            os.remove(wav_path)
+        except OSError:
+            pass
+
+
+def _encode(samples, sample_rate: int, audio_format: str, bitrate: Optional[int]) -> tuple:
+    with tracing.span("tts.encode"), metrics.TTS_ENCODE_SECONDS.time(format=audio_format):
+        try:
+            return audio_codec.encode_pcm(samples, sample_rate, audio_format, bitrate, peak_normalize=True)
+        except Exception as e:
+            log.warning("encode failed, returning wav", format=audio_format, error=str(e))
+            return audio_codec.pcm_to_wav(samples, sample_rate, peak_normalize=True), "wav"
+
+
+def synthesize_sync(text: str, voice_model: Optional[str] = None, speaker_id: Optional[str] = None,
+                    audio_format: str = "wav", bitrate: Optional[int] = None, speed: Optional[float] = None) -> tuple:
+    """
+    Synthesize speech and return (audio_bytes, format), or (None, None) on failure.
+
+    Repeated phrases are served from the TTS audio cache. Otherwise the
+    waveform (synthesized here, or by a worker process when ORION_TTS_WORKERS
+    is set) stays in memory and is encoded straight into the output format;
+    the returned format is "wav" if encoding was not possible.
+    """
+    if not AUDIO_LIBS_AVAILABLE or not text.strip():
+        return None, None
+
+    try:
+        model_to_use = voice_model or COQUI_TTS_MODEL
+        speaker = speaker_id or os.getenv("COQUI_TTS_SPEAKER", "")
+
+        key, requested_format = None, audio_format
+        if TTS_CACHE_ENABLED:
+            key = cache_key(model_to_use, speaker, speed, text, audio_format,
+                            audio_codec.effective_bitrate(audio_format, bitrate))
+            with tracing.span("tts.cache"):
+                cached = tts_cache.get(key)
+            if cached is not None:
+                metrics.TTS_REQUESTS.inc(status="cached")
+                return cached
+
+        pool = tts_workers.get_pool()
+        if pool is not None:
+            # worker process synthesizes; PCM comes back in shared memory
+            with tracing.span("tts.synthesize"), metrics.TTS_SYNTHESIZE_SECONDS.time(model=model_to_use):
+                pcm = pool.synthesize(text, model_to_use, speaker, speed)
+            with pcm:
+                audio_bytes, audio_format = _encode(pcm.samples, pcm.sample_rate, audio_format, bitrate)
+        else:
+            tts_instance = get_tts_model(model_to_use)
+
+            if not tts_instance:
+                return None, None
+
+            with tracing.span("tts.synthesize"), metrics.TTS_SYNTHESIZE_SECONDS.time(model=model_to_use):
+                samples, sample_rate = synthesize_pcm(tts_instance, text, speaker, speed)
+            audio_bytes, audio_format = _encode(samples, sample_rate, audio_format, bitrate)
+
+        if key is not None and audio_format == requested_format:
+            tts_cache.put(key, audio_bytes, audio_format)
+        metrics.TTS_REQUESTS.inc(status="success")
+        return audio_bytes, audio_format
+
+    except Exception:
+        log.exception("synthesis failed", model=voice_model or COQUI_TTS_MODEL)
+        metrics.TTS_REQUESTS.inc(status="error")
+        return None, None
+
+
+def generate_tts_sync(text: str, voice_model: Optional[str] = None, speaker_id: Optional[str] = None,
+                      audio_format: str = "wav", bitrate: Optional[int] = None, speed: Optional[float] = None) -> tuple:
+    """synthesize_sync for JSON responses: (base64 audio, format)"""
+    audio_bytes, audio_format = synthesize_sync(text, voice_model, speaker_id, audio_format, bitrate, speed)
+    if audio_bytes is None:
+        return None, None
+    return base64.b64encode(audio_bytes).decode('utf-8'), audio_format
+
+
+def status() -> dict:
+    return {
+        "available": COQUI_AVAILABLE,
+        "loaded": tts_model is not None,
+        "cached_models": len(tts_model_cache),
+        "models": {
+            name: {"mb": round(_model_bytes.get(name, 0) / 1024 ** 2, 1), "pinned": name in PINNED_VOICES}
+            for name in list(tts_model_cache)
+        },
+        "audio_cache": tts_cache.stats() if TTS_CACHE_ENABLED else None,
+        "workers": tts_workers._pool.stats() if tts_workers._pool is not None else None,
+        "model": COQUI_TTS_MODEL
+    }
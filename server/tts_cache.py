@@ -0,0 +1,199 @@
+# server/tts_cache.py - Content-addressed cache of synthesized audio (memory LRU + disk tier)
+import os
+import re
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from server import metrics
+from server.log import get_logger
+
+TTS_CACHE_ENABLED = os.getenv("ORION_TTS_CACHE", "true").lower() == "true"
+TTS_CACHE_MEMORY_BYTES = int(os.getenv("ORION_TTS_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+TTS_CACHE_DIR = Path(os.getenv("ORION_TTS_CACHE_DIR", "data/tts_cache"))
+TTS_CACHE_DISK_BYTES = int(os.getenv("ORION_TTS_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+
+log = get_logger("tts")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and unicode forms so trivially different strings share an entry"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(model: str, speaker: Optional[str], speed: Optional[float], text: str,
+              audio_format: str, bitrate: Optional[int]) -> str:
+    """sha256 over everything that changes the output bytes"""
+    parts = (model, speaker or "", f"{speed or 1.0:g}", audio_format, str(bitrate or 0), normalize_text(text))
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    Two tiers of synthesized audio keyed by cache_key():
+    an in-memory LRU capped by bytes, backed by files under `directory`
+    (least recently used evicted once the directory exceeds `disk_max_bytes`).
+    """
+
+    def __init__(self, memory_max_bytes: int = TTS_CACHE_MEMORY_BYTES,
+                 directory: Path = TTS_CACHE_DIR, disk_max_bytes: int = TTS_CACHE_DISK_BYTES):
+        self.memory_max_bytes = memory_max_bytes
+        self.directory = Path(directory)
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None  # scanned on first disk access
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    # === Lookup ===
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """(audio, format) or None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                metrics.TTS_CACHE_LOOKUPS.inc(result="memory_hit")
+                return entry
+
+        entry = self._disk_get(key)
+        if entry is not None:
+            self._memory_put(key, entry)
+            with self._lock:
+                self.hits["disk"] += 1
+            metrics.TTS_CACHE_LOOKUPS.inc(result="disk_hit")
+            return entry
+
+        with self._lock:
+            self.misses += 1
+        metrics.TTS_CACHE_LOOKUPS.inc(result="miss")
+        return None
+
+    def put(self, key: str, audio: bytes, audio_format: str):
+        self._memory_put(key, (audio, audio_format))
+        try:
+            self._disk_put(key, audio, audio_format)
+        except OSError as e:
+            log.warning("tts cache write failed", error=str(e))
+
+    def hit_ratio(self) -> float:
+        with self._lock:
+            hits = self.hits["memory"] + self.hits["disk"]
+            total = hits + self.misses
+        return hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes or 0,
+                "hits": dict(self.hits),
+                "misses": self.misses,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        with self._disk_lock:
+            for path in self._disk_files():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._disk_bytes = 0
+
+    # === Memory tier ===
+    def _memory_put(self, key: str, entry: Tuple[bytes, str]):
+        size = len(entry[0])
+        if size > self.memory_max_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old[0])
+            self._memory[key] = entry
+            self._memory_bytes += size
+            while self._memory_bytes > self.memory_max_bytes:
+                _, (audio, _) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(audio)
+
+    # === Disk tier ===
+    def _path(self, key: str, audio_format: str) -> Path:
+        return self.directory / key[:2] / f"{key}.{audio_format}"
+
+    def _disk_files(self):
+        if not self.directory.exists():
+            return []
+        return [p for p in self.directory.glob("*/*") if p.is_file() and not p.name.endswith(".tmp")]
+
+    def _disk_get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        if self.disk_max_bytes <= 0:
+            return None
+        bucket = self.directory / key[:2]
+        for path in bucket.glob(f"{key}.*") if bucket.exists() else ():
+            if path.name.endswith(".tmp"):
+                continue
+            try:
+                audio = path.read_bytes()
+                os.utime(path)  # mtime doubles as last-used time for eviction
+            except OSError:
+                continue
+            return audio, path.suffix[1:]
+        return None
+
+    def _disk_put(self, key: str, audio: bytes, audio_format: str):
+        if self.disk_max_bytes <= 0 or len(audio) > self.disk_max_bytes:
+            return
+        path = self._path(key, audio_format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(audio)
+        with self._disk_lock:
+            existed = path.exists()
+            old_size = path.stat().st_size if existed else 0
+            os.replace(tmp, path)  # atomic: readers never see a partial file
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(p.stat().st_size for p in self._disk_files())
+            else:
+                self._disk_bytes += len(audio) - old_size
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        """Drop least recently used files until the directory is 10% under its cap"""
+        files = []
+        for p in self._disk_files():
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        target = self.disk_max_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+
+tts_cache = TTSCache()
+
+metrics.TTS_CACHE_HIT_RATIO.set_function(tts_cache.hit_ratio)
+metrics.TTS_CACHE_BYTES.set_function(lambda: tts_cache.stats()["memory_bytes"], tier="memory")
+metrics.TTS_CACHE_BYTES.set_function(lambda: tts_cache.stats()["disk_bytes"], tier="disk")
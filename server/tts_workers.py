@@ -0,0 +1,293 @@
+# server/tts_workers.py - TTS synthesis in worker processes (one model copy per process)
+#
+# Each worker is pinned to its own share of cores with explicit torch thread
+# counts, so synthesis runs outside the API process's GIL. Jobs go through a
+# shared queue (idle workers pick them up); finished waveforms come back as
+# int16 PCM in a SharedMemory block that the API process reads without copying.
+import os
+import sys
+import time
+import types
+import queue
+import atexit
+import itertools
+import threading
+import concurrent.futures
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence
+
+from server import metrics
+from server.log import get_logger
+
+TTS_WORKERS = int(os.getenv("ORION_TTS_WORKERS", "0"))                 # 0 = synthesize in-process on threads
+TTS_WORKER_CORES = int(os.getenv("ORION_TTS_WORKER_CORES", "0"))       # cores per worker, 0 = split evenly
+TTS_WORKER_TIMEOUT = float(os.getenv("ORION_TTS_WORKER_TIMEOUT", "120"))
+
+log = get_logger("tts")
+
+
+def available_cores() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_cores(workers: int, cores_per_worker: int = 0, cores: Optional[Sequence[int]] = None) -> List[List[int]]:
+    """
+    Split the cores this process may use between workers, e.g. 8 cores and
+    2 workers -> [[0, 1, 2, 3], [4, 5, 6, 7]]. With more workers than cores
+    the sets wrap around and are shared.
+    """
+    cores = list(cores if cores is not None else available_cores())
+    per_worker = cores_per_worker or max(1, len(cores) // max(1, workers))
+    return [
+        [cores[(i * per_worker + j) % len(cores)] for j in range(min(per_worker, len(cores)))]
+        for i in range(workers)
+    ]
+
+
+class PCMResult:
+    """int16 samples [channels, n] backed by shared memory; close() frees the block"""
+
+    def __init__(self, shm_name: str, shape: tuple, sample_rate: int):
+        import numpy as np
+        self._shm = shared_memory.SharedMemory(name=shm_name)
+        self.samples = np.ndarray(shape, dtype=np.int16, buffer=self._shm.buf)
+        self.sample_rate = sample_rate
+
+    def close(self):
+        if self._shm is None:
+            return
+        self.samples = None  # drop the view before releasing the buffer
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def _limit_threads(cores: Optional[List[int]]):
+    threads = str(len(cores)) if cores else "1"
+    # Must be set before torch/numpy start their thread pools
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = threads
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    try:
+        import torch
+        torch.set_num_threads(int(threads))
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+
+def _worker_main(index: int, cores: Optional[List[int]], preload: Optional[str], jobs, results):
+    """Worker process loop: load models once, then synthesize jobs until a None arrives"""
+    global TTS_WORKERS
+    TTS_WORKERS = 0  # a worker synthesizes in-process, never spawns its own pool
+    if cores is not None:
+        _limit_threads(cores)
+
+    import numpy as np
+    from server import audio_codec, tts
+
+    if preload:
+        tts.get_tts_model(preload)
+    results.put(("ready", index, None))
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        job_id, text, model_name, speaker, speed = job
+        try:
+            model = tts.get_tts_model(model_name)
+            if model is None:
+                raise RuntimeError(f"TTS model '{model_name}' failed to load")
+            wav, sample_rate = tts.synthesize_pcm(model, text, speaker, speed)
+            pcm = audio_codec.to_int16(wav, peak_normalize=True)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, pcm.nbytes))
+            try:
+                np.ndarray(pcm.shape, dtype=np.int16, buffer=shm.buf)[:] = pcm
+            finally:
+                shm.close()
+            results.put(("done", job_id, (shm.name, pcm.shape, sample_rate)))
+        except Exception as e:
+            results.put(("error", job_id, f"{type(e).__name__}: {e}"))
+
+
+_main_lock = threading.Lock()
+
+
+def _start_without_main(process):
+    """
+    Start a spawn()ed process without re-running the parent's __main__ in
+    it. spawn re-imports the entry script so pickled targets defined there
+    resolve; ours live in this module, and the entry script (server/main.py
+    builds the whole app at import) would otherwise run once per worker.
+    """
+    with _main_lock:
+        main = sys.modules["__main__"]
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            process.start()
+        finally:
+            sys.modules["__main__"] = main
+
+
+class TTSWorkerPool:
+    """Fixed set of spawn()ed synthesis processes fed from one job queue"""
+
+    def __init__(self, workers: int, cores_per_worker: int = 0, preload: Optional[str] = None):
+        self.workers = workers
+        self.core_plan = plan_cores(workers, cores_per_worker)
+        self.preload = preload
+        self._ctx = mp.get_context("spawn")  # fork is unsafe once torch has started threads
+        self._jobs = None
+        self._results = None
+        self._processes: List = []
+        self._pending: Dict[int, concurrent.futures.Future] = {}
+        self._pending_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._ready = 0
+        self._all_ready = threading.Event()
+        self._started = False
+        self._stopping = False
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._started:
+                return
+            self._jobs = self._ctx.Queue()
+            self._results = self._ctx.Queue()
+            self._processes = [self._spawn(i) for i in range(self.workers)]
+            threading.Thread(target=self._collect, daemon=True, name="orion-tts-results").start()
+            self._started = True
+            atexit.register(self.shutdown)
+            log.info("tts workers started", workers=self.workers, cores=self.core_plan)
+
+    def _spawn(self, index: int):
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(index, self.core_plan[index], self.preload, self._jobs, self._results),
+            daemon=True,
+            name=f"orion-tts-{index}",
+        )
+        _start_without_main(process)
+        return process
+
+    def _collect(self):
+        """Resolve futures from worker results; respawn workers that died"""
+        while not self._stopping:
+            try:
+                kind, key, payload = self._results.get(timeout=1.0)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            except (EOFError, OSError):
+                break
+            if kind == "ready":
+                self._ready += 1
+                if self._ready >= self.workers:
+                    self._all_ready.set()
+                continue
+            with self._pending_lock:
+                future = self._pending.pop(key, None)
+            if kind == "done":
+                result = PCMResult(*payload)
+                if future is None or not future.set_running_or_notify_cancel():
+                    result.close()  # caller gave up (timeout); free the block
+                else:
+                    future.set_result(result)
+            elif future is not None and future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError(payload))
+
+    def _check_workers(self):
+        for i, process in enumerate(self._processes):
+            if not process.is_alive() and not self._stopping:
+                # its in-flight job is lost; the caller times out after ORION_TTS_WORKER_TIMEOUT
+                log.warning("tts worker died, restarting", worker=i, exitcode=process.exitcode)
+                self._processes[i] = self._spawn(i)
+
+    def submit(self, text: str, model_name: str, speaker: Optional[str] = None,
+               speed: Optional[float] = None) -> concurrent.futures.Future:
+        self.start()
+        job_id = next(self._ids)
+        future = concurrent.futures.Future()
+        with self._pending_lock:
+            self._pending[job_id] = future
+        self._jobs.put((job_id, text, model_name, speaker, speed))
+        return future
+
+    def synthesize(self, text: str, model_name: str, speaker: Optional[str] = None,
+                   speed: Optional[float] = None, timeout: float = TTS_WORKER_TIMEOUT) -> PCMResult:
+        """Blocking submit(); the caller must close() the result"""
+        future = self.submit(text, model_name, speaker, speed)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until every worker has loaded its preload model"""
+        self.start()
+        return self._all_ready.wait(timeout)
+
+    def pending(self) -> int:
+        with self._pending_lock:
+            return len(self._pending)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "ready": self._ready,
+            "alive": sum(p.is_alive() for p in self._processes),
+            "pending": self.pending(),
+            "cores": self.core_plan,
+        }
+
+    def shutdown(self, timeout: float = 5.0):
+        if not self._started or self._stopping:
+            return
+        self._stopping = True
+        for _ in self._processes:
+            self._jobs.put(None)
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+
+
+_pool: Optional[TTSWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return TTS_WORKERS > 0
+
+
+def get_pool() -> Optional[TTSWorkerPool]:
+    """The shared pool (started on first use), or None when ORION_TTS_WORKERS=0"""
+    global _pool
+    if not enabled():
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from server.tts import COQUI_TTS_MODEL
+                _pool = TTSWorkerPool(TTS_WORKERS, TTS_WORKER_CORES, preload=COQUI_TTS_MODEL)
+                metrics.EXECUTOR_QUEUE_DEPTH.set_function(_pool.pending, executor="tts_workers")
+    _pool.start()
+    return _pool
@@ -0,0 +1,118 @@
+# server/vad.py - Vectorized voice activity detection for whole recordings
+#
+# /api/stt uploads usually start and end with silence (push-to-talk lag, the
+# user reaching for the button) and long dictation has pauses. Frame features
+# are computed over strided views of the clip in a few array operations, so
+# detection costs milliseconds even for minutes of audio, and Whisper only
+# sees the speech regions.
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30           # analysis window
+HOP_MS = 10             # window step
+THRESHOLD_DB = float(os.getenv("ORION_STT_VAD_THRESHOLD_DB", "9"))  # speech must be this far above the noise floor
+MIN_RMS = 0.0003        # ~-70 dBFS: never speech below this
+DYNAMIC_RANGE_DB = 30   # nor this far below the clip's loudest frames (so quiet mics still pass)
+MAX_FLOOR = 0.01        # cap on the estimated floor, so clips that are all speech still pass
+FRICATIVE_ZCR = 0.25    # zero crossings per sample typical of "s", "f", "sh"
+HANGOVER_MS = int(os.getenv("ORION_STT_VAD_HANGOVER_MS", "200"))  # keep this long after speech drops out
+PREROLL_MS = 100        # and this long before onset, for soft attacks
+MIN_SPEECH_MS = 60      # shorter bursts (clicks, taps) are ignored
+PAD_MS = int(os.getenv("ORION_STT_VAD_PAD_MS", "150"))  # silence kept around each region by compact()
+
+
+def _frames(samples: np.ndarray, frame_len: int, hop: int) -> np.ndarray:
+    """[n_frames, frame_len] strided view over samples (no copy)"""
+    return np.lib.stride_tricks.sliding_window_view(samples, frame_len)[::hop]
+
+
+def frame_features(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-frame RMS energy and zero-crossing rate (crossings per sample)"""
+    frame_len = sample_rate * FRAME_MS // 1000
+    hop = sample_rate * HOP_MS // 1000
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.size < frame_len:
+        samples = np.pad(samples, (0, frame_len - samples.size))
+    frames = _frames(samples, frame_len, hop)
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame_len)
+
+    # sign changes between neighbouring samples, summed per frame via a cumulative sum
+    crossings = np.concatenate(([0], np.cumsum(np.signbit(samples[1:]) != np.signbit(samples[:-1]))))
+    starts = np.arange(len(frames)) * hop
+    zcr = (crossings[starts + frame_len - 1] - crossings[starts]) / (frame_len - 1)
+    return rms, zcr
+
+
+def _runs(mask: np.ndarray) -> np.ndarray:
+    """[n, 2] start/end (exclusive) indexes of True runs"""
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    return np.stack((np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)), axis=1)
+
+
+def _dilate(mask: np.ndarray, before: int, after: int) -> np.ndarray:
+    """Extend every True frame `after` frames forward (hangover) and `before` frames back"""
+    if not mask.any():
+        return mask
+    kernel = np.ones(before + after + 1, dtype=np.int32)
+    spread = np.convolve(mask.astype(np.int32), kernel)
+    return spread[before:before + mask.size] > 0
+
+
+def speech_mask(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Per-frame (HOP_MS steps) speech decision with hangover smoothing"""
+    rms, zcr = frame_features(samples, sample_rate)
+    low, level = np.percentile(rms, [10, 95])
+    min_rms = max(MIN_RMS, float(level) * 10 ** (-DYNAMIC_RANGE_DB / 20))
+    floor = min(max(float(low), min_rms / 2), MAX_FLOOR)
+    threshold = max(min_rms, floor * 10 ** (THRESHOLD_DB / 20))
+    # voiced frames clear the threshold; quieter unvoiced consonants are caught by their ZCR
+    soft = max(min_rms, floor * 10 ** (THRESHOLD_DB / 40))
+    active = (rms > threshold) | ((rms > soft) & (zcr > FRICATIVE_ZCR))
+
+    runs = _runs(active)
+    short = runs[(runs[:, 1] - runs[:, 0]) * HOP_MS < MIN_SPEECH_MS]
+    for start, end in short:
+        active[start:end] = False
+    return _dilate(active, PREROLL_MS // HOP_MS, HANGOVER_MS // HOP_MS)
+
+
+def speech_regions(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> List[Tuple[int, int]]:
+    """[(start, end), ...] sample ranges containing speech"""
+    hop = sample_rate * HOP_MS // 1000
+    frame_len = sample_rate * FRAME_MS // 1000
+    runs = _runs(speech_mask(samples, sample_rate))
+    return [(int(start * hop), int(min(len(samples), (end - 1) * hop + frame_len))) for start, end in runs]
+
+
+def trim(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Leading/trailing silence removed (a view); empty when there is no speech"""
+    regions = speech_regions(samples, sample_rate)
+    if not regions:
+        return samples[:0]
+    return samples[regions[0][0]:regions[-1][1]]
+
+
+def compact(samples: np.ndarray, sample_rate: int = SAMPLE_RATE, pad_ms: int = PAD_MS) -> np.ndarray:
+    """
+    Speech regions only, each with up to `pad_ms` of its surrounding audio,
+    so long pauses shrink to at most 2 * pad_ms. Returns `samples` itself
+    when nothing would be removed and an empty array when there is no speech.
+    """
+    regions = speech_regions(samples, sample_rate)
+    if not regions:
+        return samples[:0]
+    pad = sample_rate * pad_ms // 1000
+    merged = []
+    for start, end in regions:
+        start, end = max(0, start - pad), min(len(samples), end + pad)
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    if len(merged) == 1:
+        start, end = merged[0]
+        return samples if (start, end) == (0, len(samples)) else samples[start:end]
+    return np.concatenate([samples[start:end] for start, end in merged])
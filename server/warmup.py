@@ -0,0 +1,141 @@
+# server/warmup.py - Model warmup and per-model readiness for /livez and /readyz
+import os
+import json
+import time
+import asyncio
+import threading
+from typing import Dict, List, Optional
+
+from server import stt, tts, tts_workers
+from server.log import get_logger
+
+WARMUP_TEXT = "Hello."
+SETTINGS_FILE = "data/settings.json"
+
+log = get_logger("startup")
+
+# Readiness states:
+#   lazy        - not warmed up, loads on first request (lazy profile)
+#   pending     - queued for warmup
+#   loading     - warmup in progress
+#   ready       - loaded and ran a synthetic inference
+#   failed      - warmup raised, see "error"
+#   unavailable - library not installed, nothing to wait for
+_READY_STATES = {"lazy", "ready", "unavailable"}
+
+_state: Dict[str, Dict] = {}
+_state_lock = threading.Lock()
+
+
+def _set(name: str, state: str, **extra):
+    with _state_lock:
+        entry = _state.setdefault(name, {})
+        entry.update(state=state, **extra)
+
+
+def configured_voices() -> List[str]:
+    """
+    TTS voices to warm up: the default COQUI_TTS_MODEL, ORION_WARMUP_VOICES
+    (comma separated) and the dashboard's saved voiceType.
+    """
+    voices = [tts.COQUI_TTS_MODEL]
+    voices += [v.strip() for v in os.getenv("ORION_WARMUP_VOICES", "").split(",") if v.strip()]
+    try:
+        with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+            voice_type = json.load(f).get("voiceType")
+        if voice_type:
+            voices.append(voice_type)
+    except (OSError, ValueError):
+        pass
+    return list(dict.fromkeys(voices))
+
+
+def init(profile: str, voices: Optional[List[str]] = None):
+    """Reset readiness for a new app; everything is 'lazy' unless it will be warmed up"""
+    initial = "lazy" if profile == "lazy" else "pending"
+    with _state_lock:
+        _state.clear()
+    _set("whisper", initial if stt.FASTER_WHISPER_AVAILABLE else "unavailable", model=stt.WHISPER_MODEL)
+    for voice in voices or configured_voices():
+        _set(f"tts:{voice}", initial if tts.COQUI_AVAILABLE else "unavailable", model=voice)
+
+
+def _run(name: str, fn, *args):
+    if _state.get(name, {}).get("state") == "unavailable":
+        return
+    _set(name, "loading")
+    t0 = time.perf_counter()
+    try:
+        fn(*args)
+        _set(name, "ready", ms=round((time.perf_counter() - t0) * 1000, 2))
+    except Exception as e:
+        log.warning("warmup failed", target=name, error=str(e))
+        _set(name, "failed", error=str(e), ms=round((time.perf_counter() - t0) * 1000, 2))
+
+
+def warmup_whisper():
+    """Load Whisper and transcribe one second of silence to allocate buffers"""
+    model = stt.get_whisper_model()
+    if model is None:
+        raise RuntimeError("Faster Whisper failed to load")
+    import numpy as np
+    segments, _ = model.transcribe(np.zeros(16000, dtype=np.float32), beam_size=1, language="en")
+    list(segments)  # transcription is lazy until the generator is consumed
+
+
+def warmup_tts(voice: str):
+    """Load a Coqui voice and synthesize a short phrase"""
+    model_name, speaker = tts.split_voice(voice, os.getenv("COQUI_TTS_SPEAKER") or None)
+    pool = tts_workers.get_pool()
+    if pool is not None:
+        # worker processes preload the default voice; other voices load on a test phrase
+        if not pool.wait_ready(tts_workers.TTS_WORKER_TIMEOUT):
+            raise RuntimeError("TTS workers did not start")
+        if model_name and model_name != tts.COQUI_TTS_MODEL:
+            pool.synthesize(WARMUP_TEXT, model_name, speaker).close()
+        return
+    model = tts.get_tts_model(model_name)
+    if model is None:
+        raise RuntimeError(f"TTS model '{model_name}' failed to load")
+    if not speaker and getattr(model, "is_multi_speaker", False) and model.speakers:
+        speaker = model.speakers[0]
+    if speaker:
+        model.tts(text=WARMUP_TEXT, speaker=speaker)
+    else:
+        model.tts(text=WARMUP_TEXT)
+
+
+def warmup_all():
+    """Warm every tracked model (blocking)"""
+    _run("whisper", warmup_whisper)
+    for name in list(_state):
+        if name.startswith("tts:"):
+            _run(name, warmup_tts, _state[name]["model"])
+
+
+async def warmup_in_background(timer=None):
+    """Run warmup_all on a worker thread so the event loop keeps serving /livez"""
+    loop = asyncio.get_running_loop()
+    try:
+        if timer is not None:
+            with timer.phase("model_load"):
+                await loop.run_in_executor(None, warmup_all)
+        else:
+            await loop.run_in_executor(None, warmup_all)
+        log.info("background warmup finished")
+    except Exception as e:
+        log.exception("background warmup failed")
+
+
+def readiness() -> Dict:
+    with _state_lock:
+        models = {name: dict(entry) for name, entry in _state.items()}
+    for name, entry in models.items():
+        if name == "whisper":
+            entry["loaded"] = stt.whisper_model is not None
+        else:
+            entry["loaded"] = tts.split_voice(entry["model"], None)[0] in tts.tts_model_cache
+    return {
+        "ready": all(entry["state"] in _READY_STATES for entry in models.values()),
+        "models": models,
+    }
@@ -0,0 +1,113 @@
+"""
+Audio codec tests
+Tests format negotiation and Opus/MP3 encoding of synthesized WAV
+"""
+import pytest
+import os
+import io
+import sys
+import wave
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from server import audio_codec
+
+
+def make_wav(seconds=1.0, sample_rate=22050):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    samples = (np.sin(2 * np.pi * 440 * t) * 12000).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+
+class TestNegotiation:
+    """Test picking the output format"""
+
+    def test_request_field_wins(self):
+        assert audio_codec.negotiate_format("mp3", "audio/ogg") == "mp3"
+
+    def test_ogg_is_opus(self):
+        assert audio_codec.negotiate_format("ogg", None) == "opus"
+
+    def test_accept_header_q_values(self):
+        accept = "audio/wav;q=0.5, audio/mpeg;q=0.9, audio/ogg;q=0.8"
+        assert audio_codec.negotiate_format(None, accept) == "mp3"
+
+    def test_unknown_falls_back_to_default(self):
+        assert audio_codec.negotiate_format("flac", "application/json") == audio_codec.DEFAULT_FORMAT
+
+
+@pytest.mark.skipif(not audio_codec.AV_AVAILABLE, reason="PyAV not installed")
+class TestEncode:
+    """Test compressed encoding with PyAV"""
+
+    def test_opus_is_ogg_and_smaller(self):
+        wav_bytes = make_wav()
+        data, fmt = audio_codec.encode(wav_bytes, "opus", 24000)
+        assert fmt == "opus"
+        assert data[:4] == b"OggS"
+        assert len(data) < len(wav_bytes) / 5
+
+    def test_mp3(self):
+        wav_bytes = make_wav()
+        data, fmt = audio_codec.encode(wav_bytes, "mp3", 64000)
+        assert fmt == "mp3"
+        assert data[:3] == b"ID3" or data[0] == 0xFF
+        assert len(data) < len(wav_bytes) / 3
+
+    def test_bitrate_is_clamped(self):
+        data, fmt = audio_codec.encode(make_wav(0.2), "opus", 10)
+        assert fmt == "opus"
+
+    def test_wav_passthrough(self):
+        wav_bytes = make_wav(0.1)
+        assert audio_codec.encode(wav_bytes, "wav") == (wav_bytes, "wav")
+
+
+@pytest.mark.skipif(not audio_codec.AV_AVAILABLE, reason="PyAV not installed")
+class TestDecode:
+    """Test in-memory decoding of uploads for STT"""
+
+    def test_wav_resampled_to_16k_mono(self):
+        samples = audio_codec.decode_to_pcm(make_wav(1.0, 22050))
+        assert samples.dtype == np.float32
+        assert abs(len(samples) - 16000) < 200
+        assert 0.3 < np.abs(samples).max() <= 1.0
+
+    def test_ogg_opus_upload(self):
+        ogg, _ = audio_codec.encode(make_wav(1.0, 48000), "opus", 32000)
+        samples = audio_codec.decode_to_pcm(ogg)
+        assert abs(len(samples) - 16000) < 800
+
+    def test_garbage_raises_value_error(self):
+        with pytest.raises(ValueError):
+            audio_codec.decode_to_pcm(b"not audio at all" * 10)
+
+    def test_max_seconds(self):
+        with pytest.raises(audio_codec.AudioTooLong):
+            audio_codec.decode_to_pcm(make_wav(2.0, 16000), max_seconds=1.0)
+
+    def test_reads_file_object(self):
+        samples = audio_codec.decode_to_pcm(io.BytesIO(make_wav(0.5, 16000)))
+        assert abs(len(samples) - 8000) < 200
+
+
+class TestSniff:
+    """Test container detection from upload headers"""
+
+    def test_known_containers(self):
+        assert audio_codec.sniff_container(make_wav(0.01)[:16]) == "wav"
+        assert audio_codec.sniff_container(b"OggS\x00\x02") == "ogg"
+        assert audio_codec.sniff_container(b"\x1aE\xdf\xa3\x9fB\x86") == "webm"
+        assert audio_codec.sniff_container(b"\x00\x00\x00\x1cftypM4A ") == "mp4"
+
+    def test_unknown(self):
+        assert audio_codec.sniff_container(b"hello world") is None
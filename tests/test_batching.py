@@ -0,0 +1,89 @@
+"""
+Micro-batching tests
+Tests that concurrent requests under one key share batches
+"""
+import pytest
+import os
+import sys
+import time
+import threading
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.batching import MicroBatcher
+
+
+class Runner:
+    """Fake run_batch; the first batch blocks until released"""
+
+    def __init__(self):
+        self.batches = []
+        self.threads = []
+        self.release = threading.Event()
+
+    def __call__(self, items, context):
+        self.batches.append(list(items))
+        self.threads.append(threading.current_thread())
+        if len(self.batches) == 1:
+            self.release.wait(2)
+        return [f"out:{item}" for item in items]
+
+
+class TestBatching:
+    """Test batch formation"""
+
+    def test_idle_key_runs_immediately(self):
+        runner = Runner()
+        runner.release.set()
+        batcher = MicroBatcher(runner, window_ms=500)
+        with patch("server.batching.time.sleep") as sleep:
+            assert batcher.submit("k", "hello") == "out:hello"
+        sleep.assert_not_called()  # no batching window without a queue
+        assert runner.threads == [threading.current_thread()]
+
+    def test_requests_queued_behind_busy_key_share_a_batch(self):
+        runner = Runner()
+        batcher = MicroBatcher(runner, window_ms=10, max_batch=8)
+        results = {}
+
+        def request(item):
+            results[item] = batcher.submit("k", item)
+
+        first = threading.Thread(target=request, args=("first",))
+        first.start()
+        while not runner.batches:
+            time.sleep(0.01)
+        others = [threading.Thread(target=request, args=(f"t{i}",)) for i in range(4)]
+        for t in others:
+            t.start()
+        while len(batcher._group("k").pending) < 4:
+            time.sleep(0.01)
+        runner.release.set()
+        for t in [first] + others:
+            t.join(2)
+
+        assert runner.batches[0] == ["first"]
+        assert sorted(runner.batches[1]) == ["t0", "t1", "t2", "t3"]
+        assert results["t2"] == "out:t2"
+
+    def test_different_keys_are_not_mixed(self):
+        runner = Runner()
+        runner.release.set()
+        batcher = MicroBatcher(runner, window_ms=0)
+        batcher.submit("p225", "a")
+        batcher.submit("p226", "b")
+        assert runner.batches == [["a"], ["b"]]
+        assert batcher._groups == {}
+
+    def test_error_reaches_every_request(self):
+        def fail(items, context):
+            raise RuntimeError("boom")
+
+        batcher = MicroBatcher(fail, window_ms=0)
+        with pytest.raises(RuntimeError, match="boom"):
+            batcher.submit("k", "hello")
+        # group is released after a failure
+        batcher.run_batch = lambda items, context: [item.upper() for item in items]
+        assert batcher.submit("k", "hello") == "HELLO"
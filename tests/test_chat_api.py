@@ -0,0 +1,37 @@
+"""
+Chat endpoint tests
+Tests the /api/chat response shape the web UI depends on
+"""
+import pytest
+import os
+import sys
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+fastapi = pytest.importorskip("fastapi")
+pytest.importorskip("orion.app.orchestrator")
+from fastapi.testclient import TestClient
+
+from server.routers import chat
+
+
+class TestChatResponse:
+    """Test /api/chat response keys"""
+
+    def test_audio_format_keys(self):
+        app = fastapi.FastAPI()
+        app.include_router(chat.router)
+        answer = {"answer": "It is noon.", "agent": "conversational", "model": "m"}
+        with patch("server.routers.chat.TimedMemory"), \
+             patch("server.routers.chat.process_query", return_value=answer), \
+             patch("server.tts.COQUI_AVAILABLE", True), \
+             patch("server.tts.synthesize_sync", return_value=(b"RIFF", "wav")):
+            r = TestClient(app).post("/api/chat", json={"message": "time?", "enable_tts": True})
+        data = r.json()
+        assert data["response"] == "It is noon."
+        assert data["audio"]
+        # ui/web/index.html plays `data.audio` only when `data.audio_format` is set
+        assert data["audio_format"] == "wav"
+        assert data["audioformat"] == "wav"
@@ -0,0 +1,81 @@
+"""
+Import-time benchmark for the server modules
+Runs `python -X importtime` in a fresh interpreter and reports per-module
+cumulative import time. Heavy speech/ML libraries must only load on first use.
+"""
+import pytest
+import os
+import sys
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that can be imported without the orion.app stack
+SERVER_MODULES = [
+    "server.startup",
+    "server.stt",
+    "server.tts",
+    "server.routers.speech",
+    "server.routers.zephyr_ops",
+]
+
+HEAVY_MODULES = ["torch", "TTS", "faster_whisper", "ctranslate2", "soundfile", "numpy", "pydub", "psutil"]
+
+IMPORT_BUDGET_MS = float(os.getenv("ORION_IMPORT_BUDGET_MS", "3000"))
+
+
+def measure_imports(modules, extra_code=""):
+    """
+    Import `modules` in a clean interpreter with -X importtime.
+
+    Returns:
+        ({module: cumulative_ms}, stdout)
+    """
+    code = "; ".join(f"import {m}" for m in modules)
+    if extra_code:
+        code += "; " + extra_code
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if result.returncode != 0:
+        pytest.skip(f"server modules not importable here: {result.stderr.strip().splitlines()[-1]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative) / 1000
+    return timings, result.stdout
+
+
+class TestImportTime:
+    """Server import must not pay for models it has not used yet"""
+
+    def test_heavy_modules_are_deferred(self):
+        timings, _ = measure_imports(SERVER_MODULES)
+        loaded = [m for m in HEAVY_MODULES if m in timings]
+        assert not loaded, f"Heavy modules imported eagerly: {loaded}"
+
+    def test_zephyr_router_starts_no_threads(self):
+        _, out = measure_imports(
+            ["threading"],
+            "n = threading.active_count(); import server.routers.zephyr_ops; print(threading.active_count() - n)"
+        )
+        assert out.strip() == "0"
+
+    def test_import_time_benchmark(self):
+        timings, _ = measure_imports(SERVER_MODULES)
+
+        print("\nPer-module cumulative import time (ms):")
+        for name, ms in sorted(timings.items(), key=lambda kv: kv[1], reverse=True)[:15]:
+            print(f"  {ms:9.1f}  {name}")
+
+        total = sum(timings[m] for m in SERVER_MODULES if m in timings)
+        print(f"  {total:9.1f}  total for {', '.join(SERVER_MODULES)}")
+        assert total < IMPORT_BUDGET_MS, f"Server import took {total:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
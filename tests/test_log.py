@@ -0,0 +1,88 @@
+"""
+Structured logging tests
+Tests sampling, formatting and the non-blocking queue handler
+"""
+import pytest
+import os
+import sys
+import json
+import queue
+import logging
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import log, tracing
+
+
+def make_record(name="orion.stt", level=logging.INFO, msg="transcribed", **fields):
+    record = logging.LogRecord(name, level, __file__, 1, msg, None, None)
+    record.fields = fields
+    return record
+
+
+class TestSampling:
+    """Test per-category sampling"""
+
+    def test_parse_sample_rates(self):
+        assert log._parse_sample_rates("stt=0.1, tts=2,bad=x") == {"stt": 0.1, "tts": 1.0}
+
+    def test_zero_rate_drops_info(self):
+        f = log.SamplingFilter({"stt": 0.0})
+        assert f.filter(make_record()) is False
+        assert f.filter(make_record(name="orion.chat")) is True
+
+    def test_warnings_are_never_sampled(self):
+        f = log.SamplingFilter({"stt": 0.0})
+        assert f.filter(make_record(level=logging.WARNING)) is True
+
+
+class TestFormatter:
+    """Test structured output"""
+
+    def test_text_format(self):
+        line = log.StructuredFormatter("text").format(make_record(chars=12, text="hi there"))
+        assert "INFO" in line
+        assert "[stt] transcribed chars=12 text='hi there'" in line
+
+    def test_json_format(self):
+        data = json.loads(log.StructuredFormatter("json").format(make_record(chars=12)))
+        assert data["category"] == "stt"
+        assert data["level"] == "info"
+        assert data["chars"] == 12
+
+
+class TestQueueHandler:
+    """Test the handler used on the request path"""
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = log._DroppingQueueHandler(queue.Queue(maxsize=1))
+        before = log.dropped_records
+        handler.emit(make_record())
+        handler.emit(make_record())
+        assert log.dropped_records == before + 1
+
+    def test_prepare_adds_trace_id_and_traceback(self):
+        handler = log._DroppingQueueHandler(queue.Queue())
+        try:
+            raise ValueError("bad audio")
+        except ValueError:
+            record = make_record(level=logging.ERROR)
+            record.exc_info = sys.exc_info()
+
+        trace = tracing.Trace("trace123")
+        token = tracing._current_trace.set(trace)
+        try:
+            prepared = handler.prepare(record)
+        finally:
+            tracing._current_trace.reset(token)
+
+        assert prepared.fields["trace_id"] == "trace123"
+        assert "ValueError: bad audio" in prepared.fields["exc"]
+        assert prepared.exc_info is None
+
+    def test_debug_is_off_by_default(self):
+        logger = log.get_logger("chat")
+        if log.LOG_LEVEL != "INFO":
+            pytest.skip("ORION_LOG_LEVEL overridden")
+        assert not logger.isEnabledFor(logging.DEBUG)
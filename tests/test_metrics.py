@@ -0,0 +1,82 @@
+"""
+Metrics tests
+Tests the Prometheus text exposition served at /metrics
+"""
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import metrics
+
+
+class TestMetricTypes:
+    """Test counters, gauges and histograms"""
+
+    def test_counter_labels(self):
+        counter = metrics.Counter("test_requests_total", "Test counter", ("status",))
+        counter.inc(status="ok")
+        counter.inc(2, status="ok")
+        counter.inc(status="error")
+
+        lines = counter.render()
+        assert '# TYPE test_requests_total counter' in lines
+        assert 'test_requests_total{status="ok"} 3' in lines
+        assert 'test_requests_total{status="error"} 1' in lines
+
+    def test_histogram_buckets_are_cumulative(self):
+        hist = metrics.Histogram("test_latency_seconds", "Test histogram", buckets=(0.1, 1.0))
+        hist.observe(0.05)
+        hist.observe(0.5)
+        hist.observe(5.0)
+
+        lines = hist.render()
+        assert 'test_latency_seconds_bucket{le="0.1"} 1' in lines
+        assert 'test_latency_seconds_bucket{le="1"} 2' in lines
+        assert 'test_latency_seconds_bucket{le="+Inf"} 3' in lines
+        assert 'test_latency_seconds_count 3' in lines
+        assert hist.count() == 3
+
+    def test_histogram_time(self):
+        hist = metrics.Histogram("test_block_seconds", "Test timer", ("stage",))
+        with hist.time(stage="decode"):
+            pass
+        assert hist.count(stage="decode") == 1
+
+    def test_gauge_function_evaluated_on_scrape(self):
+        depth = [0]
+        gauge = metrics.Gauge("test_queue_depth", "Test gauge", ("executor",))
+        gauge.set_function(lambda: depth[0], executor="tts")
+
+        depth[0] = 4
+        assert 'test_queue_depth{executor="tts"} 4' in gauge.render()
+
+    def test_label_values_are_escaped(self):
+        counter = metrics.Counter("test_escape_total", "Escaping", ("route",))
+        counter.inc(route='a"b')
+        assert 'test_escape_total{route="a\\"b"} 1' in counter.render()
+
+
+class TestRegistry:
+    """Test the exported stage metrics"""
+
+    def test_render_includes_pipeline_stages(self):
+        text = metrics.render()
+        for name in [
+            "orion_stt_decode_seconds",
+            "orion_stt_transcribe_seconds",
+            "orion_memory_load_seconds",
+            "orion_memory_save_seconds",
+            "orion_llm_total_seconds",
+            "orion_tts_synthesize_seconds",
+            "orion_tts_encode_seconds",
+            "orion_http_requests_total",
+            "orion_executor_queue_depth",
+            "orion_models_loaded",
+            "orion_process_resident_memory_bytes",
+        ]:
+            assert f"# TYPE {name}" in text
+
+    def test_process_rss_is_reported(self):
+        assert metrics.PROCESS_RSS_BYTES.get() > 0
@@ -0,0 +1,233 @@
+"""
+Speech endpoint tests
+Tests /api/tts delivery modes and /api/audio with synthesis mocked out
+"""
+import pytest
+import os
+import sys
+import base64
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+fastapi = pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from server.routers import speech
+from server.audio_store import AudioStore, audio_store
+
+FAKE_WAV = b"RIFF" + b"\x00" * 200_000
+
+
+@pytest.fixture
+def client():
+    app = fastapi.FastAPI()
+    app.include_router(speech.router)
+    with patch("server.tts.synthesize_sync", return_value=(FAKE_WAV, "wav")):
+        yield TestClient(app)
+
+
+class TestTTSDelivery:
+    """Test /api/tts response formats"""
+
+    def test_json_is_default(self, client):
+        r = client.post("/api/tts", json={"text": "hello"})
+        data = r.json()
+        assert data["status"] == "success"
+        assert base64.b64decode(data["audio"]) == FAKE_WAV
+
+    def test_binary_response(self, client):
+        r = client.post("/api/tts", json={"text": "hello", "response_format": "binary"})
+        assert r.headers["content-type"] == "audio/wav"
+        assert r.content == FAKE_WAV
+
+    def test_accept_header_selects_binary(self, client):
+        r = client.post("/api/tts", json={"text": "hello"}, headers={"Accept": "audio/*"})
+        assert r.headers["content-type"] == "audio/wav"
+        assert r.content == FAKE_WAV
+
+    def test_stream_response(self, client):
+        r = client.post("/api/tts", json={"text": "hello", "response_format": "stream"})
+        assert "content-length" not in r.headers
+        assert r.content == FAKE_WAV
+
+    def test_binary_failure_uses_error_status(self, client):
+        with patch("server.tts.synthesize_sync", return_value=(None, None)):
+            r = client.post("/api/tts", json={"text": "hello", "response_format": "binary"})
+        assert r.status_code == 500
+
+
+class TestAudioStore:
+    """Test short-lived audio ids"""
+
+    def test_fetch_by_id(self, client):
+        audio_id = audio_store.put(FAKE_WAV, "wav")
+        r = client.get(f"/api/audio/{audio_id}")
+        assert r.status_code == 200
+        assert r.content == FAKE_WAV
+
+    def test_unknown_id(self, client):
+        assert client.get("/api/audio/missing").status_code == 404
+
+    def test_expired_clip(self):
+        store = AudioStore(ttl=-1)
+        audio_id = store.put(b"abc", "wav")
+        assert store.get(audio_id) is None
+
+    def test_byte_cap_evicts_oldest(self):
+        store = AudioStore(max_bytes=10)
+        first = store.put(b"x" * 6, "wav")
+        second = store.put(b"y" * 6, "wav")
+        assert store.get(first) is None
+        assert store.get(second) == (b"y" * 6, "wav")
+        assert store.stats()["bytes"] == 6
+
+
+class TestTTSFormats:
+    """Test compressed output format negotiation on /api/tts"""
+
+    def test_audio_format_passed_to_worker(self):
+        app = fastapi.FastAPI()
+        app.include_router(speech.router)
+        with patch("server.tts.synthesize_sync", return_value=(b"OggS", "opus")) as synth:
+            r = TestClient(app).post("/api/tts", json={"text": "hi", "audio_format": "ogg", "bitrate": 24000,
+                                                       "response_format": "binary"})
+        assert synth.call_args[0][3:5] == ("opus", 24000)
+        assert r.headers["content-type"] == "audio/ogg"
+
+    def test_accept_header_selects_mp3(self):
+        app = fastapi.FastAPI()
+        app.include_router(speech.router)
+        with patch("server.tts.synthesize_sync", return_value=(b"ID3", "mp3")) as synth:
+            r = TestClient(app).post("/api/tts", json={"text": "hi"}, headers={"Accept": "audio/mpeg"})
+        assert synth.call_args[0][3] == "mp3"
+        assert r.headers["content-type"] == "audio/mpeg"
+
+
+class TestSTT:
+    """Test /api/stt decodes uploads in memory"""
+
+    def test_whisper_gets_pcm_array(self):
+        np = pytest.importorskip("numpy")
+        from server import audio_codec
+        tone = 0.5 * np.sin(2 * np.pi * 440 * np.arange(11025) / 22050)
+        wav = audio_codec.pcm_to_wav(tone, 22050)
+
+        segment = type("Segment", (), {"text": " hello world"})()
+        info = type("Info", (), {"language": "en"})()
+        model = MagicMock()
+        model.transcribe.return_value = ([segment], info)
+
+        app = fastapi.FastAPI()
+        app.include_router(speech.router)
+        with patch("server.stt.get_whisper_model", return_value=model), \
+             patch("tempfile.NamedTemporaryFile", side_effect=AssertionError("temp file used")):
+            r = TestClient(app).post("/api/stt", files={"audio": ("a.wav", wav, "audio/wav")})
+
+        assert r.json() == {"transcript": "hello world", "status": "success", "service": "faster-whisper"}
+        samples = model.transcribe.call_args[0][0]
+        assert samples.dtype == np.float32
+        assert abs(len(samples) - 8000) < 200
+
+
+class TestSTTUploadLimits:
+    """Test /api/stt rejects bad or oversized uploads before loading a model"""
+
+    @pytest.fixture
+    def stt_client(self):
+        app = fastapi.FastAPI()
+        app.add_middleware(speech.UploadLimitMiddleware)
+        app.include_router(speech.router)
+        with patch("server.stt.get_whisper_model", side_effect=AssertionError("model loaded")) as loader:
+            yield TestClient(app), loader
+
+    def test_wrong_content_type(self, stt_client):
+        client, _ = stt_client
+        r = client.post("/api/stt", files={"audio": ("a.txt", b"RIFF" + b"\x00" * 100, "text/plain")})
+        assert r.status_code == 415
+
+    def test_unrecognized_header(self, stt_client):
+        client, _ = stt_client
+        r = client.post("/api/stt", files={"audio": ("a.wav", b"definitely not audio" * 10, "audio/wav")})
+        assert r.status_code == 415
+        assert r.json()["error"] == "Unrecognized audio container"
+
+    def test_oversized_upload(self, stt_client):
+        client, _ = stt_client
+        with patch("server.stt.MAX_UPLOAD_BYTES", 1000):
+            r = client.post("/api/stt", files={"audio": ("a.wav", FAKE_WAV, "audio/wav")})
+        assert r.status_code == 413
+
+    def test_chunked_upload_cut_off(self, stt_client):
+        client, _ = stt_client
+
+        def chunks():  # no Content-Length: sent chunked
+            for _ in range(100):
+                yield b"\x00" * 1000
+
+        with patch("server.stt.MAX_UPLOAD_BYTES", 5000), \
+             patch("server.routers.speech._check_upload", side_effect=AssertionError("body spooled")):
+            r = client.post("/api/stt", content=chunks(),
+                            headers={"Content-Type": "multipart/form-data; boundary=x"})
+        assert r.status_code == 413
+        assert r.json()["error"] == "Upload larger than 5000 bytes"
+
+    def test_too_long_audio(self):
+        np = pytest.importorskip("numpy")
+        from server import audio_codec
+        if not audio_codec.AV_AVAILABLE:
+            pytest.skip("PyAV not installed")
+        wav = audio_codec.pcm_to_wav(np.zeros(16000 * 3, dtype=np.float32), 16000)
+
+        app = fastapi.FastAPI()
+        app.include_router(speech.router)
+        with patch("server.stt.get_whisper_model", return_value=MagicMock()) as loader, \
+             patch("server.stt.MAX_AUDIO_SECONDS", 1.0):
+            r = TestClient(app).post("/api/stt", files={"audio": ("a.wav", wav, "audio/wav")})
+        assert r.status_code == 413
+        assert not loader.return_value.transcribe.called
+
+
+class TestSTTPCM:
+    """Test /api/stt/pcm feeds raw PCM bodies to Whisper"""
+
+    def _post(self, body, headers=None, model=None):
+        model = model or MagicMock()
+        if not model.transcribe.call_count:
+            model.transcribe.return_value = ([MagicMock(text=" raw audio")], MagicMock())
+        app = fastapi.FastAPI()
+        app.add_middleware(speech.UploadLimitMiddleware)
+        app.include_router(speech.router)
+        with patch("server.stt.get_whisper_model", return_value=model), \
+             patch("server.stt_batcher.STT_BATCHING", False):
+            return TestClient(app).post("/api/stt/pcm", content=body, headers=headers or {}), model
+
+    def test_int16_mono(self):
+        np = pytest.importorskip("numpy")
+        pcm = (np.sin(np.arange(16000) / 5) * 16000).astype("<i2")
+        r, model = self._post(pcm.tobytes())
+        assert r.json()["transcript"] == "raw audio"
+        samples = model.transcribe.call_args[0][0]
+        assert samples.dtype == np.float32 and len(samples) == 16000
+        assert np.allclose(samples, pcm / 32768.0)
+
+    def test_stereo_48k_downmixed_and_resampled(self):
+        np = pytest.importorskip("numpy")
+        stereo = np.zeros((48000, 2), dtype="<i2")
+        stereo[:, 0] = 16384
+        r, model = self._post(stereo.tobytes(), {"X-Sample-Rate": "48000", "X-Channels": "2"})
+        samples = model.transcribe.call_args[0][0]
+        assert abs(len(samples) - 16000) <= 1
+        assert np.allclose(samples[100:-100], 0.25, atol=1e-3)  # filter edges ring on the step
+
+    def test_bad_headers(self):
+        r, model = self._post(b"\x00" * 100, {"X-Sample-Format": "mulaw"})
+        assert r.status_code == 400
+        assert not model.transcribe.called
+
+    def test_too_large(self):
+        with patch("server.stt.MAX_UPLOAD_BYTES", 100):
+            r, model = self._post(b"\x00" * 1000)
+        assert r.status_code == 413
+        assert not model.transcribe.called
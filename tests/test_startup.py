@@ -0,0 +1,61 @@
+"""
+Startup profile tests
+Tests profile selection and phase timing used by the app factory
+"""
+import pytest
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.startup import StartupTimer, resolve_profile, DEFAULT_STARTUP_PROFILE
+
+
+class TestResolveProfile:
+    """Test startup profile selection"""
+
+    def test_explicit_profile_wins(self):
+        with patch.dict(os.environ, {"ORION_STARTUP_PROFILE": "eager"}):
+            assert resolve_profile("background") == "background"
+
+    def test_profile_from_env(self):
+        with patch.dict(os.environ, {"ORION_STARTUP_PROFILE": "EAGER"}):
+            assert resolve_profile() == "eager"
+
+    def test_unknown_profile_falls_back(self):
+        assert resolve_profile("turbo") == DEFAULT_STARTUP_PROFILE
+
+
+class TestStartupTimer:
+    """Test phase timing reported at /api/status"""
+
+    def test_phase_is_timed(self):
+        timer = StartupTimer("lazy")
+        with timer.phase("imports"):
+            time.sleep(0.01)
+        assert timer.phases["imports"]["status"] == "ok"
+        assert timer.phases["imports"]["ms"] >= 10
+
+    def test_failed_phase_is_recorded(self):
+        timer = StartupTimer("eager")
+        with pytest.raises(RuntimeError):
+            with timer.phase("model_load"):
+                raise RuntimeError("no model")
+        assert timer.phases["model_load"]["status"] == "error"
+        assert "no model" in timer.phases["model_load"]["error"]
+
+    def test_report(self):
+        timer = StartupTimer("lazy")
+        with timer.phase("imports"):
+            pass
+        timer.skip("model_load", "lazy")
+        timer.mark_ready()
+
+        report = timer.report()
+        assert report["profile"] == "lazy"
+        assert report["phases"]["model_load"]["status"] == "skipped"
+        assert report["time_to_ready_ms"] is not None
+        assert report["total_ms"] == pytest.approx(report["phases"]["imports"]["ms"])
@@ -0,0 +1,151 @@
+"""
+Batched STT tests
+Tests grouping concurrent clips into one BatchedInferencePipeline call
+"""
+import pytest
+import os
+import sys
+import time
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from server import stt_batcher
+
+
+class FakePipeline:
+    """Returns one segment per clip_timestamps window, tagged with the clip's index"""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, clip_timestamps, batch_size, **kwargs):
+        self.calls.append((len(audio), batch_size, kwargs))
+        self.clip_timestamps = clip_timestamps
+        # like faster-whisper's collect_chunks: windows are sample slices, segment times seconds
+        chunks = [audio[ts["start"]:ts["end"]] for ts in clip_timestamps]
+        segments = [SimpleNamespace(start=ts["start"] / 16000, text=f" clip {i}")
+                    for i, (ts, chunk) in enumerate(zip(clip_timestamps, chunks)) if chunk.size]
+        return iter(segments), None
+
+
+class TestRunBatch:
+    """Test segment -> clip mapping"""
+
+    def test_segments_mapped_back_to_clips(self):
+        pipeline = FakePipeline()
+        clips = [np.zeros(16000 * n, dtype=np.float32) for n in (1, 3, 2)]
+        with patch("server.stt_batcher.get_pipeline", return_value=pipeline):
+            texts = stt_batcher.run_batch(MagicMock(), clips, {"beam_size": 1})
+        assert texts == ["clip 0", "clip 1", "clip 2"]
+        assert pipeline.calls[0][:2] == (16000 * 6, 3)
+        assert pipeline.clip_timestamps == [
+            {"start": 0, "end": 16000}, {"start": 16000, "end": 64000}, {"start": 64000, "end": 96000},
+        ]
+        assert all(isinstance(v, int) for ts in pipeline.clip_timestamps for v in ts.values())
+
+    def test_profile_options_honoured(self):
+        from server import stt
+        pipeline = FakePipeline()
+        tone = (0.3 * np.sin(np.arange(16000) / 3)).astype(np.float32)
+        silence = np.zeros(16000, dtype=np.float32)
+        clips = [np.concatenate([silence, tone, silence]), silence, tone]
+        with patch("server.stt_batcher.get_pipeline", return_value=pipeline):
+            texts = stt_batcher.run_batch(MagicMock(), clips, stt.DECODING_PROFILES["command"])
+        options = pipeline.calls[0][2]
+        assert options["without_timestamps"] is True and options["beam_size"] == 1
+        # vad_filter: only speech regions are decoded, the silent clip gets nothing
+        assert texts[0] and texts[1] == "" and texts[2]
+        first = pipeline.clip_timestamps[0]
+        assert 12000 < first["start"] < 16000 and 32000 < first["end"] < 40000
+
+        with patch("server.stt_batcher.get_pipeline", return_value=pipeline):
+            stt_batcher.run_batch(MagicMock(), clips, stt.DECODING_PROFILES["dictation"])
+        assert pipeline.calls[1][2]["without_timestamps"] is False
+        assert pipeline.calls[1][2]["beam_size"] == 5
+
+    def test_single_clip_uses_model_directly(self):
+        model = MagicMock()
+        model.transcribe.return_value = (iter([SimpleNamespace(text=" hi")]), None)
+        with patch("server.stt_batcher.get_pipeline") as get_pipeline:
+            assert stt_batcher.run_batch(model, [np.zeros(100)], {"beam_size": 1}) == ["hi"]
+        get_pipeline.assert_not_called()
+
+    def test_long_and_partial_clips_not_batched(self):
+        assert stt_batcher.batchable(np.zeros(16000 * 5), "command")
+        assert not stt_batcher.batchable(np.zeros(16000 * 31), "dictation")
+        assert not stt_batcher.batchable(np.zeros(16000), "partial")
+
+
+class TestPipelines:
+    """Test each pool model gets its own batched pipeline"""
+
+    def test_one_pipeline_per_model(self):
+        class StubPipeline:
+            def __init__(self, model):
+                self.model = model
+
+        tiny, small = MagicMock(name="tiny.en"), MagicMock(name="small.en")
+        faster_whisper = SimpleNamespace(BatchedInferencePipeline=StubPipeline)
+        with patch.dict(sys.modules, {"faster_whisper": faster_whisper}), \
+             patch("server.stt_batcher._pipelines", {}), \
+             patch("server.stt_batcher._pipeline_failed", False):
+            assert stt_batcher.get_pipeline(tiny).model is tiny
+            assert stt_batcher.get_pipeline(small).model is small
+            assert stt_batcher.get_pipeline(tiny) is stt_batcher.get_pipeline(tiny)
+
+
+class TestConcurrency:
+    """Test concurrent uploads share one decode"""
+
+    def _uploads(self, batcher, sizes, cancels=None):
+        """Start one upload, queue the rest behind it, release; returns results by size"""
+        release = threading.Event()
+        batches = []
+        results = {}
+
+        def run(model, clips, options):
+            batches.append(len(clips))
+            if len(batches) == 1:
+                release.wait(2)
+            return [f"n={len(c)}" for c in clips]
+
+        def upload(n):
+            results[n] = batcher.transcribe(None, np.zeros(n), "command", {}, (cancels or {}).get(n))
+
+        with patch("server.stt_batcher.run_batch", side_effect=run):
+            threads = [threading.Thread(target=upload, args=(n,)) for n in sizes]
+            threads[0].start()
+            time.sleep(0.05)
+            for t in threads[1:]:
+                t.start()
+            time.sleep(0.05)
+            for cancel in (cancels or {}).values():
+                cancel.set()
+            release.set()
+            for t in threads:
+                t.join(2)
+        return batches, results
+
+    def test_queued_clips_decoded_together(self):
+        batches, results = self._uploads(stt_batcher.STTBatcher(window_ms=10), (1, 2, 3, 4))
+        assert batches == [1, 3]
+        assert sorted(results.values()) == ["n=1", "n=2", "n=3", "n=4"]
+
+    def test_cancelled_clips_dropped_before_decode(self):
+        cancels = {2: threading.Event(), 3: threading.Event()}
+        batches, results = self._uploads(stt_batcher.STTBatcher(window_ms=10), (1, 2, 3, 4), cancels)
+        assert batches == [1, 1]
+        assert results == {1: "n=1", 2: None, 3: None, 4: "n=4"}
+
+    def test_cancelled_before_enqueue(self):
+        cancel = threading.Event()
+        cancel.set()
+        with patch("server.stt_batcher.run_batch") as run:
+            assert stt_batcher.STTBatcher().transcribe(None, np.zeros(10), "command", {}, cancel) is None
+        run.assert_not_called()
@@ -0,0 +1,85 @@
+"""
+STT transcript cache tests
+Tests upload hashing, LRU/TTL behaviour and duplicate /api/stt uploads
+"""
+import pytest
+import io
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.stt_cache import STTCache, upload_key
+
+
+class TestKey:
+    """Test upload_key"""
+
+    def test_same_bytes_same_key(self):
+        a, b = io.BytesIO(b"x" * 3_000_000), io.BytesIO(b"x" * 3_000_000)
+        assert upload_key(a) == upload_key(b)
+        assert a.tell() == 0
+
+    def test_options_change_key(self):
+        data = io.BytesIO(b"audio")
+        assert upload_key(data, "command") != upload_key(data, "dictation")
+        assert upload_key(data, None, "accurate") != upload_key(data)
+
+
+class TestSTTCache:
+    """Test STTCache"""
+
+    def test_hit_and_miss(self):
+        cache = STTCache(4, ttl=60)
+        assert cache.get("a") is None
+        cache.put("a", "lights off")
+        assert cache.get("a") == "lights off"
+        assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_ttl(self):
+        cache = STTCache(4, ttl=10)
+        cache.put("a", "hi", now=100.0)
+        assert cache.get("a", now=109.0) == "hi"
+        assert cache.get("a", now=111.0) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_bound(self):
+        cache = STTCache(2, ttl=60)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+
+
+class TestDuplicateUpload:
+    """Test /api/stt serves a resent recording from the cache"""
+
+    def test_second_upload_skips_whisper(self):
+        np = pytest.importorskip("numpy")
+        fastapi = pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+        from server import audio_codec
+        from server.routers import speech
+        from server.stt_cache import stt_cache
+        if not audio_codec.AV_AVAILABLE:
+            pytest.skip("PyAV not installed")
+
+        wav = audio_codec.pcm_to_wav(0.5 * np.sin(np.arange(8000) / 3), 16000)
+        model = MagicMock()
+        model.transcribe.return_value = ([MagicMock(text=" hello again")], MagicMock())
+        app = fastapi.FastAPI()
+        app.include_router(speech.router)
+        stt_cache.clear()
+        with patch("server.stt.get_whisper_model", return_value=model), \
+             patch("server.stt_batcher.STT_BATCHING", False):
+            client = TestClient(app)
+            first = client.post("/api/stt", files={"audio": ("a.wav", wav, "audio/wav")}).json()
+            second = client.post("/api/stt", files={"audio": ("b.wav", wav, "audio/wav")}).json()
+        stt_cache.clear()
+        assert first == second
+        assert second["transcript"] == "hello again"
+        assert model.transcribe.call_count == 1
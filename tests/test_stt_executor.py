@@ -0,0 +1,102 @@
+"""
+STT executor tests
+Tests that transcription runs off the event loop and stops when the client leaves
+"""
+import pytest
+import os
+import sys
+import time
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("fastapi")
+
+from server import stt
+from server.routers import speech
+
+
+class FakeRequest:
+    def __init__(self, disconnect_after: float):
+        self.deadline = time.monotonic() + disconnect_after
+
+    async def is_disconnected(self):
+        return time.monotonic() > self.deadline
+
+
+class TestRunSTT:
+    """Test the executor wrapper"""
+
+    def test_result_returned(self):
+        def job(x, cancel):
+            return x * 2
+        assert asyncio.run(speech._run_stt(FakeRequest(10), job, 21)) == 42
+
+    def test_runs_on_stt_threads(self):
+        def job(cancel):
+            return threading.current_thread().name
+        assert asyncio.run(speech._run_stt(FakeRequest(10), job)).startswith("orion-stt")
+
+    def test_event_loop_stays_responsive(self):
+        def slow(cancel):
+            time.sleep(0.5)
+            return "done"
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.05)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            result = await speech._run_stt(FakeRequest(10), slow)
+            task.cancel()
+            return result, ticks
+
+        result, ticks = asyncio.run(main())
+        assert result == "done"
+        assert ticks >= 5
+
+    def test_disconnect_sets_cancel(self):
+        seen = threading.Event()
+
+        def job(cancel):
+            cancel.wait(5)
+            seen.set()
+            raise stt.TranscriptionCancelled()
+
+        with patch("server.routers.speech.DISCONNECT_POLL_SECONDS", 0.05):
+            with pytest.raises(stt.TranscriptionCancelled):
+                asyncio.run(speech._run_stt(FakeRequest(0.1), job))
+        assert seen.wait(2)
+
+
+class TestTranscribeCancel:
+    """Test decoding stops between segments"""
+
+    def test_cancel_between_segments(self):
+        cancel = threading.Event()
+        consumed = []
+
+        def segments():
+            for i in range(10):
+                consumed.append(i)
+                if i == 2:
+                    cancel.set()
+                yield SimpleNamespace(text=f" s{i}")
+
+        model = MagicMock()
+        model.transcribe.return_value = (segments(), SimpleNamespace(language="en"))
+        with patch("server.stt.get_whisper_model", return_value=model), \
+             patch("server.stt_batcher.STT_BATCHING", False):
+            with pytest.raises(stt.TranscriptionCancelled):
+                stt.transcribe(np.zeros(16000 * 40, dtype=np.float32), "dictation", cancel)
+        assert consumed == [0, 1, 2]
@@ -0,0 +1,100 @@
+"""
+Whisper model pool tests
+Tests routing clips to pool models by length, load and accuracy hint
+"""
+import pytest
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import stt
+
+POOL = ["tiny.en", "base.en", "small.en"]
+
+
+@pytest.fixture
+def pool():
+    with patch("server.stt.WHISPER_MODELS", POOL), \
+         patch("server.stt._load_locks", {name: stt.threading.Lock() for name in POOL}), \
+         patch("server.stt.whisper_models", {}):
+        yield
+
+
+class TestRouting:
+    """Test route_model"""
+
+    def test_single_model_always_used(self):
+        with patch("server.stt.WHISPER_MODELS", ["base"]):
+            assert stt.route_model(120.0, "accurate") == "base"
+
+    def test_by_duration(self, pool):
+        assert stt.route_model(2.0, in_flight=0) == "tiny.en"
+        assert stt.route_model(20.0, in_flight=0) == "base.en"
+        assert stt.route_model(60.0, in_flight=0) == "small.en"
+
+    def test_busy_steps_down(self, pool):
+        busy = stt.BUSY_TRANSCRIPTIONS
+        assert stt.route_model(60.0, in_flight=busy) == "base.en"
+        assert stt.route_model(2.0, in_flight=busy) == "tiny.en"
+
+    def test_accuracy_hint(self, pool):
+        assert stt.route_model(60.0, "fast", in_flight=0) == "tiny.en"
+        assert stt.route_model(2.0, "accurate", in_flight=0) == "small.en"
+        assert stt.route_model(2.0, "balanced", in_flight=0) == "tiny.en"
+
+
+class TestPool:
+    """Test per-model loading and transcription routing"""
+
+    def test_unknown_name_loads_default(self, pool):
+        with patch("server.stt.FASTER_WHISPER_AVAILABLE", False):
+            assert stt.get_whisper_model("large-v3") is None
+
+    def test_models_load_once_each(self, pool):
+        fake = MagicMock()
+        faster_whisper = MagicMock(WhisperModel=fake)
+        with patch.dict(sys.modules, {"faster_whisper": faster_whisper}), \
+             patch("server.stt.FASTER_WHISPER_AVAILABLE", True), \
+             patch("server.stt.WHISPER_DEVICE", "cpu"), \
+             patch("server.stt.WHISPER_COMPUTE_TYPE", "int8"):
+            stt.get_whisper_model("tiny.en")
+            stt.get_whisper_model("tiny.en")
+            stt.get_whisper_model("small.en")
+        assert [c.args[0] for c in fake.call_args_list] == ["tiny.en", "small.en"]
+        assert set(stt.whisper_models) == {"tiny.en", "small.en"}
+
+    def test_transcribe_uses_routed_model(self, pool):
+        np = pytest.importorskip("numpy")
+        models = {name: MagicMock(name=name) for name in POOL}
+        for model in models.values():
+            model.transcribe.return_value = (iter([MagicMock(text=" ok")]), MagicMock())
+        with patch("server.stt.get_whisper_model", side_effect=models.get), \
+             patch("server.stt_batcher.STT_BATCHING", False):
+            stt.transcribe(np.zeros(16000 * 40, dtype=np.float32))
+            stt.transcribe(np.zeros(16000, dtype=np.float32), accuracy="accurate")
+        assert models["small.en"].transcribe.call_count == 2
+        assert not models["tiny.en"].transcribe.called
+
+
+class TestAPIRouting:
+    """Test /api/stt loads the routed model rather than the default one"""
+
+    def test_routed_model_loaded(self, pool):
+        np = pytest.importorskip("numpy")
+        fastapi = pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+        from server.routers import speech
+
+        model = MagicMock()
+        model.transcribe.return_value = (iter([MagicMock(text=" ok")]), MagicMock())
+        tone = (0.3 * np.sin(np.arange(16000 * 2) / 5) * 32767).astype("<i2").tobytes()
+        app = fastapi.FastAPI()
+        app.include_router(speech.router)
+        with patch("server.stt.get_whisper_model", return_value=model) as loader, \
+             patch("server.stt_batcher.STT_BATCHING", False):
+            r = TestClient(app).post("/api/stt/pcm?accuracy=accurate", content=tone)
+        assert r.json()["transcript"] == "ok"
+        assert {c.args[0] for c in loader.call_args_list} == {"small.en"}
@@ -0,0 +1,104 @@
+"""
+STT decoding profile tests
+Tests automatic profile selection and benchmarks profiles on tests/stt_corpus.txt
+"""
+import pytest
+import os
+import re
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import audio_codec, stt, tts
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stt_corpus.txt")
+
+
+def load_corpus():
+    with open(CORPUS_FILE, encoding="utf-8") as f:
+        return [tuple(line.strip().split("|", 1)) for line in f if line.strip() and not line.startswith("#")]
+
+
+def words(text):
+    return re.sub(r"[^a-z0-9' ]", " ", text.lower()).split()
+
+
+def word_error_rate(reference, hypothesis):
+    ref, hyp = words(reference), words(hypothesis)
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1] / max(1, len(ref))
+
+
+class TestProfileSelection:
+    """Test choose_profile"""
+
+    def test_short_clip_is_command(self):
+        assert stt.choose_profile(2.0, in_flight=0) == "command"
+
+    def test_long_clip_is_dictation(self):
+        assert stt.choose_profile(40.0, in_flight=0) == "dictation"
+
+    def test_long_clip_under_load_is_fast(self):
+        assert stt.choose_profile(40.0, in_flight=stt.BUSY_TRANSCRIPTIONS) == "fast"
+
+    def test_env_override(self):
+        with patch("server.stt.STT_PROFILE", "dictation"):
+            assert stt.choose_profile(1.0) == "dictation"
+
+    def test_options_passed_to_whisper(self):
+        np = pytest.importorskip("numpy")
+        model = MagicMock()
+        model.transcribe.return_value = (iter([MagicMock(text=" lights off")]), MagicMock())
+        with patch("server.stt.get_whisper_model", return_value=model):
+            text, _, profile = stt.transcribe(np.zeros(16000, dtype=np.float32))
+        assert (text, profile) == ("lights off", "command")
+        kwargs = model.transcribe.call_args.kwargs
+        assert kwargs["beam_size"] == 1
+        assert kwargs["without_timestamps"] is True
+        assert kwargs["vad_filter"] is True
+        assert stt._in_flight == 0
+
+    def test_wer(self):
+        assert word_error_rate("turn off the lights", "Turn off the lights.") == 0
+        assert word_error_rate("turn off the lights", "turn of lights") == 0.5
+
+
+@pytest.mark.skipif(not (stt.FASTER_WHISPER_AVAILABLE and tts.COQUI_AVAILABLE),
+                    reason="needs faster-whisper and Coqui TTS")
+class TestProfileBenchmark:
+    """Latency / WER of each profile on the synthetic corpus (run with -s to see the table)"""
+
+    @pytest.fixture(scope="class")
+    def corpus(self):
+        model = tts.get_tts_model()
+        clips = []
+        for kind, text in load_corpus():
+            wav, rate = tts.synthesize_pcm(model, text)
+            samples = audio_codec.decode_to_pcm(audio_codec.pcm_to_wav(wav, rate, peak_normalize=True))
+            clips.append((kind, text, samples))
+        return clips
+
+    def test_benchmark_profiles(self, corpus):
+        stt.get_whisper_model()
+        print(f"\n{'profile':<10} {'clips':<10} {'latency ms':>10} {'RTF':>6} {'WER':>6}")
+        for profile in ["command", "fast", "dictation", "auto"]:
+            for kind in ["command", "dictation"]:
+                clips = [c for c in corpus if c[0] == kind]
+                latency = audio = errors = 0.0
+                for _, text, samples in clips:
+                    start = time.perf_counter()
+                    hypothesis, _, _ = stt.transcribe(samples, None if profile == "auto" else profile)
+                    latency += time.perf_counter() - start
+                    audio += len(samples) / 16000
+                    errors += word_error_rate(text, hypothesis)
+                wer = errors / len(clips)
+                print(f"{profile:<10} {kind:<10} {latency / len(clips) * 1000:>10.0f} "
+                      f"{latency / audio:>6.2f} {wer:>6.2f}")
+                assert wer < 0.5
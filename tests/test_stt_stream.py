@@ -0,0 +1,124 @@
+"""
+Streaming STT tests
+Tests VAD segmentation and the /ws/stt WebSocket protocol
+"""
+import pytest
+import os
+import sys
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+fastapi = pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from server import stt_stream
+from server.routers import speech
+
+RATE = stt_stream.SAMPLE_RATE
+
+
+def tone(ms, amplitude=0.3):
+    t = np.arange(RATE * ms // 1000) / RATE
+    return (amplitude * np.sin(2 * np.pi * 300 * t)).astype(np.float32)
+
+
+def silence(ms):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(RATE * ms // 1000) * 0.001).astype(np.float32)
+
+
+class TestSegmenter:
+    """Test utterance cutting"""
+
+    def test_speech_then_silence_gives_partials_and_final(self):
+        seg = stt_stream.UtteranceSegmenter(partial_interval_ms=300, end_silence_ms=300)
+        events = seg.feed(silence(300))
+        events += seg.feed(tone(1000))
+        events += seg.feed(silence(400))
+
+        kinds = [kind for kind, _ in events]
+        assert kinds[-1] == "final"
+        assert kinds.count("partial") >= 2
+        final_audio = events[-1][1]
+        # preroll + speech + trailing silence up to the cut
+        assert 1.0 <= len(final_audio) / RATE <= 1.7
+        assert not seg.in_speech
+
+    def test_final_within_end_silence(self):
+        seg = stt_stream.UtteranceSegmenter(end_silence_ms=300)
+        seg.feed(tone(600))
+        assert seg.feed(silence(240)) == []
+        assert [k for k, _ in seg.feed(silence(90))] == ["final"]
+
+    def test_clicks_are_ignored(self):
+        seg = stt_stream.UtteranceSegmenter()
+        events = seg.feed(np.concatenate([silence(300), tone(30), silence(600)]))
+        assert events == []
+
+    def test_flush_finalizes_open_utterance(self):
+        seg = stt_stream.UtteranceSegmenter(partial_interval_ms=10_000)
+        assert seg.feed(tone(500)) == []
+        kind, audio = seg.flush()
+        assert kind == "final"
+        assert seg.flush() is None
+
+    def test_odd_sized_frames(self):
+        seg = stt_stream.UtteranceSegmenter(end_silence_ms=300)
+        audio = np.concatenate([tone(700), silence(500)])
+        events = []
+        for start in range(0, len(audio), 1234):
+            events += seg.feed(audio[start:start + 1234])
+        assert events[-1][0] == "final"
+
+
+class TestConversions:
+    """Test client frame decoding"""
+
+    def test_pcm16(self):
+        data = np.array([0, 16384, -32768], dtype="<i2").tobytes()
+        assert stt_stream.pcm_from_bytes(data).tolist() == [0.0, 0.5, -1.0]
+
+    def test_resample_48k(self):
+        assert len(stt_stream.resample(np.zeros(4800, dtype=np.float32), 48000)) == 1600
+
+
+class TestWebSocket:
+    """Test the /ws/stt protocol with transcription mocked"""
+
+    def test_partial_and_final_messages(self):
+        app = fastapi.FastAPI()
+        app.include_router(speech.router)
+
+        def transcribe(audio, final=True):
+            return "turn on the lights" if final else "turn on"
+
+        with patch("server.stt.get_whisper_model", return_value=object()), \
+             patch("server.stt.transcribe_pcm", side_effect=transcribe):
+            with TestClient(app).websocket_connect("/ws/stt?sample_rate=16000") as ws:
+                assert ws.receive_json()["type"] == "ready"
+                audio = np.concatenate([tone(1500), silence(400)])
+                pcm = (audio * 32767).astype("<i2")
+                for start in range(0, len(pcm), 640):
+                    ws.send_bytes(pcm[start:start + 640].tobytes())
+                messages = []
+                while True:
+                    msg = ws.receive_json()
+                    messages.append(msg)
+                    if msg["type"] == "final":
+                        break
+                ws.send_json({"type": "end"})
+                assert ws.receive_json() == {"type": "end"}
+
+        assert messages[-1]["text"] == "turn on the lights"
+        assert messages[-1]["segment"] == 0
+        assert all(m["type"] == "partial" and m["text"] == "turn on" for m in messages[:-1])
+
+    def test_unavailable_model(self):
+        app = fastapi.FastAPI()
+        app.include_router(speech.router)
+        with patch("server.stt.get_whisper_model", return_value=None):
+            with TestClient(app).websocket_connect("/ws/stt") as ws:
+                assert ws.receive_json()["type"] == "error"
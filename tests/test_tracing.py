@@ -0,0 +1,124 @@
+"""
+Tracing tests
+Tests spans, context propagation and the Server-Timing header
+"""
+import pytest
+import os
+import sys
+import json
+import time
+import asyncio
+import concurrent.futures
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import tracing
+
+
+class TestSpans:
+    """Test span recording"""
+
+    def test_span_is_noop_without_trace(self):
+        assert tracing.span("anything") is tracing._NOOP
+
+    def test_nested_spans_record_parent(self):
+        trace = tracing.Trace(name="test")
+        token = tracing._current_trace.set(trace)
+        try:
+            with tracing.span("tts") as outer:
+                with tracing.span("tts.synthesize"):
+                    pass
+        finally:
+            tracing._current_trace.reset(token)
+
+        inner, parent = trace.spans
+        assert inner["name"] == "tts.synthesize"
+        assert inner["parent"] == outer.span_id
+        assert parent["parent"] is None
+
+    def test_span_records_errors(self):
+        trace = tracing.Trace()
+        token = tracing._current_trace.set(trace)
+        try:
+            with pytest.raises(ValueError):
+                with tracing.span("stt.decode"):
+                    raise ValueError("bad audio")
+        finally:
+            tracing._current_trace.reset(token)
+        assert trace.spans[0]["error"] == "ValueError"
+
+    def test_server_timing_header(self):
+        trace = tracing.Trace()
+        trace.spans.append({"name": "llm", "ms": 12.5})
+        trace.finish()
+        header = trace.server_timing()
+        assert header.startswith("llm;dur=12.5, total;dur=")
+
+
+class TestExecutorPropagation:
+    """Spans opened on worker threads belong to the request trace"""
+
+    def test_run_in_executor_keeps_trace(self):
+        def work():
+            with tracing.span("worker"):
+                return 42
+
+        async def main():
+            trace = tracing.Trace()
+            tracing._current_trace.set(trace)
+            loop = asyncio.get_running_loop()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                result = await tracing.run_in_executor(loop, executor, work)
+            return result, trace
+
+        result, trace = asyncio.run(main())
+        assert result == 42
+        assert [s["name"] for s in trace.spans] == ["worker"]
+
+
+class TestMiddleware:
+    """Test the HTTP middleware"""
+
+    @pytest.fixture
+    def client(self):
+        fastapi = pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+
+        app = fastapi.FastAPI()
+        app.middleware("http")(tracing.http_middleware)
+
+        @app.get("/work")
+        async def work():
+            with tracing.span("stage"):
+                pass
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_server_timing_and_trace_id(self, client):
+        r = client.get("/work", headers={"X-Trace-Id": "abc123"})
+        assert r.headers["X-Trace-Id"] == "abc123"
+        assert "stage;dur=" in r.headers["Server-Timing"]
+        assert "total;dur=" in r.headers["Server-Timing"]
+
+    def test_disabled_tracing_adds_no_headers(self, client):
+        with patch.object(tracing, "TRACING_ENABLED", False):
+            r = client.get("/work")
+        assert "Server-Timing" not in r.headers
+
+    def test_jsonl_span_log(self, client, tmp_path):
+        log_path = tmp_path / "traces.jsonl"
+        with patch.object(tracing, "TRACE_LOG_ENABLED", True), \
+             patch.object(tracing, "TRACE_LOG_PATH", log_path):
+            client.get("/work")
+            # writer thread runs in the background
+            for _ in range(100):
+                if log_path.exists() and log_path.read_text():
+                    break
+                time.sleep(0.01)
+
+        record = json.loads(log_path.read_text().splitlines()[0])
+        assert record["name"] == "GET /work"
+        assert record["spans"][0]["name"] == "stage"
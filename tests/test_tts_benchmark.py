@@ -0,0 +1,96 @@
+"""
+TTS synthesis benchmark
+Compares the in-memory synthesis path with the old temp-file round trip
+"""
+import pytest
+import os
+import sys
+import time
+import wave
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from server import audio_codec, tts
+
+SAMPLE_RATE = 22050
+ITERATIONS = 50
+# wall-clock comparisons are noisy on shared CI machines; run them on demand
+BENCHMARKS = os.getenv("ORION_BENCHMARKS", "false").lower() == "true"
+
+
+class FakeSynthesizer:
+    output_sample_rate = SAMPLE_RATE
+
+
+class FakeCoqui:
+    """Stands in for TTS.api.TTS: ~3s of audio per call, no model compute"""
+
+    synthesizer = FakeSynthesizer()
+
+    def __init__(self):
+        t = np.arange(3 * SAMPLE_RATE) / SAMPLE_RATE
+        self.wav = (0.4 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    def tts(self, text, speaker=None):
+        return list(self.wav)
+
+    def tts_to_file(self, text, file_path, speaker=None):
+        # Same steps as Coqui's save_wav: peak-normalize, truncate to int16, write
+        wav = np.array(self.tts(text, speaker))
+        wav_norm = (wav * (32767 / max(0.01, np.max(np.abs(wav))))).astype(np.int16)
+        with wave.open(file_path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(SAMPLE_RATE)
+            f.writeframes(wav_norm.tobytes())
+        return file_path
+
+
+def _bench(fn):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn()
+    return (time.perf_counter() - start) / ITERATIONS * 1000
+
+
+class TestSynthesisPaths:
+    """Benchmark in-memory vs temp-file synthesis"""
+
+    def test_in_memory_matches_file_output(self):
+        model = FakeCoqui()
+        samples, rate = tts.synthesize_pcm(model, "hello")
+        in_memory = audio_codec.pcm_to_wav(samples, rate, peak_normalize=True)
+        from_file = tts.synthesize_file(model, "hello")
+
+        mem_pcm, mem_rate = audio_codec.wav_to_pcm(in_memory)
+        file_pcm, file_rate = audio_codec.wav_to_pcm(from_file)
+        assert mem_rate == file_rate == SAMPLE_RATE
+        # float32 vs float64 scaling may differ by one LSB
+        assert np.abs(mem_pcm.astype(int) - file_pcm.astype(int)).max() <= 1
+
+    @pytest.mark.skipif(not BENCHMARKS, reason="benchmark; set ORION_BENCHMARKS=true to run")
+    def test_benchmark_in_memory_vs_temp_file(self):
+        model = FakeCoqui()
+
+        def in_memory():
+            samples, rate = tts.synthesize_pcm(model, "hello")
+            return audio_codec.pcm_to_wav(samples, rate, peak_normalize=True)
+
+        memory_ms = _bench(in_memory)
+        file_ms = _bench(lambda: tts.synthesize_file(model, "hello"))
+        print(f"\nTTS in-memory: {memory_ms:.2f}ms/utterance, temp file: {file_ms:.2f}ms/utterance")
+        assert memory_ms < file_ms * 1.5
+
+    def test_synthesize_sync_never_writes_temp_files(self):
+        with patch("server.tts.get_tts_model", return_value=FakeCoqui()), \
+             patch("server.tts.AUDIO_LIBS_AVAILABLE", True), \
+             patch("server.tts.TTS_CACHE_ENABLED", False), \
+             patch("tempfile.NamedTemporaryFile", side_effect=AssertionError("temp file used")):
+            audio_bytes, audio_format = tts.synthesize_sync("hello")
+        assert audio_format == "wav"
+        assert audio_bytes[:4] == b"RIFF"
@@ -0,0 +1,97 @@
+"""
+TTS audio cache tests
+Tests keying, the memory/disk tiers and cache use in synthesize_sync
+"""
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import metrics, tts
+from server.tts_cache import TTSCache, cache_key
+
+
+class TestCacheKey:
+    """Test what the key covers"""
+
+    def test_whitespace_is_normalized(self):
+        assert cache_key("m", None, None, "Hello   there \n", "wav", None) == \
+            cache_key("m", None, None, "Hello there", "wav", None)
+
+    def test_voice_speed_and_format_matter(self):
+        base = cache_key("m", "p225", 1.0, "hi", "wav", None)
+        assert base != cache_key("m", "p226", 1.0, "hi", "wav", None)
+        assert base != cache_key("m", "p225", 1.2, "hi", "wav", None)
+        assert base != cache_key("m", "p225", 1.0, "hi", "opus", 32000)
+        assert base == cache_key("m", "p225", None, "hi", "wav", None)
+
+
+class TestTiers:
+    """Test memory LRU and disk tier"""
+
+    def test_memory_lru_by_bytes(self, tmp_path):
+        cache = TTSCache(memory_max_bytes=10, directory=tmp_path, disk_max_bytes=0)
+        cache.put("a", b"12345", "wav")
+        cache.put("b", b"12345", "wav")
+        cache.get("a")
+        cache.put("c", b"12345", "wav")
+
+        assert cache.get("a") == (b"12345", "wav")
+        assert cache.get("b") is None
+        assert cache.stats()["memory_bytes"] == 10
+
+    def test_disk_hit_after_memory_eviction(self, tmp_path):
+        cache = TTSCache(memory_max_bytes=4, directory=tmp_path, disk_max_bytes=1024)
+        cache.put("aa11", b"1234", "opus")
+        cache.put("bb22", b"5678", "opus")
+
+        assert cache.get("aa11") == (b"1234", "opus")
+        assert cache.hits == {"memory": 0, "disk": 1}
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        TTSCache(directory=tmp_path).put("cc33", b"audio", "mp3")
+        assert TTSCache(directory=tmp_path).get("cc33") == (b"audio", "mp3")
+
+    def test_disk_eviction_drops_least_recently_used(self, tmp_path):
+        cache = TTSCache(memory_max_bytes=0, directory=tmp_path, disk_max_bytes=25)
+        cache.put("k1", b"x" * 10, "wav")
+        old = time.time() - 100
+        os.utime(tmp_path / "k1" / "k1.wav", (old, old))
+        cache.put("k2", b"x" * 10, "wav")
+        cache.put("k3", b"x" * 10, "wav")
+
+        assert cache.get("k1") is None
+        assert cache.get("k3") is not None
+        assert cache.stats()["disk_bytes"] <= 25
+
+    def test_hit_ratio(self, tmp_path):
+        cache = TTSCache(directory=tmp_path, disk_max_bytes=0)
+        cache.put("k", b"x", "wav")
+        cache.get("k")
+        cache.get("missing")
+        assert cache.hit_ratio() == 0.5
+
+
+class TestSynthesizeUsesCache:
+    """Test synthesize_sync skips the model on repeated phrases"""
+
+    def test_second_call_is_cached(self, tmp_path):
+        model = MagicMock()
+        model.tts.return_value = [0.0, 0.5, -0.5] * 100
+        model.synthesizer.output_sample_rate = 22050
+        cache = TTSCache(directory=tmp_path)
+
+        with patch("server.tts.get_tts_model", return_value=model) as get_model, \
+             patch("server.tts.AUDIO_LIBS_AVAILABLE", True), \
+             patch("server.tts.TTS_CACHE_ENABLED", True), \
+             patch("server.tts.tts_cache", cache):
+            first = tts.synthesize_sync("Hello there", "m")
+            second = tts.synthesize_sync("Hello  there", "m")
+
+        assert first == second
+        assert model.tts.call_count == 1
+        assert get_model.call_count == 1
+        assert 'orion_tts_cache_hit_ratio' in metrics.render()
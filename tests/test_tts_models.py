@@ -0,0 +1,136 @@
+"""
+TTS model cache tests
+Tests LRU/byte-bounded eviction, pinning, idle unload and single-flight loads
+"""
+import pytest
+import os
+import sys
+import time
+import threading
+from unittest.mock import Mock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import tts
+
+DEFAULT = tts.COQUI_TTS_MODEL
+
+
+@pytest.fixture
+def models():
+    """Fake loader; every load returns a new Mock and is recorded"""
+    loaded = []
+
+    def load(name):
+        loaded.append(name)
+        return Mock(name=name)
+
+    tts.tts_model_cache.clear()
+    tts._model_bytes.clear()
+    tts._last_used.clear()
+    with patch("server.tts.COQUI_AVAILABLE", True), \
+         patch("server.tts._load_model", side_effect=load), \
+         patch("server.tts.measure_model_bytes", return_value=100), \
+         patch("server.tts._ensure_reaper"), \
+         patch("server.tts.TTS_MAX_MODELS", 2), \
+         patch("server.tts.TTS_MAX_MODEL_BYTES", 0):
+        yield loaded
+    tts.tts_model_cache.clear()
+    tts._model_bytes.clear()
+    tts._last_used.clear()
+    tts.tts_model = None
+
+
+class TestEviction:
+    """Test count/byte bounds and pinning"""
+
+    def test_lru_voice_evicted_at_count_cap(self, models):
+        tts.get_tts_model("a")
+        tts.get_tts_model("b")
+        tts.get_tts_model("a")
+        tts.get_tts_model("c")
+        assert list(tts.tts_model_cache) == ["a", "c"]
+
+    def test_pinned_default_never_evicted(self, models):
+        tts.get_tts_model(DEFAULT)
+        for name in ["a", "b", "c"]:
+            tts.get_tts_model(name)
+        assert DEFAULT in tts.tts_model_cache
+        assert tts.tts_model is tts.tts_model_cache[DEFAULT]
+        assert len(tts.tts_model_cache) == 2
+
+    def test_byte_cap(self, models):
+        with patch("server.tts.TTS_MAX_MODELS", 10), patch("server.tts.TTS_MAX_MODEL_BYTES", 250):
+            for name in ["a", "b", "c"]:
+                tts.get_tts_model(name)
+        assert list(tts.tts_model_cache) == ["b", "c"]
+
+    def test_evicted_voice_reloads(self, models):
+        for name in ["a", "b", "c", "a"]:
+            tts.get_tts_model(name)
+        assert models == ["a", "b", "c", "a"]
+
+
+class TestIdleUnload:
+    """Test idle-time unloading"""
+
+    def test_idle_models_unloaded(self, models):
+        tts.get_tts_model(DEFAULT)
+        tts.get_tts_model("a")
+        with patch("server.tts.TTS_MODEL_IDLE_SECONDS", 60):
+            unloaded = tts.unload_idle(now=time.monotonic() + 120)
+        assert unloaded == ["a"]
+        assert list(tts.tts_model_cache) == [DEFAULT]
+
+    def test_recent_models_kept(self, models):
+        tts.get_tts_model("a")
+        with patch("server.tts.TTS_MODEL_IDLE_SECONDS", 60):
+            assert tts.unload_idle() == []
+
+
+class TestLoadSize:
+    """Test model sizes when measuring falls back to RSS"""
+
+    def test_loads_without_rss(self, models):
+        with patch("server.tts.measure_model_bytes", return_value=0), \
+             patch("server.metrics.PROCESS_RSS_BYTES.get", side_effect=OSError("no /proc")):
+            assert tts.get_tts_model("a") is not None
+        assert tts._model_bytes["a"] == 0
+
+    def test_rss_delta_when_unmeasured(self, models):
+        with patch("server.tts.measure_model_bytes", return_value=0), \
+             patch("server.metrics.PROCESS_RSS_BYTES.get", side_effect=[1000, 1500]):
+            tts.get_tts_model("a")
+        assert tts._model_bytes["a"] == 500
+
+    def test_rss_unused_when_measured(self, models):
+        with patch("server.metrics.PROCESS_RSS_BYTES.get", side_effect=[1000, 5000]):
+            tts.get_tts_model("a")
+        assert tts._model_bytes["a"] == 100
+
+
+class TestSingleFlight:
+    """Test concurrent requests for one voice"""
+
+    def test_concurrent_requests_load_once(self, models):
+        gate = threading.Event()
+
+        def slow_load(name):
+            gate.wait(1)
+            models.append(name)
+            return Mock()
+
+        results = []
+        with patch("server.tts._load_model", side_effect=slow_load):
+            threads = [threading.Thread(target=lambda: results.append(tts.get_tts_model("a"))) for _ in range(4)]
+            for t in threads:
+                t.start()
+            time.sleep(0.05)
+            gate.set()
+            for t in threads:
+                t.join()
+
+        assert models == ["a"]
+        assert len({id(r) for r in results}) == 1
+        assert tts._load_locks == {}
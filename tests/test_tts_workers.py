@@ -0,0 +1,108 @@
+"""
+TTS worker pool tests
+Tests core planning, the worker loop and shared-memory PCM hand-off
+"""
+import pytest
+import os
+import sys
+import textwrap
+import threading
+import subprocess
+from unittest.mock import Mock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from server import tts, tts_workers
+
+
+def fake_model():
+    model = Mock()
+    model.tts.return_value = [0.0, 0.25, -0.5, 0.5] * 1000
+    model.synthesizer.output_sample_rate = 16000
+    return model
+
+
+class ThreadPool(tts_workers.TTSWorkerPool):
+    """Pool whose 'processes' are threads running the real worker loop"""
+
+    def _spawn(self, index):
+        worker = threading.Thread(
+            target=tts_workers._worker_main,
+            args=(index, None, self.preload, self._jobs, self._results),
+            daemon=True,
+        )
+        worker.start()
+        return worker
+
+
+class TestCorePlan:
+    """Test splitting cores between workers"""
+
+    def test_even_split(self):
+        assert tts_workers.plan_cores(2, cores=range(8)) == [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+    def test_explicit_share(self):
+        assert tts_workers.plan_cores(2, 1, cores=[2, 3, 4]) == [[2], [3]]
+
+    def test_more_workers_than_cores(self):
+        assert tts_workers.plan_cores(3, cores=[0, 1]) == [[0], [1], [0]]
+
+
+class TestWorkerPool:
+    """Test jobs through the worker loop and shared memory"""
+
+    @pytest.fixture
+    def pool(self):
+        with patch("server.tts.get_tts_model", return_value=fake_model()):
+            pool = ThreadPool(2, preload="m")
+            yield pool
+            pool.shutdown()
+
+    def test_pcm_returned_through_shared_memory(self, pool):
+        assert pool.wait_ready(5)
+        with pool.synthesize("hello", "m", timeout=5) as pcm:
+            assert pcm.samples.dtype == np.int16
+            assert pcm.samples.shape == (1, 4000)
+            assert pcm.samples.max() == 32767  # peak-normalized in the worker
+            assert pcm.sample_rate == 16000
+        assert pcm.samples is None
+
+    def test_worker_errors_raise(self, pool):
+        with patch("server.tts.get_tts_model", return_value=None):
+            with pytest.raises(RuntimeError, match="failed to load"):
+                pool.synthesize("hello", "missing", timeout=5)
+
+    def test_synthesize_sync_uses_pool(self, pool):
+        with patch("server.tts_workers.get_pool", return_value=pool), \
+             patch("server.tts.AUDIO_LIBS_AVAILABLE", True), \
+             patch("server.tts.TTS_CACHE_ENABLED", False):
+            audio_bytes, audio_format = tts.synthesize_sync("hello", "m")
+        assert audio_format == "wav"
+        assert audio_bytes[:4] == b"RIFF"
+        assert pool.pending() == 0
+
+
+class TestSpawn:
+    """Test real worker processes don't re-run the entry script"""
+
+    def test_entry_script_side_effects_run_once(self, tmp_path):
+        marker = tmp_path / "imports.txt"
+        script = tmp_path / "entry.py"
+        script.write_text(textwrap.dedent(f"""
+            import sys
+            sys.path.insert(0, {os.path.dirname(os.path.dirname(os.path.abspath(__file__)))!r})
+            with open({str(marker)!r}, "a") as f:
+                f.write("imported\\n")  # stands in for create_app() at module level
+
+            from server import tts_workers
+
+            if __name__ == "__main__":
+                pool = tts_workers.TTSWorkerPool(2)
+                assert pool.wait_ready(60)
+                pool.shutdown()
+        """))
+        subprocess.run([sys.executable, str(script)], check=True, timeout=120)
+        assert marker.read_text().splitlines() == ["imported"]
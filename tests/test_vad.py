@@ -0,0 +1,143 @@
+"""
+Voice activity detection tests
+Tests the vectorized VAD on synthetic signals and silence trimming before /api/stt
+"""
+import pytest
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from server import vad
+
+RATE = vad.SAMPLE_RATE
+
+
+def silence(seconds, noise=0.001, seed=0):
+    return (np.random.default_rng(seed).standard_normal(int(seconds * RATE)) * noise).astype(np.float32)
+
+
+def voiced(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * RATE)) / RATE
+    # 150 Hz fundamental with a few harmonics, roughly vowel-like
+    wave = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 5))
+    return (amplitude * wave / np.abs(wave).max()).astype(np.float32)
+
+
+class TestFeatures:
+    """Test frame energy and zero-crossing rate"""
+
+    def test_rms_of_sine(self):
+        rms, _ = vad.frame_features(np.sin(np.arange(8000) / 4).astype(np.float32))
+        assert np.allclose(rms, 1 / np.sqrt(2), atol=0.02)
+
+    def test_zcr_tracks_frequency(self):
+        t = np.arange(RATE) / RATE
+        _, low = vad.frame_features(np.sin(2 * np.pi * 200 * t).astype(np.float32))
+        _, high = vad.frame_features(np.sin(2 * np.pi * 3000 * t).astype(np.float32))
+        assert abs(np.median(low) - 400 / RATE) < 0.005
+        assert np.median(high) > 10 * np.median(low)
+
+    def test_short_input(self):
+        rms, zcr = vad.frame_features(np.zeros(10, dtype=np.float32))
+        assert len(rms) == len(zcr) == 1
+
+
+class TestRegions:
+    """Test speech detection and trimming"""
+
+    def test_trim_leading_and_trailing_silence(self):
+        audio = np.concatenate([silence(1.0), voiced(1.0), silence(2.0, seed=1)])
+        trimmed = vad.trim(audio)
+        assert 1.0 <= len(trimmed) / RATE <= 1.0 + (vad.PREROLL_MS + vad.HANGOVER_MS + 60) / 1000
+        start = np.flatnonzero(np.isin(audio, trimmed[:10]))[0]
+        assert 0.85 * RATE <= start <= RATE
+
+    def test_silence_only(self):
+        assert vad.speech_regions(silence(2.0)) == []
+        assert vad.compact(silence(2.0)).size == 0
+
+    def test_quiet_speech_kept(self):
+        # -46 dBFS voice over a near-silent floor (quiet mic, no noise)
+        speech = voiced(1.0)
+        speech *= 10 ** (-46 / 20) / np.sqrt(np.mean(speech ** 2))
+        audio = np.concatenate([silence(1.0, noise=1e-5), speech, silence(1.0, noise=1e-5, seed=1)])
+        compacted = vad.compact(audio)
+        assert 1.0 <= len(compacted) / RATE < 2.0
+
+    def test_click_ignored(self):
+        audio = silence(1.0)
+        audio[8000:8016] = 0.9
+        assert vad.speech_regions(audio) == []
+
+    def test_fricative_kept(self):
+        hiss = (np.random.default_rng(2).standard_normal(int(0.2 * RATE)) * 0.012).astype(np.float32)
+        audio = np.concatenate([silence(0.5), hiss, silence(0.5, seed=3)])
+        regions = vad.speech_regions(audio)
+        assert len(regions) == 1
+        assert regions[0][0] <= 0.5 * RATE < regions[0][1]
+
+    def test_hangover_bridges_short_gap(self):
+        audio = np.concatenate([voiced(0.4), silence(0.1), voiced(0.4)])
+        assert len(vad.speech_regions(audio)) == 1
+
+    def test_pauses_segmented_and_compacted(self):
+        audio = np.concatenate([silence(0.5), voiced(0.5), silence(3.0), voiced(0.5), silence(0.5, seed=4)])
+        assert len(vad.speech_regions(audio)) == 2
+        compacted = vad.compact(audio)
+        # per region: speech + preroll + hangover + one frame + pad on both sides
+        limit = 1.0 + 2 * (vad.PREROLL_MS + vad.HANGOVER_MS + vad.FRAME_MS + vad.HOP_MS + 2 * vad.PAD_MS) / 1000
+        assert 1.0 < len(compacted) / RATE <= limit
+
+    def test_all_speech_returned_unchanged(self):
+        audio = voiced(1.0)
+        assert vad.compact(audio) is audio
+
+    def test_ten_minutes(self):
+        audio = np.concatenate([silence(300.0), voiced(300.0)])
+        started = time.perf_counter()
+        regions = vad.speech_regions(audio)
+        elapsed = time.perf_counter() - started
+        assert len(regions) == 1 and regions[0][1] == len(audio)
+        assert 299.8 * RATE <= regions[0][0] <= 300 * RATE
+        if os.getenv("ORION_BENCHMARKS", "false").lower() == "true":
+            assert elapsed < 2.0
+
+
+class TestSTTTrim:
+    """Test /api/stt hands Whisper trimmed audio"""
+
+    def test_padded_upload_trimmed(self):
+        fastapi = pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+        from server.routers import speech
+
+        audio = np.concatenate([silence(2.0), voiced(1.0), silence(2.0, seed=5)])
+        pcm = (audio * 32767).astype("<i2").tobytes()
+        model = MagicMock()
+        model.transcribe.return_value = ([MagicMock(text=" trimmed")], MagicMock())
+        app = fastapi.FastAPI()
+        app.include_router(speech.router)
+        with patch("server.stt.get_whisper_model", return_value=model), \
+             patch("server.stt_batcher.STT_BATCHING", False):
+            r = TestClient(app).post("/api/stt/pcm", content=pcm)
+        assert r.json()["transcript"] == "trimmed"
+        assert len(model.transcribe.call_args[0][0]) < 2.0 * RATE
+
+    def test_silent_upload_skips_whisper(self):
+        fastapi = pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+        from server.routers import speech
+
+        model = MagicMock()
+        app = fastapi.FastAPI()
+        app.include_router(speech.router)
+        with patch("server.stt.get_whisper_model", return_value=model):
+            r = TestClient(app).post("/api/stt/pcm", content=(silence(2.0) * 32767).astype("<i2").tobytes())
+        assert r.json()["error"] == "No speech detected"
+        assert not model.transcribe.called
@@ -0,0 +1,171 @@
+"""
+Voice conversation tests
+Tests the /ws/voice turn protocol and barge-in with STT, LLM and TTS mocked
+"""
+import pytest
+import os
+import sys
+import json
+import time
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+fastapi = pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from server.routers import voice
+
+RATE = 16000
+
+
+def pcm(audio):
+    return (audio * 32767).astype("<i2").tobytes()
+
+
+def tone(ms):
+    return (0.3 * np.sin(2 * np.pi * 300 * np.arange(RATE * ms // 1000) / RATE)).astype(np.float32)
+
+
+def silence(ms):
+    return (np.random.default_rng(0).standard_normal(RATE * ms // 1000) * 0.001).astype(np.float32)
+
+
+def send_audio(ws, audio):
+    data = pcm(audio)
+    for start in range(0, len(data), 960):
+        ws.send_bytes(data[start:start + 960])
+
+
+def receive_until(ws, done):
+    """Messages (JSON dicts, binary frames as bytes) up to and including the first done(msg)"""
+    messages = []
+    while True:
+        message = ws.receive()
+        msg = message["bytes"] if message.get("bytes") is not None else json.loads(message["text"])
+        messages.append(msg)
+        if isinstance(msg, dict) and done(msg):
+            return messages
+
+
+@pytest.fixture
+def app():
+    app = fastapi.FastAPI()
+    app.include_router(voice.router)
+    synthesize = lambda text, *args: (b"AUDIO:" + text.encode(), "wav")  # noqa: E731
+    with patch("server.stt.get_whisper_model", return_value=object()), \
+         patch("server.stt.transcribe_pcm", side_effect=lambda audio, final=True: "what time is it"), \
+         patch("server.tts.COQUI_AVAILABLE", True), \
+         patch("server.tts.synthesize_sync", side_effect=synthesize):
+        yield app
+
+
+class TestSentences:
+    """Test answer splitting"""
+
+    def test_split(self):
+        assert voice.split_sentences("It is noon. Anything else? ") == ["It is noon.", "Anything else?"]
+
+
+class TestVoiceTurn:
+    """Test one full conversation turn"""
+
+    def test_transcript_answer_and_audio(self, app):
+        answer = {"answer": "It is noon. Anything else?", "agent": "conversational"}
+        with patch("server.routers.voice._answer", return_value=answer):
+            with TestClient(app).websocket_connect("/ws/voice") as ws:
+                assert ws.receive_json()["type"] == "ready"
+                send_audio(ws, np.concatenate([tone(800), silence(400)]))
+                messages = receive_until(ws, lambda m: m["type"] == "done")
+                ws.send_json({"type": "end"})
+                assert ws.receive_json() == {"type": "end"}
+
+        events = [m for m in messages if not (isinstance(m, dict) and m["type"] == "partial")]
+        assert events[0] == {"type": "transcript", "turn": 1, "text": "what time is it"}
+        assert events[1]["type"] == "answer" and events[1]["text"] == answer["answer"]
+        assert events[2] == {"type": "token", "turn": 1, "index": 0, "text": "It is noon."}
+        assert events[3] == {"type": "audio", "turn": 1, "index": 0, "format": "wav"}
+        assert events[4] == b"AUDIO:It is noon."
+        assert events[5]["text"] == "Anything else?"
+        assert events[7] == b"AUDIO:Anything else?"
+        assert events[8] == {"type": "done", "turn": 1}
+
+    def test_unavailable_model(self):
+        app = fastapi.FastAPI()
+        app.include_router(voice.router)
+        with patch("server.stt.get_whisper_model", return_value=None):
+            with TestClient(app).websocket_connect("/ws/voice") as ws:
+                assert ws.receive_json()["type"] == "error"
+
+
+class TestBargeIn:
+    """Test speaking over a reply cancels it"""
+
+    def test_new_speech_cancels_reply(self, app):
+        calls = []
+
+        def answer(text, mode):
+            calls.append(text)
+            if len(calls) == 1:
+                time.sleep(0.5)  # first reply still thinking when the user talks again
+            return {"answer": f"Reply {len(calls)}.", "agent": "conversational"}
+
+        with patch("server.routers.voice._answer", side_effect=answer):
+            with TestClient(app).websocket_connect("/ws/voice") as ws:
+                assert ws.receive_json()["type"] == "ready"
+                send_audio(ws, np.concatenate([tone(800), silence(400)]))
+                first = receive_until(ws, lambda m: m["type"] == "transcript")
+                send_audio(ws, np.concatenate([tone(800), silence(400)]))
+                rest = receive_until(ws, lambda m: m["type"] == "done")
+                ws.send_json({"type": "end"})
+                ws.receive_json()
+
+        messages = [m for m in first + rest if isinstance(m, dict) and m["type"] != "partial"]
+        kinds = [(m["type"], m.get("turn")) for m in messages]
+        assert ("barge_in", 1) in kinds
+        assert ("answer", 1) not in kinds
+        assert kinds[-1] == ("done", 2)
+        assert [m["text"] for m in messages if m["type"] == "answer"] == ["Reply 2."]
+
+
+class TestClose:
+    """Test a closed connection leaves no tasks behind"""
+
+    def test_reply_and_partial_cancelled(self):
+        session = voice.VoiceSession(Mock(), RATE, "pcm16", "hybrid", None, None, "wav", None, None)
+
+        async def run():
+            session.reply = asyncio.create_task(asyncio.sleep(10))
+            session.partial = partial = asyncio.create_task(asyncio.sleep(10))
+            reply = session.reply
+            session.close()
+            await asyncio.gather(reply, partial, return_exceptions=True)
+            return reply, partial
+
+        reply, partial = asyncio.run(run())
+        assert reply.cancelled() and partial.cancelled()
+        assert session.cancel.is_set()
+        assert session.partial is None
+
+
+class TestErrors:
+    """Test failures are reported instead of dropping the connection"""
+
+    def test_loop_error_sent_and_closed(self, app):
+        with patch.object(voice.VoiceSession, "feed", side_effect=RuntimeError("bad frame")):
+            with TestClient(app).websocket_connect("/ws/voice") as ws:
+                assert ws.receive_json()["type"] == "ready"
+                ws.send_bytes(b"\x00" * 960)
+                assert ws.receive_json() == {"type": "error", "error": "bad frame"}
+                closed = ws.receive()
+        assert closed["type"] == "websocket.close" and closed["code"] == 1011
+
+    def test_turn_error_after_socket_gone(self):
+        websocket = Mock(send_json=AsyncMock(side_effect=RuntimeError("socket closed")))
+        session = voice.VoiceSession(websocket, RATE, "pcm16", "hybrid", None, None, "wav", None, None)
+        with patch("server.stt.transcribe_pcm", return_value="hello"):
+            asyncio.run(session.respond(1, np.zeros(RATE, dtype=np.float32), session.cancel))
+        assert websocket.send_json.await_count == 2  # the transcript, then the error report
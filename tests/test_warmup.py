@@ -0,0 +1,82 @@
+"""
+Warmup and readiness tests
+Tests the per-model readiness reported at /readyz
+"""
+import pytest
+import os
+import sys
+from unittest.mock import Mock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import warmup
+
+
+@pytest.fixture
+def speech_available():
+    with patch("server.stt.FASTER_WHISPER_AVAILABLE", True), \
+         patch("server.tts.COQUI_AVAILABLE", True):
+        yield
+
+
+class TestReadiness:
+    """Test readiness state transitions"""
+
+    def test_lazy_profile_is_ready_immediately(self, speech_available):
+        warmup.init("lazy", voices=["voice/a"])
+        state = warmup.readiness()
+        assert state["ready"] is True
+        assert state["models"]["whisper"]["state"] == "lazy"
+
+    def test_background_profile_waits_for_warmup(self, speech_available):
+        warmup.init("background", voices=["voice/a"])
+        state = warmup.readiness()
+        assert state["ready"] is False
+        assert state["models"]["tts:voice/a"]["state"] == "pending"
+
+    def test_missing_libraries_do_not_block_readiness(self):
+        with patch("server.stt.FASTER_WHISPER_AVAILABLE", False), \
+             patch("server.tts.COQUI_AVAILABLE", False):
+            warmup.init("background", voices=["voice/a"])
+            assert warmup.readiness()["ready"] is True
+
+    def test_warmup_all_marks_models_ready(self, speech_available):
+        warmup.init("background", voices=["voice/a", "vctk/model|p225"])
+        with patch.object(warmup, "warmup_whisper") as whisper, \
+             patch.object(warmup, "warmup_tts") as tts:
+            warmup.warmup_all()
+
+        whisper.assert_called_once()
+        assert [c.args[0] for c in tts.call_args_list] == ["voice/a", "vctk/model|p225"]
+        state = warmup.readiness()
+        assert state["ready"] is True
+        assert all(m["state"] == "ready" for m in state["models"].values())
+
+    def test_failed_warmup_is_not_ready(self, speech_available):
+        warmup.init("background", voices=["voice/a"])
+        with patch.object(warmup, "warmup_whisper", side_effect=RuntimeError("no weights")), \
+             patch.object(warmup, "warmup_tts"):
+            warmup.warmup_all()
+
+        state = warmup.readiness()
+        assert state["ready"] is False
+        assert state["models"]["whisper"]["state"] == "failed"
+        assert "no weights" in state["models"]["whisper"]["error"]
+
+
+class TestWarmupTTS:
+    """Test synthetic TTS inference"""
+
+    def test_multi_speaker_model_uses_first_speaker(self):
+        model = Mock(is_multi_speaker=True, speakers=["p225", "p226"])
+        with patch("server.tts.get_tts_model", return_value=model):
+            warmup.warmup_tts("tts_models/en/vctk/vits")
+        model.tts.assert_called_once_with(text=warmup.WARMUP_TEXT, speaker="p225")
+
+    def test_voice_with_speaker_suffix(self):
+        model = Mock(is_multi_speaker=True, speakers=["p225"])
+        with patch("server.tts.get_tts_model", return_value=model) as get_model:
+            warmup.warmup_tts("tts_models/en/vctk/vits|p230")
+        get_model.assert_called_once_with("tts_models/en/vctk/vits")
+        model.tts.assert_called_once_with(text=warmup.WARMUP_TEXT, speaker="p230")